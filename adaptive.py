@@ -0,0 +1,134 @@
+"""
+Adaptive sample sizing: urutan sampling terstratifikasi dan aturan berhenti
+berdasarkan lebar confidence interval
+"""
+
+import time
+import random
+from statistics import NormalDist
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+
+from evaluator import StreamingEvaluator
+
+# Metrik yang dipantau secara default
+ADAPTIVE_METRICS = ['rougeL', 'bertscore_f1']
+
+
+def stratified_order(dataset: List[Dict[str, Any]], key: str = 'category',
+                     seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Mengurutkan dataset sehingga setiap prefix merupakan sampel terstratifikasi
+
+    Artikel diacak di dalam setiap strata, lalu artikel ke-r dari strata
+    berukuran n diberi posisi (r + u) / n (u acak per strata). Setelah
+    diurutkan berdasarkan posisi tersebut, setiap prefix memuat setiap strata
+    sebanding dengan ukurannya, sehingga generate dapat dihentikan kapan saja.
+
+    Args:
+        dataset: Dataset yang sudah dipreprocess
+        key: Field strata (default: kategori berita)
+        seed: Seed acak agar urutan dapat direproduksi
+
+    Returns:
+        Dataset dengan urutan baru
+    """
+    rng = random.Random(seed)
+    strata: Dict[Any, List[Dict[str, Any]]] = {}
+    for item in dataset:
+        strata.setdefault(item.get(key), []).append(item)
+
+    keyed = []
+    for items in strata.values():
+        rng.shuffle(items)
+        offset = rng.random()
+        keyed.extend(((rank + offset) / len(items), item) for rank, item in enumerate(items))
+    keyed.sort(key=lambda pair: pair[0])
+    return [item for _, item in keyed]
+
+
+class AdaptiveStoppingRule:
+    """
+    Aturan berhenti untuk evaluasi adaptif
+
+    Setelah setiap batch evaluasi, half-width confidence interval rata-rata
+    setiap metrik dihitung dari momen berjalan StreamingEvaluator
+    (z * std / sqrt(n)). Sampling berhenti jika semua metrik sudah di bawah
+    target, atau jika budget artikel/waktu habis.
+    """
+
+    def __init__(self, target_half_width: float, metrics: Sequence[str] = ADAPTIVE_METRICS,
+                 confidence: float = 0.95, min_articles: int = 30,
+                 max_articles: Optional[int] = None, time_budget: Optional[float] = None):
+        """
+        Inisialisasi aturan berhenti
+
+        Args:
+            target_half_width: Target half-width CI (dalam satuan metrik, mis. 0.01)
+            metrics: Metrik yang dipantau (ROUGE/BERTScore)
+            confidence: Tingkat kepercayaan CI
+            min_articles: Jumlah artikel minimum sebelum aturan CI diperiksa
+            max_articles: Budget jumlah artikel (None untuk tanpa batas)
+            time_budget: Budget waktu dalam detik (None untuk tanpa batas)
+        """
+        self.target_half_width = target_half_width
+        self.metrics = list(metrics)
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.min_articles = min_articles
+        self.max_articles = max_articles
+        self.time_budget = time_budget
+        self.start_time = time.perf_counter()
+        self.half_widths: Dict[str, float] = {metric: float('inf') for metric in self.metrics}
+        self.n_evaluated = 0
+        self.stop_reason: Optional[str] = None
+
+    def half_width(self, streaming: StreamingEvaluator, metric: str) -> float:
+        if metric not in streaming.moments:
+            raise ValueError(f"Metrik tidak dipantau oleh streaming evaluator: {metric}. "
+                             f"Pilihan: {list(streaming.moments)}")
+        moments = streaming.moments[metric]
+        if moments.count < 2:
+            return float('inf')
+        return self.z * moments.std(ddof=1) / np.sqrt(moments.count)
+
+    def update(self, streaming: StreamingEvaluator):
+        """
+        Memperbarui half-width setelah batch evaluasi (callback EvaluationPipeline)
+        """
+        self.half_widths = {metric: self.half_width(streaming, metric) for metric in self.metrics}
+        self.n_evaluated = streaming.n_items
+        if (self.stop_reason is None and self.n_evaluated >= self.min_articles
+                and all(width <= self.target_half_width for width in self.half_widths.values())):
+            self.stop_reason = 'target_half_width'
+
+    def should_stop(self, n_generated: int) -> bool:
+        """
+        Memeriksa apakah generate artikel berikutnya perlu dihentikan
+
+        Args:
+            n_generated: Jumlah artikel yang sudah di-generate
+
+        Returns:
+            True jika target CI tercapai atau budget habis
+        """
+        if self.stop_reason is None:
+            if self.max_articles is not None and n_generated >= self.max_articles:
+                self.stop_reason = 'article_budget'
+            elif self.time_budget is not None and time.perf_counter() - self.start_time >= self.time_budget:
+                self.stop_reason = 'time_budget'
+        return self.stop_reason is not None
+
+    def report(self, n_articles: int) -> Dict[str, Any]:
+        """
+        Ringkasan sampling adaptif untuk evaluation_results.json
+        """
+        return {
+            'articles_needed': n_articles,
+            'stop_reason': self.stop_reason or 'dataset_exhausted',
+            'target_half_width': self.target_half_width,
+            'confidence': self.confidence,
+            'half_widths': {metric: float(width) for metric, width in self.half_widths.items()},
+            'elapsed_time': time.perf_counter() - self.start_time
+        }
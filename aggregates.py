@@ -0,0 +1,302 @@
+"""
+Cube agregat kategori x sumber x bucket panjang yang dihitung sekali dari tabel
+skor per item dan dipakai ulang oleh plot dan laporan
+"""
+
+from typing import List, Dict, Optional, Sequence, Iterable
+
+import numpy as np
+import pandas as pd
+
+from evaluator import BERTSCORE_COLUMNS, BLEU_STAT_COLUMNS, corpus_bleu_from_stats, iter_item_frames
+
+# Dimensi cube (urutan sumbu array)
+CUBE_DIMENSIONS = ['category', 'source', 'length_bucket']
+
+# Kolom numerik per item yang diagregasi untuk korelasi dan regresi
+NUMERIC_COLUMNS = ['rouge1', 'rouge2', 'rougeL', 'reference_length', 'prediction_length']
+
+# Metrik dengan count/sum/sum of squares per sel (NaN tidak dihitung)
+CUBE_METRICS = NUMERIC_COLUMNS + BERTSCORE_COLUMNS
+
+# Tepi bin tetap (tidak bergantung data) sehingga histogram antar sel dan
+# antar run dapat dijumlahkan; nilai di luar rentang masuk ke bin tepi
+SCORE_EDGES = np.linspace(0, 1, 21)
+LENGTH_EDGES = np.linspace(0, 400, 41)
+RATIO_EDGES = np.linspace(0, 4, 41)
+HIST_EDGES = {
+    'rouge1': SCORE_EDGES,
+    'rouge2': SCORE_EDGES,
+    'rougeL': SCORE_EDGES,
+    'reference_length': LENGTH_EDGES,
+    'prediction_length': LENGTH_EDGES,
+    'length_ratio': RATIO_EDGES
+}
+
+# Histogram 2D (x, ROUGE-1) dan regresi ROUGE-1 terhadap x
+HIST2D_COLUMNS = ['reference_length', 'prediction_length', 'length_ratio']
+
+# Label sel jika kolom dimensi tidak tersedia (misalnya length_bucket)
+MISSING_LABEL = 'semua'
+
+
+def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    index = np.searchsorted(edges, values, side='right') - 1
+    return np.clip(index, 0, len(edges) - 2)
+
+
+def _cell_bincount(cells: np.ndarray, n_cells: int, weights: Optional[np.ndarray] = None,
+                   inner: Optional[np.ndarray] = None, inner_size: int = 1) -> np.ndarray:
+    """
+    np.bincount per sel (dan per bin di dalam sel jika inner diberikan)
+    """
+    index = cells if inner is None else cells * inner_size + inner
+    counts = np.bincount(index, weights=weights, minlength=n_cells * inner_size)
+    return counts.reshape(n_cells, inner_size) if inner is not None else counts
+
+
+class AggregateCube:
+    """
+    Cube agregat per sel kategori x sumber x bucket panjang
+
+    Setiap sel menyimpan jumlah item, count/sum/sum of squares setiap metrik,
+    jumlah hasil kali antar NUMERIC_COLUMNS, statistik cukup BLEU, histogram
+    1D/2D dengan tepi bin tetap, dan jumlah cukup regresi. Semua isi berupa
+    jumlah, sehingga agregat per kategori, per sumber, per bucket, atau
+    kombinasinya didapat dengan menjumlahkan sumbu cube tanpa membaca tabel
+    per item lagi. Cube disimpan ke file .npz.
+    """
+
+    def __init__(self, labels: Dict[str, np.ndarray], arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            labels: Label setiap dimensi (CUBE_DIMENSIONS)
+            arrays: Array agregat dengan sumbu awal (kategori, sumber, bucket)
+        """
+        self.labels = labels
+        self.arrays = arrays
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(self.labels[dimension]) for dimension in CUBE_DIMENSIONS)
+
+    @classmethod
+    def from_item_scores(cls, item_scores) -> 'AggregateCube':
+        """
+        Menghitung cube dari tabel skor per item dalam satu pass vektor
+
+        Args:
+            item_scores: DataFrame hasil evaluasi atau dict kolom -> array
+                (misalnya SummarizationEvaluator.item_scores)
+
+        Returns:
+            AggregateCube
+        """
+        table = pd.DataFrame(item_scores) if not isinstance(item_scores, pd.DataFrame) else item_scores
+        n_items = len(table)
+
+        labels, codes = {}, []
+        for dimension in CUBE_DIMENSIONS:
+            values = table[dimension].astype(str).to_numpy() if dimension in table else np.full(n_items, MISSING_LABEL)
+            labels[dimension], inverse = np.unique(values, return_inverse=True)
+            codes.append(inverse)
+        shape = tuple(len(labels[dimension]) for dimension in CUBE_DIMENSIONS)
+        cells = np.ravel_multi_index(codes, shape) if n_items else np.zeros(0, dtype=np.int64)
+        n_cells = int(np.prod(shape))
+
+        def column(name: str) -> np.ndarray:
+            if name not in table:
+                return np.full(n_items, np.nan)
+            return table[name].to_numpy(dtype=np.float64)
+
+        arrays: Dict[str, np.ndarray] = {'count': np.bincount(cells, minlength=n_cells)}
+
+        metrics = np.stack([column(metric) for metric in CUBE_METRICS], axis=1)
+        valid = ~np.isnan(metrics)
+        metrics = np.where(valid, metrics, 0.0)
+        arrays['n_valid'] = np.stack([_cell_bincount(cells, n_cells, valid[:, i].astype(np.float64))
+                                      for i in range(len(CUBE_METRICS))], axis=-1)
+        arrays['sum'] = np.stack([_cell_bincount(cells, n_cells, metrics[:, i])
+                                  for i in range(len(CUBE_METRICS))], axis=-1)
+        arrays['sumsq'] = np.stack([_cell_bincount(cells, n_cells, metrics[:, i] ** 2)
+                                    for i in range(len(CUBE_METRICS))], axis=-1)
+
+        numeric = metrics[:, :len(NUMERIC_COLUMNS)]
+        arrays['cross'] = np.stack([
+            np.stack([_cell_bincount(cells, n_cells, numeric[:, i] * numeric[:, j])
+                      for j in range(len(NUMERIC_COLUMNS))], axis=-1)
+            for i in range(len(NUMERIC_COLUMNS))
+        ], axis=-2)
+
+        arrays['bleu_stats'] = np.stack([_cell_bincount(cells, n_cells, np.nan_to_num(column(stat)))
+                                         for stat in BLEU_STAT_COLUMNS], axis=-1)
+
+        values = {name: numeric[:, i] for i, name in enumerate(NUMERIC_COLUMNS)}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values['length_ratio'] = values['prediction_length'] / values['reference_length']
+        ratio_valid = np.isfinite(values['length_ratio'])
+        arrays['ratio'] = np.stack([
+            _cell_bincount(cells[ratio_valid], n_cells, values['length_ratio'][ratio_valid]),
+            _cell_bincount(cells[ratio_valid], n_cells).astype(np.float64)
+        ], axis=-1)
+
+        bins = {name: _bin_index(np.where(np.isfinite(values[name]), values[name], 0.0), edges)
+                for name, edges in HIST_EDGES.items()}
+        for name, edges in HIST_EDGES.items():
+            mask = ratio_valid if name == 'length_ratio' else np.ones(n_items, dtype=bool)
+            arrays[f'hist_{name}'] = _cell_bincount(cells[mask], n_cells, inner=bins[name][mask],
+                                                    inner_size=len(edges) - 1)
+
+        n_score_bins = len(SCORE_EDGES) - 1
+        for name in HIST2D_COLUMNS:
+            mask = ratio_valid if name == 'length_ratio' else np.ones(n_items, dtype=bool)
+            n_x_bins = len(HIST_EDGES[name]) - 1
+            inner = bins[name][mask] * n_score_bins + bins['rouge1'][mask]
+            arrays[f'hist2d_{name}'] = _cell_bincount(
+                cells[mask], n_cells, inner=inner, inner_size=n_x_bins * n_score_bins
+            ).reshape(n_cells, n_x_bins, n_score_bins)
+            x, y = values[name][mask], values['rouge1'][mask]
+            arrays[f'regression_{name}'] = np.stack([
+                _cell_bincount(cells[mask], n_cells).astype(np.float64),
+                _cell_bincount(cells[mask], n_cells, x),
+                _cell_bincount(cells[mask], n_cells, y),
+                _cell_bincount(cells[mask], n_cells, x * x),
+                _cell_bincount(cells[mask], n_cells, x * y)
+            ], axis=-1)
+
+        arrays = {name: array.reshape(shape + array.shape[1:]) for name, array in arrays.items()}
+        return cls(labels, arrays)
+
+    @classmethod
+    def from_batches(cls, item_scores) -> 'AggregateCube':
+        """
+        Menghitung cube per batch tabel skor dan menggabungkannya
+
+        Isi cube berupa jumlah, sehingga cube per batch cukup dijumlahkan;
+        memori terbatas pada satu batch ditambah cube itu sendiri.
+
+        Args:
+            item_scores: Iterable DataFrame per batch (misalnya
+                SpilledItemScores), DataFrame, atau dict kolom -> array
+
+        Returns:
+            AggregateCube
+        """
+        cube = None
+        for frame in iter_item_frames(item_scores):
+            part = cls.from_item_scores(frame)
+            cube = part if cube is None else cls.merge([cube, part])
+        return cube if cube is not None else cls.from_item_scores(pd.DataFrame())
+
+    @classmethod
+    def merge(cls, cubes: Iterable['AggregateCube']) -> 'AggregateCube':
+        """
+        Menjumlahkan beberapa cube; label setiap dimensi digabung
+
+        Args:
+            cubes: Cube yang dijumlahkan
+
+        Returns:
+            AggregateCube gabungan
+        """
+        cubes = list(cubes)
+        labels = {
+            dimension: np.unique(np.concatenate([cube.labels[dimension] for cube in cubes]).astype(str)).astype(object)
+            for dimension in CUBE_DIMENSIONS
+        }
+        shape = tuple(len(labels[dimension]) for dimension in CUBE_DIMENSIONS)
+        arrays: Dict[str, np.ndarray] = {}
+        for cube in cubes:
+            index = np.ix_(*[np.searchsorted(labels[dimension], cube.labels[dimension].astype(str))
+                             for dimension in CUBE_DIMENSIONS])
+            for name, array in cube.arrays.items():
+                if name not in arrays:
+                    arrays[name] = np.zeros(shape + array.shape[len(CUBE_DIMENSIONS):], dtype=array.dtype)
+                arrays[name][index] += array
+        return cls(labels, arrays)
+
+    def marginal(self, name: str, by: Sequence[str] = ()) -> np.ndarray:
+        """
+        Menjumlahkan array agregat atas dimensi yang tidak ada di by
+
+        Args:
+            name: Nama array (misalnya 'count', 'sum', 'hist_rouge1')
+            by: Dimensi yang dipertahankan (urutan mengikuti CUBE_DIMENSIONS)
+
+        Returns:
+            Array dengan sumbu awal sesuai by, diikuti sumbu isi sel
+        """
+        unknown = set(by) - set(CUBE_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Dimensi tidak dikenal: {sorted(unknown)}. Pilihan: {CUBE_DIMENSIONS}")
+        axes = tuple(i for i, dimension in enumerate(CUBE_DIMENSIONS) if dimension not in by)
+        return self.arrays[name].sum(axis=axes)
+
+    def _index(self, by: Sequence[str]) -> pd.Index:
+        by = [dimension for dimension in CUBE_DIMENSIONS if dimension in by]
+        if not by:
+            return pd.Index(['semua'], name='group')
+        if len(by) == 1:
+            return pd.Index(self.labels[by[0]], name=by[0])
+        return pd.MultiIndex.from_product([self.labels[dimension] for dimension in by], names=by)
+
+    def summary(self, by: Sequence[str] = (), metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Jumlah item serta rata-rata dan standar deviasi (ddof=1) metrik per grup
+
+        Args:
+            by: Dimensi pengelompokan, misalnya ['category'] atau
+                ['category', 'length_bucket']; kosong untuk keseluruhan
+            metrics: Subset CUBE_METRICS (default: semua)
+
+        Returns:
+            DataFrame dengan kolom count, <metrik>_mean, <metrik>_std
+        """
+        metrics = metrics or CUBE_METRICS
+        index = self._index(by)
+        columns = {'count': self.marginal('count', by).reshape(-1)}
+        n_valid = self.marginal('n_valid', by).reshape(-1, len(CUBE_METRICS))
+        sums = self.marginal('sum', by).reshape(-1, len(CUBE_METRICS))
+        sumsq = self.marginal('sumsq', by).reshape(-1, len(CUBE_METRICS))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for metric in metrics:
+                i = CUBE_METRICS.index(metric)
+                n = n_valid[:, i]
+                columns[f'{metric}_mean'] = sums[:, i] / n
+                variance = (sumsq[:, i] - sums[:, i] ** 2 / n) / (n - 1)
+                columns[f'{metric}_std'] = np.sqrt(np.clip(variance, 0, None))
+        return pd.DataFrame(columns, index=index)
+
+    def bleu(self, by: Sequence[str] = ()) -> pd.Series:
+        """
+        BLEU korpus per grup dari jumlah statistik cukup sel
+
+        Args:
+            by: Dimensi pengelompokan; kosong untuk keseluruhan
+
+        Returns:
+            Series BLEU per grup
+        """
+        stats = self.marginal('bleu_stats', by).reshape(-1, len(BLEU_STAT_COLUMNS))
+        return pd.Series(corpus_bleu_from_stats(stats), index=self._index(by), name='bleu')
+
+    def save(self, path: str):
+        """
+        Menyimpan cube ke file .npz (terkompresi)
+        """
+        np.savez_compressed(
+            path,
+            **{f'labels_{dimension}': self.labels[dimension].astype(str) for dimension in CUBE_DIMENSIONS},
+            **self.arrays
+        )
+        print(f"Cube agregat tersimpan di: {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'AggregateCube':
+        """
+        Memuat cube dari file .npz
+        """
+        with np.load(path) as data:
+            labels = {dimension: data[f'labels_{dimension}'] for dimension in CUBE_DIMENSIONS}
+            arrays = {name: data[name] for name in data.files if not name.startswith('labels_')}
+        return cls(labels, arrays)
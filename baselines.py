@@ -0,0 +1,208 @@
+"""
+Baseline ekstraktif (gold label, lead-k, dan oracle ROUGE greedy) sebagai titik
+pembanding skor model
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from evaluator import NativeRougeScorer, SummarizationEvaluator, BLEU_STAT_COLUMNS, _ngram_keys
+from text_normalizer import create_tokenizer
+
+# Nama baseline yang dilaporkan di evaluation_results.json
+BASELINES = ('gold_extractive', 'lead_k', 'oracle')
+
+
+def article_sentences(item: Dict[str, Any]) -> List[str]:
+    """
+    Daftar kalimat artikel (paragraf diratakan) sebagai teks
+
+    Args:
+        item: Item dataset dengan field 'paragraphs' (paragraf -> kalimat -> token)
+
+    Returns:
+        List kalimat
+    """
+    return [" ".join(sentence) for paragraph in item['paragraphs'] for sentence in paragraph]
+
+
+def gold_extractive_summary(item: Dict[str, Any]) -> str:
+    """
+    Ringkasan ekstraktif dari kalimat yang ditandai gold_labels
+    """
+    labels = [label for paragraph in item['gold_labels'] for label in paragraph]
+    return " ".join(sentence for sentence, label in zip(article_sentences(item), labels) if label)
+
+
+def lead_summary(item: Dict[str, Any], k: int = 3) -> str:
+    """
+    Ringkasan lead-k: k kalimat pertama artikel
+    """
+    return " ".join(article_sentences(item)[:k])
+
+
+class GreedyOracle:
+    """
+    Oracle ekstraktif greedy terhadap ROUGE-1 + ROUGE-2
+
+    Kalimat dan reference dikodekan ke id integer (tokenizer yang sama dengan
+    evaluator), lalu n-gram setiap kalimat disusun menjadi matriks hitungan
+    (kalimat x n-gram unik artikel). Pada setiap langkah, overlap ter-clip
+    seluruh kandidat kalimat dihitung sekaligus dengan
+    np.minimum(terpilih + S, reference).sum(axis=1), dan kalimat dengan
+    kenaikan rata-rata F1 ROUGE-1/ROUGE-2 terbesar ditambahkan sampai skor
+    tidak naik lagi.
+    """
+
+    def __init__(self, tokenizer: str = 'rouge_score', stemmer: Optional[str] = 'porter',
+                 max_sentences: Optional[int] = None):
+        """
+        Args:
+            tokenizer: Tokenizer ROUGE ('rouge_score' atau 'indonesian')
+            stemmer: Stemmer opsional
+            max_sentences: Batas jumlah kalimat oracle (None untuk tanpa batas)
+        """
+        self.encoder = NativeRougeScorer(['rouge1', 'rouge2'], tokenizer=create_tokenizer(tokenizer, stemmer))
+        self.max_sentences = max_sentences
+
+    def _count_matrix(self, sentence_keys: List[np.ndarray],
+                      reference_keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Matriks hitungan n-gram per kalimat (n_kalimat, V) dan vektor reference (V,)
+        """
+        all_keys = np.concatenate(sentence_keys + [reference_keys])
+        _, local = np.unique(all_keys, return_inverse=True)
+        width = int(local.max()) + 1 if len(local) else 0
+
+        rows = np.repeat(np.arange(len(sentence_keys)), [len(keys) for keys in sentence_keys])
+        n_sentence_keys = len(rows)
+        counts = np.bincount(rows * width + local[:n_sentence_keys], minlength=len(sentence_keys) * width)
+        reference = np.bincount(local[n_sentence_keys:], minlength=width)
+        return counts.reshape(len(sentence_keys), width), reference
+
+    def select(self, sentences: List[str], reference: str) -> List[int]:
+        """
+        Memilih indeks kalimat oracle
+
+        Args:
+            sentences: Kalimat artikel
+            reference: Ringkasan reference
+
+        Returns:
+            Indeks kalimat terpilih (urut sesuai posisi di artikel)
+        """
+        if not sentences:
+            return []
+        ref_ids = self.encoder.encode(reference).ids
+        sentence_ids = [self.encoder.encode(sentence).ids for sentence in sentences]
+
+        matrices = [self._count_matrix([_ngram_keys(ids, n) for ids in sentence_ids], _ngram_keys(ref_ids, n))
+                    for n in (1, 2)]
+        sentence_totals = [matrix.sum(axis=1) for matrix, _ in matrices]
+        reference_totals = [reference.sum() for _, reference in matrices]
+
+        selected: List[int] = []
+        available = np.ones(len(sentences), dtype=bool)
+        chosen = [np.zeros_like(reference) for _, reference in matrices]
+        chosen_totals = [0, 0]
+        best_score = 0.0
+        max_sentences = self.max_sentences or len(sentences)
+
+        while len(selected) < max_sentences and available.any():
+            candidate_scores = np.zeros(len(sentences))
+            for order, (matrix, reference) in enumerate(matrices):
+                overlap = np.minimum(chosen[order] + matrix, reference).sum(axis=1)
+                totals = chosen_totals[order] + sentence_totals[order] + reference_totals[order]
+                # F1 = 2 * overlap / (panjang prediction + panjang reference)
+                candidate_scores += np.divide(2 * overlap, totals, out=np.zeros(len(sentences)), where=totals > 0)
+            candidate_scores = np.where(available, candidate_scores / 2, -1.0)
+
+            best = int(np.argmax(candidate_scores))
+            if candidate_scores[best] <= best_score:
+                break
+            best_score = candidate_scores[best]
+            selected.append(best)
+            available[best] = False
+            for order, (matrix, _) in enumerate(matrices):
+                chosen[order] = chosen[order] + matrix[best]
+                chosen_totals[order] += sentence_totals[order][best]
+
+        return sorted(selected)
+
+    def summary(self, item: Dict[str, Any], reference: Optional[str] = None) -> str:
+        """
+        Ringkasan oracle untuk satu item dataset
+        """
+        sentences = article_sentences(item)
+        indices = self.select(sentences, item['summary'] if reference is None else reference)
+        return " ".join(sentences[i] for i in indices)
+
+
+def baseline_summaries(dataset: List[Dict[str, Any]], lead_k: int = 3, tokenizer: str = 'rouge_score',
+                       stemmer: Optional[str] = 'porter') -> Dict[str, List[str]]:
+    """
+    Membuat ringkasan setiap baseline untuk seluruh dataset
+
+    Args:
+        dataset: Dataset dengan field 'paragraphs', 'gold_labels', dan 'summary'
+        lead_k: Jumlah kalimat baseline lead-k
+        tokenizer: Tokenizer ROUGE untuk oracle
+        stemmer: Stemmer opsional untuk oracle
+
+    Returns:
+        Dictionary nama baseline -> list ringkasan
+    """
+    oracle = GreedyOracle(tokenizer=tokenizer, stemmer=stemmer)
+    return {
+        'gold_extractive': [gold_extractive_summary(item) for item in dataset],
+        'lead_k': [lead_summary(item, lead_k) for item in dataset],
+        'oracle': [oracle.summary(item) for item in dataset]
+    }
+
+
+def evaluate_baselines(evaluator: SummarizationEvaluator, dataset: List[Dict[str, Any]], lead_k: int = 3,
+                       include_bertscore: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    Menskor setiap baseline terhadap reference yang sama dengan model
+
+    Skor dihitung dengan evaluator yang sama (tokenizer, cache reference
+    ROUGE/BLEU, dan BERTScore opsional), sehingga langsung dapat dibandingkan
+    dengan evaluation_results['summary'].
+
+    Args:
+        evaluator: Evaluator yang dipakai untuk model
+        dataset: Dataset dengan field 'paragraphs', 'gold_labels', dan 'summary'
+        lead_k: Jumlah kalimat baseline lead-k
+        include_bertscore: Hitung juga BERTScore baseline
+
+    Returns:
+        Dictionary nama baseline -> skor ringkas (rouge1, rouge2, rougeL, bleu,
+        bertscore_f1 jika dihitung, dan rata-rata panjang)
+    """
+    dataset = [item for item in dataset if item.get('paragraphs') and item.get('gold_labels')]
+    if not dataset:
+        return {}
+    references = [item['summary'] for item in dataset]
+    reference_ids = [item['id'] for item in dataset]
+
+    results = {}
+    summaries = baseline_summaries(dataset, lead_k, tokenizer=evaluator.tokenizer, stemmer=evaluator.stemmer)
+    for name, predictions in summaries.items():
+        print(f"Baseline {name}:")
+        item_scores = evaluator.score_items(references, predictions, include_bertscore=include_bertscore,
+                                            reference_ids=reference_ids)
+        rouge_scores = evaluator.aggregate_rouge_scores(item_scores)
+        bleu_stats = np.stack([item_scores[column] for column in BLEU_STAT_COLUMNS], axis=1)
+        n_valid = int((item_scores['prediction_length'] > 0).sum())
+        scores = {
+            'rouge1': rouge_scores['rouge1'],
+            'rouge2': rouge_scores['rouge2'],
+            'rougeL': rouge_scores['rougeL'],
+            'bleu': evaluator.bleu_from_statistics(bleu_stats.sum(axis=0), n_valid)['bleu']
+        }
+        if include_bertscore:
+            scores['bertscore_f1'] = evaluator.aggregate_bertscore(item_scores)['bertscore_f1']
+        scores['avg_length'] = float(item_scores['prediction_length'].mean())
+        results[name] = scores
+    return results
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark throughput BERTScore di CPU per konfigurasi encoder, token budget, dan thread
+"""
+
+import os
+import json
+import time
+import argparse
+import itertools
+from typing import List, Dict, Any, Optional
+
+import torch
+from bert_score import score as bert_score_func
+
+from bert_scoring import BERTScoreEngine
+from benchmark_rouge import build_validation_pairs
+
+
+def run_config(references: List[str], predictions: List[str], model_type: Optional[str],
+               num_layers: Optional[int], max_tokens: Optional[int], num_threads: Optional[int]) -> Dict[str, Any]:
+    """
+    Mengukur throughput encode dan scoring untuk satu konfigurasi
+
+    Cache embedding reference dinonaktifkan agar setiap konfigurasi
+    meng-encode reference dan prediction.
+
+    Args:
+        references: List of reference summaries
+        predictions: List of predicted summaries
+        model_type: Encoder BERTScore
+        num_layers: Layer representasi
+        max_tokens: Token budget per batch encode (None untuk otomatis)
+        num_threads: Jumlah thread torch
+
+    Returns:
+        Dictionary berisi hasil pengukuran
+    """
+    engine = BERTScoreEngine(model_type=model_type, num_layers=num_layers,
+                             max_tokens=max_tokens, num_threads=num_threads)
+    # Memuat model di luar pengukuran
+    engine.embed(predictions[:1])
+
+    start_time = time.perf_counter()
+    engine.embed(predictions)
+    embed_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    engine.score(references, predictions)
+    score_time = time.perf_counter() - start_time
+
+    return {
+        'model_type': engine.model_type,
+        'num_layers': engine.num_layers,
+        'max_tokens': engine.max_tokens,
+        'auto_max_tokens': max_tokens is None,
+        'num_threads': num_threads or torch.get_num_threads(),
+        'sentences_per_sec': len(predictions) / embed_time,
+        'pairs_per_sec': len(references) / score_time
+    }
+
+
+def run_baseline(references: List[str], predictions: List[str], model_type: Optional[str],
+                 num_layers: Optional[int]) -> Dict[str, Any]:
+    """
+    Mengukur bert_score.score dengan batch_size=16 (jalur evaluasi sebelumnya)
+    """
+    kwargs = {'model_type': model_type, 'num_layers': num_layers} if model_type else {'lang': 'id'}
+    # Memuat model di luar pengukuran
+    bert_score_func(predictions[:1], references[:1], batch_size=16, **kwargs)
+
+    start_time = time.perf_counter()
+    bert_score_func(predictions, references, batch_size=16, **kwargs)
+    score_time = time.perf_counter() - start_time
+
+    return {
+        'model_type': model_type,
+        'baseline': True,
+        'num_threads': torch.get_num_threads(),
+        'pairs_per_sec': len(references) / score_time
+    }
+
+
+def parse_max_tokens(value: str) -> Optional[int]:
+    return None if value == 'auto' else int(value)
+
+
+def main():
+    """
+    Fungsi utama benchmark BERTScore
+    """
+    parser = argparse.ArgumentParser(description='Benchmark throughput BERTScore per konfigurasi')
+    parser.add_argument('--data_dir', type=str, default='data',
+                       help='Direktori yang berisi file dataset train.XX.jsonl')
+    parser.add_argument('--results_path', type=str, default=None,
+                       help='results.arrow (atau direktori run) untuk dipakai sebagai pasangan')
+    parser.add_argument('--num_pairs', type=int, default=256,
+                       help='Jumlah pasangan yang diukur')
+    parser.add_argument('--models', type=str, nargs='+',
+                       default=['bert-base-multilingual-cased', 'distilbert-base-multilingual-cased'],
+                       help='Encoder BERTScore yang dibandingkan')
+    parser.add_argument('--num_layers', type=int, default=None,
+                       help='Layer representasi (default: layer bert_score untuk model)')
+    parser.add_argument('--max_tokens', type=parse_max_tokens, nargs='+', default=[None, 2048, 8192],
+                       help='Token budget per batch ("auto" untuk otomatis)')
+    parser.add_argument('--threads', type=int, nargs='+', default=[torch.get_num_threads()],
+                       help='Jumlah thread torch yang dibandingkan')
+    parser.add_argument('--no_baseline', action='store_true',
+                       help='Lewati pengukuran bert_score.score dengan batch_size=16')
+    parser.add_argument('--output_dir', type=str, default='results',
+                       help='Direktori untuk menyimpan hasil benchmark')
+
+    args = parser.parse_args()
+
+    references, predictions = build_validation_pairs(args.data_dir, args.results_path)
+    pairs = [(ref, pred) for ref, pred in zip(references, predictions) if pred.strip()][:args.num_pairs]
+    references, predictions = [list(column) for column in zip(*pairs)]
+    print(f"Benchmark: {len(references)} pasangan")
+
+    results = []
+    for model_type in args.models:
+        if not args.no_baseline:
+            results.append(run_baseline(references, predictions, model_type, args.num_layers))
+        for max_tokens, num_threads in itertools.product(args.max_tokens, args.threads):
+            results.append(run_config(references, predictions, model_type, args.num_layers, max_tokens, num_threads))
+
+    print("\n" + "=" * 50)
+    print("THROUGHPUT BERTSCORE")
+    print("=" * 50)
+    for result in results:
+        if result.get('baseline'):
+            print(f"{result['model_type']} [bert_score, batch 16]: {result['pairs_per_sec']:.1f} pasangan/detik")
+        else:
+            print(f"{result['model_type']} [max_tokens={result['max_tokens']}, threads={result['num_threads']}]: "
+                  f"{result['sentences_per_sec']:.1f} kalimat/detik, {result['pairs_per_sec']:.1f} pasangan/detik")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, 'benchmark_bertscore.json')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nHasil tersimpan di: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
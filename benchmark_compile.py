@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark inference eager vs compiled (torch.compile) untuk GemmaSummarizer
+"""
+
+import os
+import json
+import time
+import argparse
+from typing import List, Dict, Any
+
+import numpy as np
+
+from data_loader import NewsDatasetLoader
+from summarizer import GemmaSummarizer, PROMPT_BUCKETS
+from main import load_dataset, sample_dataset
+
+
+def run_generation(summarizer: GemmaSummarizer, dataset: List[Dict[str, Any]], max_length: int) -> Dict[str, float]:
+    """
+    Generate summary untuk dataset dan mengukur throughput decode
+
+    Stopping criteria ringkasan dinonaktifkan agar setiap artikel
+    menghasilkan jumlah token yang sama pada kedua mode.
+
+    Args:
+        summarizer: Summarizer yang diukur
+        dataset: Artikel untuk benchmark
+        max_length: Jumlah token baru per artikel
+
+    Returns:
+        Dictionary berisi statistik throughput
+    """
+    telemetry = []
+    start_time = time.perf_counter()
+    for item in dataset:
+        _, item_telemetry = summarizer.generate_summary(
+            item['text'],
+            max_length=max_length,
+            stop_on_summary_end=False,
+            return_telemetry=True
+        )
+        telemetry.append(item_telemetry)
+    total_time = time.perf_counter() - start_time
+
+    tokens_per_sec = np.array([t['tokens_per_sec'] for t in telemetry])
+    prefill_time = np.array([t['prefill_time'] for t in telemetry])
+    return {
+        'articles': len(telemetry),
+        'total_time': total_time,
+        'decode_tokens_per_sec_p50': float(np.median(tokens_per_sec)),
+        'decode_tokens_per_sec_mean': float(tokens_per_sec.mean()),
+        'prefill_time_p50': float(np.median(prefill_time))
+    }
+
+
+def main():
+    """
+    Fungsi utama benchmark compiled inference
+    """
+    parser = argparse.ArgumentParser(description='Benchmark eager vs torch.compile untuk GemmaSummarizer')
+    parser.add_argument('--data_dir', type=str, default='data',
+                       help='Direktori yang berisi file dataset train.XX.jsonl')
+    parser.add_argument('--model_name', type=str, default='google/gemma2-9b',
+                       help='Nama model yang akan digunakan')
+    parser.add_argument('--device', type=str, default='cpu',
+                       help='Device untuk inference (cuda/cpu)')
+    parser.add_argument('--sample_size', type=int, default=10,
+                       help='Jumlah artikel untuk benchmark')
+    parser.add_argument('--max_length', type=int, default=64,
+                       help='Jumlah token baru per artikel')
+    parser.add_argument('--compile_mode', type=str, default='default',
+                       help='Mode torch.compile')
+    parser.add_argument('--prompt_buckets', type=int, nargs='+', default=list(PROMPT_BUCKETS),
+                       help='Bucket panjang prompt untuk mode compiled')
+    parser.add_argument('--output_dir', type=str, default='results',
+                       help='Direktori untuk menyimpan hasil benchmark')
+
+    args = parser.parse_args()
+
+    data_loader = NewsDatasetLoader(data_dir=args.data_dir)
+    processed_data = load_dataset(data_loader, args.data_dir)
+    if processed_data is None:
+        return
+    dataset = sample_dataset(processed_data, args.sample_size)
+
+    summarizer = GemmaSummarizer(model_name=args.model_name, device=args.device)
+
+    print("\nBENCHMARK EAGER")
+    print("-" * 30)
+    # Satu artikel pertama sebagai pemanasan agar sebanding dengan mode compiled
+    run_generation(summarizer, dataset[:1], args.max_length)
+    eager = run_generation(summarizer, dataset, args.max_length)
+
+    print("\nBENCHMARK COMPILED")
+    print("-" * 30)
+    summarizer.enable_compile(mode=args.compile_mode, prompt_buckets=args.prompt_buckets)
+    start_time = time.perf_counter()
+    warmup_timings = summarizer.warmup(max_length=args.max_length)
+    compile_overhead = time.perf_counter() - start_time
+    compiled = run_generation(summarizer, dataset, args.max_length)
+
+    results = {
+        'model_name': args.model_name,
+        'device': args.device,
+        'max_length': args.max_length,
+        'compile_mode': args.compile_mode,
+        'prompt_buckets': args.prompt_buckets,
+        'eager': eager,
+        'compiled': compiled,
+        'compile_overhead': compile_overhead,
+        'warmup_per_bucket': warmup_timings,
+        'decode_speedup': compiled['decode_tokens_per_sec_p50'] / eager['decode_tokens_per_sec_p50']
+        if eager['decode_tokens_per_sec_p50'] > 0 else None
+    }
+
+    print("\n" + "=" * 50)
+    print("HASIL BENCHMARK")
+    print("=" * 50)
+    print(f"Eager decode    : {eager['decode_tokens_per_sec_p50']:.2f} token/detik (p50)")
+    print(f"Compiled decode : {compiled['decode_tokens_per_sec_p50']:.2f} token/detik (p50)")
+    print(f"Overhead compile: {compile_overhead:.2f} detik")
+    if results['decode_speedup'] is not None:
+        print(f"Speedup decode  : {results['decode_speedup']:.2f}x")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, 'benchmark_compile.json')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nHasil benchmark tersimpan di: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Validasi dan benchmark engine ROUGE: package rouge_score vs engine native,
+serta validasi BLEU dari statistik per item terhadap sacrebleu.corpus_bleu
+"""
+
+import os
+import json
+import time
+import argparse
+from typing import List, Tuple
+
+import numpy as np
+from sacrebleu import corpus_bleu
+
+from data_loader import NewsDatasetLoader
+from evaluator import SummarizationEvaluator, ROUGE_TYPES, ROUGE_ENGINES
+from text_normalizer import TOKENIZERS, STEMMERS, resolve_stemmer
+from results_store import load_summary_pairs
+
+
+def build_validation_pairs(data_dir: str, results_path: str = None) -> Tuple[List[str], List[str]]:
+    """
+    Membuat set validasi pasangan (reference, prediction)
+
+    Jika results_path diberikan, generated summary dari file tersebut dipakai
+    (results.arrow atau direktori run digabung dengan reference dari dataset
+    berdasarkan id; results_with_summaries.jsonl dari run lama juga didukung).
+    Jika tidak, prediction dibuat dari lead-3 kalimat artikel dan dari
+    ringkasan artikel lain (pasangan acak), ditambah beberapa prediction kosong.
+
+    Args:
+        data_dir: Direktori dataset
+        results_path: Path ke results.arrow, direktori run, atau
+            results_with_summaries.jsonl (opsional)
+
+    Returns:
+        Tuple (references, predictions)
+    """
+    data_loader = NewsDatasetLoader(data_dir=data_dir)
+
+    if results_path and results_path.endswith('.jsonl'):
+        results = data_loader.load_jsonl_file(results_path)
+        return [item['summary'] for item in results], [item['generated_summary'] for item in results]
+
+    processed_data = data_loader.preprocess_data(data_loader.load_all_train_files())
+    if results_path:
+        return load_summary_pairs(results_path, processed_data)
+
+    references, predictions = [], []
+    rng = np.random.default_rng(42)
+
+    for item in processed_data:
+        sentences = [" ".join(sentence) for paragraph in item['paragraphs'] for sentence in paragraph]
+        references.append(item['summary'])
+        predictions.append(" ".join(sentences[:3]))
+
+        other = processed_data[rng.integers(len(processed_data))]
+        references.append(item['summary'])
+        predictions.append(other['summary'])
+
+    references.append(processed_data[0]['summary'])
+    predictions.append("")
+    return references, predictions
+
+
+def main():
+    """
+    Fungsi utama validasi engine ROUGE
+    """
+    parser = argparse.ArgumentParser(description='Validasi engine ROUGE native terhadap rouge_score')
+    parser.add_argument('--data_dir', type=str, default='data',
+                       help='Direktori yang berisi file dataset train.XX.jsonl')
+    parser.add_argument('--results_path', type=str, default=None,
+                       help='results.arrow (atau direktori run) untuk dipakai sebagai set validasi')
+    parser.add_argument('--tokenizer', type=str, default='rouge_score', choices=list(TOKENIZERS),
+                       help='Tokenizer ROUGE yang dipakai kedua engine')
+    parser.add_argument('--stemmer', type=str, default=None, choices=list(STEMMERS) + ['none'],
+                       help='Stemmer ROUGE (default: porter untuk tokenizer rouge_score, tanpa stemmer untuk indonesian)')
+    parser.add_argument('--atol', type=float, default=1e-12,
+                       help='Toleransi selisih absolut skor')
+    parser.add_argument('--output_dir', type=str, default='results',
+                       help='Direktori untuk menyimpan hasil benchmark')
+
+    args = parser.parse_args()
+    args.stemmer = resolve_stemmer(args.tokenizer, args.stemmer)
+
+    references, predictions = build_validation_pairs(args.data_dir, args.results_path)
+    print(f"Set validasi: {len(references)} pasangan")
+
+    scores, timings = {}, {}
+    for engine in ROUGE_ENGINES:
+        evaluator = SummarizationEvaluator(engine=engine, tokenizer=args.tokenizer, stemmer=args.stemmer)
+        start_time = time.perf_counter()
+        scores[engine] = evaluator.score_rouge_pairs(references, predictions)
+        timings[engine] = time.perf_counter() - start_time
+
+    diff = np.abs(scores['rouge_score'] - scores['native'])
+    max_diff = {rouge_type: float(diff[:, i].max()) if len(diff) else 0.0 for i, rouge_type in enumerate(ROUGE_TYPES)}
+
+    # BLEU dari statistik n-gram native harus sama dengan sacrebleu; selisih
+    # menandakan perubahan tokenisasi atau rumus di versi sacrebleu terpasang
+    valid_pairs = [(ref, pred) for ref, pred in zip(references, predictions) if pred.strip()]
+    bleu_native = evaluator.calculate_bleu_score(references, predictions)['bleu']
+    bleu_sacrebleu = corpus_bleu([pred for _, pred in valid_pairs], [[ref for ref, _ in valid_pairs]]).score \
+        if valid_pairs else 0.0
+    max_diff['bleu'] = abs(bleu_native - bleu_sacrebleu)
+
+    passed = all(value <= args.atol for value in max_diff.values())
+
+    results = {
+        'pairs': len(references),
+        'tokenizer': args.tokenizer,
+        'stemmer': args.stemmer,
+        'max_abs_diff': max_diff,
+        'passed': passed,
+        'pairs_per_sec': {engine: len(references) / timings[engine] for engine in ROUGE_ENGINES},
+        'speedup': timings['rouge_score'] / timings['native'] if timings['native'] > 0 else None
+    }
+
+    print("\n" + "=" * 50)
+    print("VALIDASI ENGINE ROUGE")
+    print("=" * 50)
+    for rouge_type, value in max_diff.items():
+        print(f"  {rouge_type}: selisih maksimum {value:.2e}")
+    for engine in ROUGE_ENGINES:
+        print(f"  {engine}: {results['pairs_per_sec'][engine]:.1f} pasangan/detik")
+    print(f"Status: {'COCOK' if passed else 'TIDAK COCOK'}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, 'benchmark_rouge.json')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nHasil tersimpan di: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,560 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+import torch
+from torch.nn.utils.rnn import pad_sequence
+from tqdm import tqdm
+try:
+    import fcntl
+except ImportError:
+    # Windows: tanpa lock antar proses, ReferenceEmbeddingStore hanya aman untuk satu penulis
+    fcntl = None
+from bert_score.utils import (
+    lang2model, model2layers, get_model, get_tokenizer, get_idf_dict,
+    sent_encode, bert_encode, padding, greedy_cos_idf
+)
+
+from telemetry import available_memory_mb, peak_rss_mb
+
+# Batas token budget per batch encode saat ditentukan otomatis; budget default
+# dipakai jika memori tersedia tidak dapat dibaca
+MIN_TOKEN_BUDGET = 512
+MAX_TOKEN_BUDGET = 65536
+DEFAULT_TOKEN_BUDGET = 8192
+
+
+@contextmanager
+def torch_threads(num_threads: Optional[int]):
+    """
+    Mengatur jumlah thread torch selama blok berjalan, lalu mengembalikannya
+    """
+    if not num_threads:
+        yield
+        return
+    previous = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+def token_budget_batches(lengths: List[int], max_tokens: int, max_batch_size: Optional[int] = None) -> List[List[int]]:
+    """
+    Membagi kalimat menjadi batch berdasarkan token budget
+
+    Kalimat diurutkan dari yang terpanjang, lalu batch diisi selama
+    jumlah baris x panjang terpanjang dalam batch (ukuran tensor setelah
+    padding) tidak melebihi max_tokens.
+
+    Args:
+        lengths: Panjang token setiap kalimat
+        max_tokens: Token budget per batch (termasuk padding)
+        max_batch_size: Batas jumlah kalimat per batch (opsional)
+
+    Returns:
+        List batch berisi indeks kalimat
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches, batch = [], []
+    for i in order:
+        # Batch terurut menurun, sehingga panjang padding adalah panjang elemen pertama
+        padded_length = lengths[batch[0]] if batch else lengths[i]
+        full = max_batch_size is not None and len(batch) >= max_batch_size
+        if batch and (full or (len(batch) + 1) * padded_length > max_tokens):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class ReferenceEmbeddingStore:
+    """
+    Class untuk menyimpan embedding token reference BERTScore di disk
+
+    Embedding seluruh reference disimpan sebagai satu array float32 datar
+    (`embeddings.f32`, satu baris per token) beserta token id (`token_ids.i32`)
+    dan offset akhir setiap reference (`offsets.i64`), dengan pola yang sama
+    seperti TokenizedCorpusStore. File bersifat append-only: reference baru
+    hanya menambahkan barisnya di akhir file, sehingga memori dan IO per
+    penambahan sebanding dengan jumlah reference baru, bukan ukuran store.
+    Hash reference (`digests.txt`) ditulis terakhir dan menandai entry yang
+    sudah lengkap. Setiap store dipisahkan per model dan layer; reference
+    dicari berdasarkan hash teksnya. Bobot idf tidak disimpan melainkan
+    dihitung dari token id saat scoring, sehingga satu store berlaku untuk
+    BERTScore dengan maupun tanpa idf.
+
+    Penambahan entry dilakukan di bawah lock eksklusif (fcntl.flock pada
+    file `.lock`), sehingga beberapa proses dapat berbagi satu store. Di
+    platform tanpa fcntl (Windows) store hanya aman untuk satu penulis.
+    """
+
+    DIGEST_LINE_BYTES = 41
+
+    def __init__(self, cache_dir: str, model_type: str, num_layers: int):
+        """
+        Inisialisasi embedding store
+
+        Args:
+            cache_dir: Direktori root untuk menyimpan embedding store
+            model_type: Nama model BERTScore
+            num_layers: Layer yang dipakai sebagai representasi
+        """
+        self.model_type = model_type
+        self.num_layers = num_layers
+
+        key = re.sub(r'[^\w\-.]', '_', f"{model_type}@L{num_layers}")
+        self.store_dir = os.path.join(cache_dir, key)
+
+        self.dim: Optional[int] = None
+        self._index: Dict[str, int] = {}
+        self._digests: List[str] = []
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._token_ids = np.zeros(0, dtype=np.int32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @staticmethod
+    def digest(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.store_dir, name)
+
+    def _map(self):
+        """
+        Memetakan file embedding dan token id (sebatas entry yang lengkap) ke memori
+        """
+        n_tokens = int(self._offsets[-1])
+        if n_tokens == 0:
+            return
+        self._embeddings = np.memmap(self._path('embeddings.f32'), dtype=np.float32, mode='r',
+                                     shape=(n_tokens, self.dim))
+        self._token_ids = np.memmap(self._path('token_ids.i32'), dtype=np.int32, mode='r', shape=(n_tokens,))
+
+    def _load(self):
+        """
+        Memuat embedding store dari disk jika sudah ada
+        """
+        meta_path = self._path('meta.json')
+        if not os.path.exists(meta_path):
+            return
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            self.dim = json.load(f)['dim']
+
+        digests = []
+        if os.path.exists(self._path('digests.txt')):
+            with open(self._path('digests.txt'), 'r', encoding='ascii') as f:
+                # Baris terakhir yang terpotong (penulisan terhenti) diabaikan
+                digests = [line[:-1] for line in f if line.endswith('\n')]
+        ends = np.fromfile(self._path('offsets.i64'), dtype=np.int64) if os.path.exists(self._path('offsets.i64')) \
+            else np.zeros(0, dtype=np.int64)
+
+        n_entries = min(len(digests), len(ends))
+        self._digests = digests[:n_entries]
+        self._index = {digest: row for row, digest in enumerate(self._digests)}
+        self._offsets = np.concatenate([[0], ends[:n_entries]]).astype(np.int64)
+        self._map()
+
+    def _refresh(self):
+        """
+        Membaca entry yang ditambahkan proses lain sejak store terakhir dibaca
+
+        Hanya bagian akhir digests.txt dan offsets.i64 yang dibaca.
+        """
+        if self.dim is None:
+            self._load()
+            return
+        n_entries = len(self._digests)
+        digests = []
+        if os.path.exists(self._path('digests.txt')):
+            with open(self._path('digests.txt'), 'rb') as f:
+                f.seek(n_entries * self.DIGEST_LINE_BYTES)
+                # Baris terakhir yang terpotong diabaikan
+                digests = f.read().decode('ascii').split('\n')[:-1]
+        ends = np.fromfile(self._path('offsets.i64'), dtype=np.int64, offset=n_entries * 8) \
+            if os.path.exists(self._path('offsets.i64')) else np.zeros(0, dtype=np.int64)
+
+        n_new = min(len(digests), len(ends))
+        if n_new == 0:
+            return
+        for digest in digests[:n_new]:
+            self._index[digest] = len(self._digests)
+            self._digests.append(digest)
+        self._offsets = np.concatenate([self._offsets, ends[:n_new]])
+        self._map()
+
+    @contextmanager
+    def _exclusive(self):
+        """
+        Lock eksklusif antar proses selama store diubah (tanpa lock jika fcntl tidak tersedia)
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self._path('.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _truncate_uncommitted(self):
+        """
+        Membuang sisa penulisan yang terhenti sebelum entry-nya tercatat di digests.txt
+
+        Harus dipanggil di bawah _exclusive() setelah _refresh(), sehingga
+        penambahan proses lain yang sedang berlangsung tidak ikut terpotong.
+        """
+        n_entries, n_tokens = len(self._digests), int(self._offsets[-1])
+        sizes = {
+            'embeddings.f32': n_tokens * self.dim * 4,
+            'token_ids.i32': n_tokens * 4,
+            'offsets.i64': n_entries * 8,
+            'digests.txt': n_entries * self.DIGEST_LINE_BYTES
+        }
+        for name, size in sizes.items():
+            path = self._path(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def get(self, digest: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Mengambil embedding dan token id satu reference
+
+        Args:
+            digest: Hash teks reference (lihat digest())
+
+        Returns:
+            Tuple (embedding [panjang, dim], token id), atau None jika belum ada
+        """
+        row = self._index.get(digest)
+        if row is None:
+            return None
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return self._embeddings[start:end], self._token_ids[start:end]
+
+    def add(self, entries: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """
+        Menambahkan embedding reference baru ke akhir file store
+
+        Args:
+            entries: Dictionary hash teks -> (embedding, token id)
+        """
+        if all(digest in self._index for digest in entries):
+            return
+
+        with self._exclusive():
+            # Entry yang ditambahkan proses lain sejak store dibaca tidak ditulis ulang
+            self._refresh()
+            entries = {digest: entry for digest, entry in entries.items() if digest not in self._index}
+            if not entries:
+                return
+
+            if self.dim is None:
+                self.dim = int(next(iter(entries.values()))[0].shape[1])
+                with open(self._path('meta.json'), 'w', encoding='utf-8') as f:
+                    json.dump({'model_type': self.model_type, 'num_layers': self.num_layers, 'dim': self.dim}, f)
+            self._truncate_uncommitted()
+
+            digests = list(entries)
+            embeddings = np.concatenate([entries[digest][0] for digest in digests]).astype(np.float32)
+            token_ids = np.concatenate([entries[digest][1] for digest in digests]).astype(np.int32)
+            ends = self._offsets[-1] + np.cumsum([len(entries[digest][1]) for digest in digests], dtype=np.int64)
+
+            # Data lebih dulu, digest terakhir: entry hanya terlihat jika datanya lengkap
+            for name, array in (('embeddings.f32', embeddings), ('token_ids.i32', token_ids),
+                                ('offsets.i64', ends)):
+                with open(self._path(name), 'ab') as f:
+                    f.write(np.ascontiguousarray(array).tobytes())
+            with open(self._path('digests.txt'), 'a', encoding='ascii') as f:
+                f.write(''.join(f"{digest}\n" for digest in digests))
+
+        for digest in digests:
+            self._index[digest] = len(self._digests)
+            self._digests.append(digest)
+        self._offsets = np.concatenate([self._offsets, ends])
+        self._map()
+
+
+class BERTScoreEngine:
+    """
+    Class untuk menghitung BERTScore dengan cache embedding reference
+
+    Perhitungan mengikuti bert_score.score (embedding layer yang sama, greedy
+    matching cosine, dan bobot idf opsional). Reference adalah data korpus
+    yang tetap, sehingga embedding-nya disimpan di ReferenceEmbeddingStore dan
+    hanya prediction yang perlu di-encode pada evaluasi berikutnya.
+
+    Kalimat di-encode dalam batch yang diurutkan berdasarkan panjang dengan
+    token budget per batch, sehingga padding minimal dan ukuran tensor
+    terkendali. Jika max_tokens tidak diberikan, budget ditentukan dari
+    memori yang tersedia.
+    """
+
+    def __init__(self, lang: str = "id", model_type: Optional[str] = None, num_layers: Optional[int] = None,
+                 idf: bool = False, batch_size: int = 64, device: Optional[str] = None,
+                 cache_dir: Optional[str] = None, max_tokens: Optional[int] = None,
+                 memory_fraction: float = 0.25, num_threads: Optional[int] = None,
+                 isolated: bool = False):
+        """
+        Inisialisasi engine BERTScore
+
+        Args:
+            lang: Bahasa untuk memilih model default bert_score
+            model_type: Nama model (default: model bert_score untuk lang), misalnya
+                distilbert-base-multilingual-cased untuk encoder yang lebih kecil
+            num_layers: Layer representasi (default: layer bert_score untuk model)
+            idf: Gunakan bobot idf yang dihitung dari reference
+            batch_size: Jumlah pasangan per batch greedy matching, sekaligus
+                batas jumlah kalimat per batch encode
+            device: Device untuk model (default: cuda jika tersedia)
+            cache_dir: Direktori cache embedding reference (None untuk tanpa cache)
+            max_tokens: Token budget per batch encode (None untuk otomatis)
+            memory_fraction: Porsi memori tersedia untuk aktivasi saat budget otomatis
+            num_threads: Jumlah thread torch selama scoring (None untuk default torch)
+            isolated: Jalankan scoring di subprocess terpisah, sehingga model
+                BERTScore tidak pernah resident di proses utama
+        """
+        self.model_type = model_type or lang2model[lang.lower()]
+        if num_layers is None:
+            if self.model_type not in model2layers:
+                raise ValueError(f"num_layers harus diberikan untuk model {self.model_type}")
+            num_layers = model2layers[self.model_type]
+        self.num_layers = num_layers
+        self.idf = idf
+        self.batch_size = batch_size
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.max_tokens = max_tokens
+        self.memory_fraction = memory_fraction
+        self.num_threads = num_threads
+        self.cache_dir = cache_dir
+        self.isolated = isolated
+        self.store = ReferenceEmbeddingStore(cache_dir, self.model_type, self.num_layers) if cache_dir else None
+        # Peak RSS subprocess scoring terakhir (mode isolated)
+        self.subprocess_peak_rss_mb: Optional[float] = None
+
+        # Model dimuat saat pertama kali dibutuhkan
+        self.model = None
+        self.tokenizer = None
+
+    def _load_model(self):
+        if self.model is None:
+            self.tokenizer = get_tokenizer(self.model_type, False)
+            self.model = get_model(self.model_type, self.num_layers)
+            self.model.to(self.device)
+            if self.max_tokens is None:
+                self.max_tokens = self.auto_token_budget()
+
+    def auto_token_budget(self) -> int:
+        """
+        Menentukan token budget per batch encode dari memori yang tersedia
+
+        Perkiraan memori per token mencakup hidden state, feed-forward, dan
+        skor attention (untuk panjang maksimum model) dalam float32. Karena
+        inference tanpa gradient, hanya aktivasi satu layer yang hidup
+        bersamaan.
+
+        Returns:
+            Token budget per batch
+        """
+        config = self.model.config
+        hidden_size = getattr(config, 'hidden_size', 768)
+        intermediate_size = getattr(config, 'intermediate_size', 4 * hidden_size)
+        num_heads = getattr(config, 'num_attention_heads', 12)
+        max_length = min(self.tokenizer.model_max_length, 512)
+        bytes_per_token = 4 * (intermediate_size + 6 * hidden_size + num_heads * max_length)
+
+        if str(self.device).startswith('cuda'):
+            available_bytes = torch.cuda.mem_get_info(torch.device(self.device))[0]
+        else:
+            available_mb = available_memory_mb()
+            if available_mb is None:
+                # Memori tersedia tidak diketahui: pakai budget statis
+                return DEFAULT_TOKEN_BUDGET
+            available_bytes = available_mb * 1024 * 1024
+
+        budget = int(available_bytes * self.memory_fraction / bytes_per_token)
+        return max(MIN_TOKEN_BUDGET, min(budget, MAX_TOKEN_BUDGET))
+
+    def embed(self, sentences: List[str], verbose: bool = False) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Menghitung embedding token untuk setiap kalimat
+
+        Args:
+            sentences: List kalimat
+            verbose: Tampilkan progress bar
+
+        Returns:
+            List (embedding [panjang, dim], token id) sesuai urutan input
+        """
+        self._load_model()
+        encoded = [sent_encode(self.tokenizer, sentence) for sentence in sentences]
+        results: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(encoded)
+
+        batches = token_budget_batches([len(ids) for ids in encoded], self.max_tokens, self.batch_size)
+        if verbose:
+            batches = tqdm(batches, desc="Computing BERT embeddings")
+
+        with torch_threads(self.num_threads):
+            for batch in batches:
+                padded, lens, mask = padding([encoded[i] for i in batch], self.tokenizer.pad_token_id, dtype=torch.long)
+                embeddings = bert_encode(
+                    self.model, padded.to(self.device), attention_mask=mask.to(self.device)
+                ).cpu().numpy()
+                for row, i in enumerate(batch):
+                    length = int(lens[row])
+                    results[i] = (embeddings[row, :length], np.asarray(encoded[i], dtype=np.int32))
+
+        return results
+
+    def _reference_embeddings(self, references: List[str], verbose: bool = False) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Mengambil embedding reference dari store, meng-encode yang belum ada
+        """
+        digests = [ReferenceEmbeddingStore.digest(ref) for ref in references]
+        cached: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        if self.store is not None:
+            for digest in set(digests):
+                entry = self.store.get(digest)
+                if entry is not None:
+                    cached[digest] = entry
+
+        missing = {digest: ref for digest, ref in zip(digests, references) if digest not in cached}
+        if missing:
+            new_entries = dict(zip(missing, self.embed(list(missing.values()), verbose=verbose)))
+            cached.update(new_entries)
+            if self.store is not None:
+                self.store.add(new_entries)
+
+        if verbose:
+            print(f"Embedding reference: {len(set(digests)) - len(missing)} dari cache, {len(missing)} di-encode")
+
+        return [cached[digest] for digest in digests]
+
+    def _idf_dict(self, references: List[str]) -> Dict[int, float]:
+        if self.idf:
+            return get_idf_dict(references, self.tokenizer)
+        idf_dict = defaultdict(lambda: 1.0)
+        # Bobot [SEP] dan [CLS] bernilai 0 seperti bert_score
+        idf_dict[self.tokenizer.sep_token_id] = 0
+        idf_dict[self.tokenizer.cls_token_id] = 0
+        return idf_dict
+
+    def _pad_batch(self, entries: List[Tuple[np.ndarray, np.ndarray]],
+                   idf_dict: Dict[int, float]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        embeddings = [torch.tensor(np.asarray(embedding)) for embedding, _ in entries]
+        idf = [torch.tensor([idf_dict[i] for i in ids.tolist()], dtype=torch.float) for _, ids in entries]
+        lens = torch.tensor([len(embedding) for embedding in embeddings], dtype=torch.long)
+
+        embedding_pad = pad_sequence(embeddings, batch_first=True, padding_value=2.0).to(self.device)
+        idf_pad = pad_sequence(idf, batch_first=True).to(self.device)
+        mask = (torch.arange(int(lens.max())).expand(len(lens), -1) < lens.unsqueeze(1)).to(self.device)
+        return embedding_pad, mask, idf_pad
+
+    def score(self, references: List[str], predictions: List[str],
+              verbose: bool = False) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Menghitung BERTScore per pasangan
+
+        Args:
+            references: List of reference summaries
+            predictions: List of predicted summaries
+            verbose: Tampilkan progress
+
+        Returns:
+            Tuple tensor (P, R, F1) dengan panjang sama seperti input
+        """
+        if self.isolated:
+            return self._score_in_subprocess(references, predictions, verbose=verbose)
+        
+        self._load_model()
+        ref_entries = self._reference_embeddings(references, verbose=verbose)
+
+        unique_predictions = list(dict.fromkeys(predictions))
+        pred_lookup = dict(zip(unique_predictions, self.embed(unique_predictions, verbose=verbose)))
+        pred_entries = [pred_lookup[pred] for pred in predictions]
+
+        idf_dict = self._idf_dict(references)
+
+        # Pasangan diurutkan berdasarkan panjang agar padding per batch minimal
+        order = sorted(
+            range(len(references)),
+            key=lambda i: (len(pred_entries[i][1]), len(ref_entries[i][1])),
+            reverse=True
+        )
+        scores = torch.zeros(len(references), 3)
+        with torch.no_grad(), torch_threads(self.num_threads):
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                ref_stats = self._pad_batch([ref_entries[i] for i in batch], idf_dict)
+                pred_stats = self._pad_batch([pred_entries[i] for i in batch], idf_dict)
+                P, R, F1 = greedy_cos_idf(*ref_stats, *pred_stats)
+                scores[batch] = torch.stack((P, R, F1), dim=-1).cpu()
+
+        return scores[:, 0], scores[:, 1], scores[:, 2]
+
+    def _score_in_subprocess(self, references: List[str], predictions: List[str],
+                             verbose: bool = False) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Menjalankan score() di subprocess; input dan skor dipertukarkan lewat file
+        """
+        config = {
+            'model_type': self.model_type,
+            'num_layers': self.num_layers,
+            'idf': self.idf,
+            'batch_size': self.batch_size,
+            'device': self.device,
+            'cache_dir': self.cache_dir,
+            'max_tokens': self.max_tokens,
+            'memory_fraction': self.memory_fraction,
+            'num_threads': self.num_threads
+        }
+        with tempfile.TemporaryDirectory(prefix='bertscore_') as work_dir:
+            input_path = os.path.join(work_dir, 'pairs.json')
+            output_path = os.path.join(work_dir, 'scores.npz')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                json.dump({'config': config, 'references': references, 'predictions': predictions,
+                           'verbose': verbose}, f, ensure_ascii=False)
+
+            subprocess.run([sys.executable, os.path.abspath(__file__), input_path, output_path], check=True)
+
+            with np.load(output_path) as data:
+                scores = torch.from_numpy(data['scores'])
+                self.subprocess_peak_rss_mb = float(data['peak_rss_mb'])
+        print(f"BERTScore subprocess selesai (peak RSS {self.subprocess_peak_rss_mb:.0f} MB)")
+        return scores[:, 0], scores[:, 1], scores[:, 2]
+
+
+def _score_pairs_file(input_path: str, output_path: str):
+    """
+    Entry point subprocess BERTScore: membaca pasangan dari input_path dan
+    menulis skor (n, 3) beserta peak RSS ke output_path (.npz)
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    engine = BERTScoreEngine(**payload['config'])
+    P, R, F1 = engine.score(payload['references'], payload['predictions'],
+                           verbose=payload.get('verbose', False))
+    np.savez(output_path, scores=torch.stack((P, R, F1), dim=-1).numpy(), peak_rss_mb=peak_rss_mb() or np.nan)
+
+
+if __name__ == "__main__":
+    _score_pairs_file(sys.argv[1], sys.argv[2])
@@ -0,0 +1,244 @@
+"""
+Runner DAG sederhana dengan artefak stage yang di-cache berdasarkan hash input dan konfigurasi
+"""
+
+import os
+import json
+import time
+import pickle
+import hashlib
+from typing import List, Dict, Any, Optional, Callable, Sequence, Union
+
+
+class StageFailed(Exception):
+    """
+    Stage gagal; run dihentikan dan pesan error dicetak oleh pemanggil
+    """
+
+
+class Stage:
+    """
+    Satu stage pipeline
+
+    Fungsi stage menerima (config, inputs) dengan inputs berupa dictionary
+    nama stage input -> artefaknya, dan mengembalikan artefak stage.
+    """
+
+    def __init__(self, name: str, run: Callable[[Dict[str, Any], Dict[str, Any]], Any],
+                 inputs: Sequence[str] = (),
+                 config_keys: Union[Sequence[str], Callable[[Dict[str, Any]], Sequence[str]]] = (),
+                 external_inputs: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+                 outputs: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+                 persist: bool = True, version: int = 1):
+        """
+        Args:
+            name: Nama stage
+            run: Fungsi stage
+            inputs: Nama stage yang artefaknya dibutuhkan
+            config_keys: Field konfigurasi yang memengaruhi artefak (atau fungsi
+                config -> daftar field, jika bergantung pada mode run)
+            external_inputs: Fungsi config -> daftar file di luar pipeline
+                (misalnya file dataset) yang ikut menentukan key
+            outputs: Fungsi config -> daftar file yang ditulis stage; stage
+                dijalankan ulang jika salah satunya hilang
+            persist: Simpan artefak ke cache (False untuk stage murah yang
+                artefaknya besar; stage dijalankan ulang jika dibutuhkan)
+            version: Naikkan jika logika stage berubah agar cache lama tidak dipakai
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.config_keys = config_keys
+        self.external_inputs = external_inputs
+        self.outputs = outputs
+        self.persist = persist
+        self.version = version
+
+    def keys_for(self, config: Dict[str, Any]) -> List[str]:
+        keys = self.config_keys(config) if callable(self.config_keys) else self.config_keys
+        return sorted(keys)
+
+
+def _file_fingerprint(path: str) -> List[Any]:
+    # Ukuran dan mtime: murah untuk file dataset besar
+    if not os.path.exists(path):
+        return [os.path.basename(path), None, None]
+    stat = os.stat(path)
+    return [os.path.basename(path), stat.st_size, stat.st_mtime_ns]
+
+
+class StageRunner:
+    """
+    Menjalankan stage secara berurutan dan melewati stage yang artefaknya sudah ada
+
+    Key setiap stage adalah hash dari nama dan versi stage, field konfigurasi
+    yang dipakainya, fingerprint file eksternal, serta key dan fingerprint
+    file artefak stage input. Karena input ikut di-hash, perubahan di satu
+    stage otomatis mengubah key semua stage turunannya, sedangkan stage hulu
+    tetap dipakai dari cache. Stage yang dijalankan ulang paksa dengan key
+    yang sama (misalnya generate yang non-deterministik) menulis artefak
+    baru, sehingga fingerprint-nya berubah dan cache turunannya tidak lagi
+    dianggap valid.
+    Artefak hanya dimuat dari cache jika dibutuhkan oleh stage yang harus
+    dijalankan.
+    """
+
+    def __init__(self, stages: List[Stage], config: Dict[str, Any], cache_dir: Optional[str] = 'cache/stages'):
+        """
+        Args:
+            stages: Stage dalam urutan topologis
+            config: Konfigurasi run
+            cache_dir: Direktori cache artefak (None untuk menjalankan semua stage
+                tanpa menyimpan artefak)
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = [stage.name for stage in stages]
+        self.config = config
+        self.cache_dir = cache_dir
+        self.artifacts: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.forced: set = set()
+        self.only_stage: Optional[str] = None
+        self.keys = self._compute_keys()
+
+    def _compute_keys(self) -> Dict[str, str]:
+        keys = {}
+        for name in self.order:
+            stage = self.stages[name]
+            for dependency in stage.inputs:
+                if dependency not in keys:
+                    raise ValueError(f"Stage {name} membutuhkan {dependency} yang belum didefinisikan sebelumnya")
+            payload = {
+                'stage': name,
+                'version': stage.version,
+                'config': {key: self.config.get(key) for key in stage.keys_for(self.config)},
+                'external': [_file_fingerprint(path) for path in stage.external_inputs(self.config)]
+                if stage.external_inputs else [],
+                'inputs': {dependency: [keys[dependency], self._artifact_fingerprint(dependency, keys[dependency])]
+                           for dependency in stage.inputs}
+            }
+            keys[name] = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return keys
+
+    def _artifact_path(self, name: str, key: Optional[str] = None) -> Optional[str]:
+        if self.cache_dir is None or not self.stages[name].persist:
+            return None
+        return os.path.join(self.cache_dir, name, f"{(key or self.keys[name])[:32]}.pkl")
+
+    def _artifact_fingerprint(self, name: str, key: str) -> Optional[List[Any]]:
+        # Ukuran dan mtime file artefak: berubah setiap kali stage dijalankan ulang
+        path = self._artifact_path(name, key)
+        return _file_fingerprint(path)[1:] if path is not None else None
+
+    def is_cached(self, name: str) -> bool:
+        path = self._artifact_path(name)
+        if path is None or not os.path.exists(path):
+            return False
+        outputs = self.stages[name].outputs
+        return outputs is None or all(os.path.exists(output) for output in outputs(self.config))
+
+    def descendants(self, name: str) -> List[str]:
+        """
+        Stage yang (langsung atau tidak langsung) bergantung pada stage ini, termasuk stage itu sendiri
+        """
+        found = {name}
+        for other in self.order:
+            if any(dependency in found for dependency in self.stages[other].inputs):
+                found.add(other)
+        return [other for other in self.order if other in found]
+
+    def _execute(self, name: str) -> Any:
+        stage = self.stages[name]
+        inputs = {dependency: self.artifact(dependency) for dependency in stage.inputs}
+        start_time = time.perf_counter()
+        artifact = stage.run(self.config, inputs)
+        duration = time.perf_counter() - start_time
+
+        path = self._artifact_path(name)
+        if path is not None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Tulis ke file sementara dulu agar artefak setengah jadi tidak pernah terbaca
+            with open(f"{path}.tmp", 'wb') as f:
+                pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{path}.tmp", path)
+
+        self.artifacts[name] = artifact
+        self.timings[name] = {'status': 'run', 'duration': duration, 'key': self.keys[name]}
+        if path is not None:
+            # Artefak baru mengubah key semua stage turunan
+            self.keys = self._compute_keys()
+        return artifact
+
+    def artifact(self, name: str) -> Any:
+        """
+        Artefak stage: dari memori, dari cache, atau dengan menjalankan stage
+
+        Args:
+            name: Nama stage
+
+        Returns:
+            Artefak stage
+        """
+        if name in self.artifacts:
+            return self.artifacts[name]
+        if name not in self.forced and self.is_cached(name):
+            start_time = time.perf_counter()
+            with open(self._artifact_path(name), 'rb') as f:
+                self.artifacts[name] = pickle.load(f)
+            self.timings[name] = {'status': 'loaded', 'duration': time.perf_counter() - start_time,
+                                  'key': self.keys[name]}
+            return self.artifacts[name]
+        if self.only_stage is not None and name != self.only_stage and self.stages[name].persist:
+            raise StageFailed(f"Artefak stage '{name}' belum ada di cache; "
+                              f"jalankan pipeline tanpa --only_stage terlebih dahulu")
+        return self._execute(name)
+
+    def run(self, from_stage: Optional[str] = None, only_stage: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Menjalankan pipeline
+
+        Args:
+            from_stage: Jalankan ulang stage ini dan semua turunannya (abaikan cache)
+            only_stage: Jalankan ulang hanya stage ini; input dimuat dari cache
+
+        Returns:
+            Timing per stage: {'status': 'run'|'loaded'|'cached', 'duration', 'key'}
+        """
+        for name in (from_stage, only_stage):
+            if name is not None and name not in self.stages:
+                raise ValueError(f"Stage tidak dikenal: {name}. Pilihan: {self.order}")
+
+        self.only_stage = only_stage
+        if only_stage is not None:
+            self.forced = {only_stage}
+            targets = [only_stage]
+        else:
+            self.forced = set(self.descendants(from_stage)) if from_stage is not None else set()
+            targets = self.order
+
+        for name in targets:
+            if name in self.artifacts:
+                continue
+            if name not in self.forced and self.is_cached(name):
+                self.timings[name] = {'status': 'cached', 'duration': 0.0, 'key': self.keys[name]}
+                continue
+            if not self.stages[name].persist and name not in self.forced and len(self.descendants(name)) > 1:
+                # Stage tanpa cache baru dijalankan saat artefaknya diminta stage turunan
+                continue
+            self._execute(name)
+        return self.timings
+
+    def print_report(self):
+        """
+        Mencetak status dan durasi setiap stage
+        """
+        for name in self.order:
+            timing = self.timings.get(name)
+            if timing is None:
+                print(f"  {name}: dilewati")
+            elif timing['status'] == 'cached':
+                print(f"  {name}: dari cache (key {timing['key'][:12]})")
+            elif timing['status'] == 'loaded':
+                print(f"  {name}: dimuat dari cache dalam {timing['duration']:.2f} detik (key {timing['key'][:12]})")
+            else:
+                print(f"  {name}: {timing['duration']:.2f} detik (key {timing['key'][:12]})")
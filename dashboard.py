@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Dashboard HTML statis (self-contained) dari artefak run yang sudah tersimpan
+"""
+
+import os
+import json
+import html
+import base64
+import hashlib
+import argparse
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aggregates import AggregateCube, CUBE_DIMENSIONS
+from results_store import RESULTS_FILE, load_results_frame
+
+# Naikkan jika format HTML section berubah agar cache lama tidak dipakai
+DASHBOARD_VERSION = 1
+
+# Plot yang disimpan main.py (preview dipakai jika ada agar HTML tetap kecil)
+PLOT_FILES = ['metrics_comparison.png', 'category_analysis.png', 'source_analysis.png',
+              'length_analysis.png', 'summary_report.png']
+
+# Metrik utama untuk tabel ringkasan dan perbandingan run
+SUMMARY_METRICS = ['rouge1', 'rouge2', 'rougeL', 'bleu', 'bertscore_f1']
+
+# Field telemetry yang ditampilkan
+TELEMETRY_FIELDS = ['prompt_tokens', 'generated_tokens', 'prefill_time', 'decode_time',
+                    'total_time', 'tokens_per_sec', 'peak_rss_delta_mb']
+
+STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+h1 { border-bottom: 2px solid #444; }
+h2 { margin-top: 2em; border-bottom: 1px solid #aaa; }
+table { border-collapse: collapse; margin: 0.5em 0 1.5em 0; font-size: 0.9em; }
+th, td { border: 1px solid #ccc; padding: 3px 8px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+th { background: #f0f0f0; }
+td.best { font-weight: bold; background: #e6f4e6; }
+img { max-width: 100%; border: 1px solid #ddd; margin: 0.5em 0; }
+nav a { margin-right: 1em; }
+.muted { color: #888; }
+"""
+
+
+def find_runs(paths: List[str]) -> List[str]:
+    """
+    Mencari direktori run (berisi evaluation_results.json)
+
+    Path yang bukan direktori run ditelusuri ke subdirektorinya, sehingga
+    direktori sweep (results/sweep/<model>/<config>) cukup diberikan sekali.
+
+    Args:
+        paths: Direktori run atau direktori induknya
+
+    Returns:
+        List direktori run (terurut)
+    """
+    runs = []
+    for path in paths:
+        if os.path.isfile(os.path.join(path, 'evaluation_results.json')):
+            runs.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            if 'evaluation_results.json' in files:
+                runs.append(root)
+    return sorted(dict.fromkeys(os.path.normpath(run) for run in runs))
+
+
+def run_names(runs: List[str]) -> List[str]:
+    """
+    Nama pendek setiap run: path relatif terhadap direktori induk bersama
+    """
+    if len(runs) == 1:
+        return [os.path.basename(os.path.abspath(runs[0]))]
+    common = os.path.commonpath([os.path.abspath(run) for run in runs])
+    return [os.path.relpath(os.path.abspath(run), common) for run in runs]
+
+
+class FileFingerprints:
+    """
+    Hash isi file dengan memo berdasarkan ukuran dan mtime
+
+    File yang ukuran dan mtime-nya tidak berubah sejak build sebelumnya
+    tidak dibaca ulang.
+    """
+
+    def __init__(self, memo: Optional[Dict[str, List[Any]]] = None):
+        self.memo = memo or {}
+
+    def digest(self, path: str) -> str:
+        if not os.path.exists(path):
+            return 'missing'
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.memo.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        self.memo[key] = [stat.st_size, stat.st_mtime_ns, sha.hexdigest()]
+        return sha.hexdigest()
+
+
+def _load_json(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _fmt(value: Any, digits: int = 4) -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, (float, np.floating)):
+        return '-' if np.isnan(value) else f"{value:.{digits}f}"
+    return html.escape(str(value))
+
+
+def _table(header: List[str], rows: List[List[Any]], best: Optional[List[Optional[int]]] = None) -> str:
+    """
+    Tabel HTML; best berisi indeks baris terbaik per kolom (atau None)
+    """
+    parts = ['<table><tr>' + ''.join(f'<th>{html.escape(str(h))}</th>' for h in header) + '</tr>']
+    for i, row in enumerate(rows):
+        cells = []
+        for j, value in enumerate(row):
+            css = ' class="best"' if best and best[j] == i else ''
+            cells.append(f'<td{css}>{value if isinstance(value, str) else _fmt(value)}</td>')
+        parts.append('<tr>' + ''.join(cells) + '</tr>')
+    parts.append('</table>')
+    return '\n'.join(parts)
+
+
+def _section_metrics(run_dir: str) -> str:
+    results = _load_json(os.path.join(run_dir, 'evaluation_results.json'))
+    summary = results.get('summary', {})
+    intervals = results.get('confidence_intervals', {})
+    rows = []
+    for metric in SUMMARY_METRICS:
+        ci = intervals.get(metric)
+        ci_text = f"[{ci['ci_low']:.4f}, {ci['ci_high']:.4f}]" if ci else '-'
+        rows.append([metric, summary.get(metric), ci_text])
+    parts = ['<h4>Metrik</h4>', _table(['Metrik', 'Nilai', 'CI 95%'], rows)]
+
+    baselines = results.get('baselines')
+    if baselines:
+        rows = [[name] + [scores.get(metric) for metric in ['rouge1', 'rouge2', 'rougeL', 'bleu', 'avg_length']]
+                for name, scores in baselines.items()]
+        rows.append(['model'] + [summary.get(metric) for metric in ['rouge1', 'rouge2', 'rougeL', 'bleu']] + [None])
+        parts += ['<h4>Baseline</h4>', _table(['Baseline', 'ROUGE-1', 'ROUGE-2', 'ROUGE-L', 'BLEU', 'Panjang'], rows)]
+
+    adaptive = results.get('adaptive_sampling')
+    if adaptive:
+        rows = [[key, value if not isinstance(value, dict) else json.dumps(value)] for key, value in adaptive.items()]
+        parts += ['<h4>Sampling adaptif</h4>', _table(['Field', 'Nilai'], rows)]
+
+    stages = results.get('stage_memory')
+    if stages:
+        rows = [[name, stats.get('duration'), stats.get('peak_rss_mb'), stats.get('subprocess_peak_rss_mb')]
+                for name, stats in stages.items()]
+        parts += ['<h4>Stage</h4>', _table(['Stage', 'Durasi (s)', 'Peak RSS (MB)', 'Peak subprocess (MB)'], rows)]
+    return '\n'.join(parts)
+
+
+def _scores_path(run_dir: str) -> str:
+    # Cube agregat jika ada, selain itu tabel skor per item
+    for name in ('aggregate_cube.npz', RESULTS_FILE):
+        path = os.path.join(run_dir, name)
+        if os.path.exists(path):
+            return path
+    return os.path.join(run_dir, 'evaluation_dataframe.csv')
+
+
+def _section_groups(run_dir: str) -> str:
+    path = _scores_path(run_dir)
+    if not os.path.exists(path):
+        return '<p class="muted">Skor per item tidak tersedia</p>'
+    if path.endswith('.npz'):
+        cube = AggregateCube.load(path)
+    elif path.endswith('.csv'):
+        cube = AggregateCube.from_item_scores(pd.read_csv(path))
+    else:
+        cube = AggregateCube.from_item_scores(load_results_frame(path))
+
+    metrics = ['rouge1', 'rouge2', 'rougeL', 'bertscore_f1']
+    parts = []
+    for dimension in CUBE_DIMENSIONS:
+        summary = cube.summary([dimension], metrics=metrics)
+        bleu = cube.bleu([dimension])
+        rows = [[label, int(row['count'])] + [row[f'{metric}_mean'] for metric in metrics] + [bleu[label]]
+                for label, row in summary.iterrows()]
+        parts += [f'<h4>Per {html.escape(dimension)}</h4>',
+                  _table([dimension, 'Jumlah', 'ROUGE-1', 'ROUGE-2', 'ROUGE-L', 'BERTScore-F1', 'BLEU'], rows)]
+    return '\n'.join(parts)
+
+
+def _section_telemetry(run_dir: str) -> str:
+    telemetry = _load_json(os.path.join(run_dir, 'final_report.json')).get('telemetry')
+    if not telemetry:
+        return '<p class="muted">Telemetry tidak tersedia</p>'
+    overall = telemetry['overall']
+    rows = [[field] + [overall[field].get(key) for key in ('p50', 'p90', 'p99', 'mean')]
+            for field in TELEMETRY_FIELDS if field in overall]
+    parts = [f"<h4>Keseluruhan ({overall['count']} artikel)</h4>",
+             _table(['Field', 'p50', 'p90', 'p99', 'Rata-rata'], rows)]
+    for key, title in (('by_category', 'Per kategori'), ('by_length_bucket', 'Per bucket panjang')):
+        groups = telemetry.get(key, {})
+        rows = [[label, stats['count'], stats.get('tokens_per_sec', {}).get('p50'),
+                 stats.get('total_time', {}).get('p90'), stats.get('prefill_time', {}).get('p90')]
+                for label, stats in groups.items()]
+        parts += [f'<h4>{title}</h4>',
+                  _table(['Grup', 'Jumlah', 'Token/detik p50', 'Waktu total p90', 'Prefill p90'], rows)]
+    return '\n'.join(parts)
+
+
+def _plot_path(run_dir: str, plot_name: str) -> str:
+    root, ext = os.path.splitext(plot_name)
+    preview = os.path.join(run_dir, f"{root}_preview{ext}")
+    return preview if os.path.exists(preview) else os.path.join(run_dir, plot_name)
+
+
+def _section_plots(run_dir: str) -> str:
+    parts = []
+    for plot_name in PLOT_FILES:
+        path = _plot_path(run_dir, plot_name)
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('ascii')
+        parts.append(f'<img alt="{html.escape(plot_name)}" src="data:image/png;base64,{encoded}">')
+    return '\n'.join(parts) or '<p class="muted">Plot tidak tersedia</p>'
+
+
+# Section per run: nama -> (judul, fungsi input file, fungsi render)
+RUN_SECTIONS: Dict[str, Tuple[str, Callable[[str], List[str]], Callable[[str], str]]] = {
+    'metrics': ('Ringkasan metrik',
+                lambda run: [os.path.join(run, 'evaluation_results.json')],
+                _section_metrics),
+    'groups': ('Skor per grup',
+               lambda run: [_scores_path(run)],
+               _section_groups),
+    'telemetry': ('Telemetry inference',
+                  lambda run: [os.path.join(run, 'final_report.json')],
+                  _section_telemetry),
+    'plots': ('Plot',
+              lambda run: [_plot_path(run, plot_name) for plot_name in PLOT_FILES],
+              _section_plots)
+}
+
+
+def _section_comparison(runs: List[str], names: List[str]) -> str:
+    """
+    Tabel perbandingan metrik dan perbedaan konfigurasi antar run
+    """
+    results = [_load_json(os.path.join(run, 'evaluation_results.json')) for run in runs]
+    configs = [_load_json(os.path.join(run, 'final_report.json')).get('config', {}) for run in runs]
+    totals = [_load_json(os.path.join(run, 'final_report.json')).get('dataset_info', {}).get('total_articles')
+              for run in runs]
+
+    values = np.array([[result.get('summary', {}).get(metric, np.nan) for metric in SUMMARY_METRICS]
+                       for result in results], dtype=np.float64)
+    best = [None, None] + [int(np.nanargmax(column)) if not np.isnan(column).all() else None for column in values.T]
+    reference = values[0]
+    rows = []
+    for name, total, row in zip(names, totals, values):
+        cells = [html.escape(name), total]
+        for value, base in zip(row, reference):
+            delta = '' if name == names[0] or np.isnan(value) else f' <span class="muted">({value - base:+.4f})</span>'
+            cells.append(f'{_fmt(value)}{delta}')
+        rows.append(cells)
+    parts = [f'<p>Selisih dihitung terhadap run pertama ({html.escape(names[0])}).</p>',
+             _table(['Run', 'Artikel'] + SUMMARY_METRICS, rows, best)]
+
+    # Hanya field konfigurasi yang berbeda antar run
+    keys = sorted({key for config in configs for key in config})
+    varying = [key for key in keys if key != 'output_dir'
+               and len({json.dumps(config.get(key), sort_keys=True) for config in configs}) > 1]
+    if varying:
+        rows = [[html.escape(name)] + [_fmt(config.get(key)) for key in varying] for name, config in zip(names, configs)]
+        parts += ['<h3>Konfigurasi yang berbeda</h3>', _table(['Run'] + varying, rows)]
+    return '\n'.join(parts)
+
+
+def _anchor(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:10]
+
+
+def build_dashboard(paths: List[str], output_path: str, cache_path: Optional[str] = None,
+                    force: bool = False) -> Dict[str, int]:
+    """
+    Membangun dashboard HTML self-contained secara inkremental
+
+    Setiap section diberi key berupa hash isi file inputnya (dan versi
+    dashboard). HTML section disimpan di file cache; section yang key-nya
+    tidak berubah dipakai ulang tanpa membaca artefaknya lagi, sehingga
+    hanya section dari run yang berubah yang di-render ulang.
+
+    Args:
+        paths: Direktori run atau direktori induk (misalnya hasil sweep)
+        output_path: File HTML output
+        cache_path: File cache section (default: <output_path>.cache.json)
+        force: Render ulang semua section
+
+    Returns:
+        Dictionary {'rendered': n, 'reused': n, 'runs': n}
+    """
+    runs = find_runs(paths)
+    if not runs:
+        raise ValueError(f"Tidak ada direktori run (evaluation_results.json) di: {paths}")
+    names = run_names(runs)
+
+    cache_path = cache_path or f"{output_path}.cache.json"
+    cache = {} if force else _load_json(cache_path)
+    if cache.get('version') != DASHBOARD_VERSION:
+        cache = {}
+    fingerprints = FileFingerprints(cache.get('files'))
+    cached_sections = cache.get('sections', {})
+    sections: Dict[str, Dict[str, str]] = {}
+    stats = {'rendered': 0, 'reused': 0, 'runs': len(runs)}
+
+    def render(section_id: str, inputs: List[str], renderer: Callable[[], str]) -> str:
+        key = hashlib.sha256(json.dumps(
+            [DASHBOARD_VERSION, section_id] + [[os.path.basename(path), fingerprints.digest(path)] for path in inputs]
+        ).encode('utf-8')).hexdigest()
+        cached = cached_sections.get(section_id)
+        if cached and cached['key'] == key:
+            stats['reused'] += 1
+            body = cached['html']
+        else:
+            stats['rendered'] += 1
+            body = renderer()
+        sections[section_id] = {'key': key, 'html': body}
+        return body
+
+    body = ['<h1>Dashboard Evaluasi Summarization</h1>',
+            '<nav>' + ''.join(f'<a href="#{_anchor(name)}">{html.escape(name)}</a>' for name in names) + '</nav>']
+
+    if len(runs) > 1:
+        inputs = [os.path.join(run, name) for run in runs for name in ('evaluation_results.json', 'final_report.json')]
+        body += ['<h2>Perbandingan run</h2>',
+                 render('comparison:' + '|'.join(names), inputs, lambda: _section_comparison(runs, names))]
+
+    for run, name in zip(runs, names):
+        body.append(f'<h2 id="{_anchor(name)}">Run: {html.escape(name)}</h2>')
+        for section, (title, inputs, renderer) in RUN_SECTIONS.items():
+            body += [f'<h3>{title}</h3>', render(f'{name}:{section}', inputs(run), lambda: renderer(run))]
+
+    document = ('<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+                f'<title>Dashboard Evaluasi Summarization</title><style>{STYLE}</style></head>\n<body>\n'
+                + '\n'.join(body) + '\n</body></html>\n')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(document)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': DASHBOARD_VERSION, 'files': fingerprints.memo, 'sections': sections}, f)
+
+    print(f"Dashboard tersimpan di: {output_path} "
+          f"({stats['runs']} run, {stats['rendered']} section di-render, {stats['reused']} dipakai ulang)")
+    return stats
+
+
+def main():
+    """
+    Fungsi utama: membangun dashboard dari satu atau beberapa direktori run
+    """
+    parser = argparse.ArgumentParser(description='Dashboard HTML dari hasil evaluasi yang tersimpan')
+    parser.add_argument('--runs', type=str, nargs='+', default=['results'],
+                       help='Direktori run atau direktori induk (misalnya results/sweep)')
+    parser.add_argument('--output_path', type=str, default='results/dashboard.html',
+                       help='File HTML output')
+    parser.add_argument('--force', action='store_true',
+                       help='Render ulang semua section (abaikan cache)')
+
+    args = parser.parse_args()
+    build_dashboard(args.runs, args.output_path, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
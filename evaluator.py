@@ -1,102 +1,602 @@
+import os
+import time
+import queue
+import threading
 import numpy as np
-from typing import List, Dict, Any, Tuple
-from rouge_score import rouge_scorer
-from sacrebleu import BLEU
-from bert_score import score as bert_score_func
+import pyarrow as pa
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional, NamedTuple, Callable, Iterator, Iterable, Union
+from rouge_score import rouge_scorer, scoring
+from numpy.lib.stride_tricks import sliding_window_view
+from sacrebleu.tokenizers.tokenizer_13a import Tokenizer13a
 import pandas as pd
 from tqdm import tqdm
 
+from text_normalizer import create_tokenizer
+from bert_scoring import BERTScoreEngine
+from telemetry import length_bucket
+
+ROUGE_TYPES = ['rouge1', 'rouge2', 'rougeL']
+
+BERTSCORE_COLUMNS = ['bertscore_precision', 'bertscore_recall', 'bertscore_f1']
+
+ROUGE_ENGINES = ('rouge_score', 'native')
+
+# Statistik cukup BLEU per item (tokenisasi 13a sacrebleu, n-gram sampai orde 4)
+BLEU_MAX_ORDER = 4
+BLEU_STAT_COLUMNS = (
+    ['bleu_sys_len', 'bleu_ref_len']
+    + [f'bleu_correct_{n}' for n in range(1, BLEU_MAX_ORDER + 1)]
+    + [f'bleu_total_{n}' for n in range(1, BLEU_MAX_ORDER + 1)]
+)
+
+# Kolom metadata yang dipakai untuk BLEU per subgrup
+BLEU_GROUP_COLUMNS = ['category', 'source', 'length_bucket']
+
+# Jumlah maksimal reference yang disimpan di cache encoding ROUGE/BLEU
+REFERENCE_CACHE_SIZE = 20000
+
+
+class ReferenceCache:
+    """
+    Cache LRU berukuran terbatas untuk hasil encoding reference
+
+    Reference yang sering dipakai ulang (misalnya antar konfigurasi sweep
+    atau baseline) tetap di cache, sedangkan memori tidak bertambah dengan
+    ukuran dataset saat evaluasi streaming.
+    """
+
+    def __init__(self, max_size: int = REFERENCE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _bleu_components(stats: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Skor BLEU, presisi n-gram (setelah smoothing), dan brevity penalty per baris statistik
+    """
+    stats = np.atleast_2d(np.asarray(stats, dtype=np.float64))
+    sys_len, ref_len = stats[:, 0], stats[:, 1]
+    correct = stats[:, 2:2 + BLEU_MAX_ORDER]
+    total = stats[:, 2 + BLEU_MAX_ORDER:]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bp = np.where(sys_len < ref_len, np.exp(1 - ref_len / sys_len), 1.0)
+        bp = np.where((sys_len < ref_len) & (sys_len == 0), 0.0, bp)
+
+        # Smoothing 'exp': setiap orde tanpa match menggandakan penyebut
+        zero = correct == 0
+        smooth = 2.0 ** np.cumsum(zero, axis=1)
+        precisions = np.where(zero, 100.0 / (smooth * total), 100.0 * correct / total)
+        score = bp * np.exp(np.log(precisions).sum(axis=1) / BLEU_MAX_ORDER)
+        # Seperti sacrebleu: presisi orde tanpa n-gram (dan orde sesudahnya),
+        # atau semua orde jika tidak ada unigram yang cocok, dilaporkan 0
+        reported = np.cumprod(total > 0, axis=1).astype(bool) & (correct[:, :1] > 0)
+        precisions = np.where(reported, precisions, 0.0)
+
+    # Orde tanpa n-gram sama sekali atau tanpa match membuat skor 0
+    valid = (total > 0).all(axis=1) & (correct > 0).any(axis=1)
+    return np.where(valid, score, 0.0), precisions, bp
+
+
+def corpus_bleu_from_stats(stats: np.ndarray) -> np.ndarray:
+    """
+    Menghitung BLEU korpus dari statistik cukup secara tervektorisasi
+
+    Rumus identik dengan sacrebleu BLEU default (smoothing 'exp', tanpa
+    effective order) untuk setiap baris statistik.
+
+    Args:
+        stats: Array berukuran (G, 2 + 2 * BLEU_MAX_ORDER) dengan urutan kolom
+            BLEU_STAT_COLUMNS, satu baris per grup
+
+    Returns:
+        Array skor BLEU berukuran (G,)
+    """
+    return _bleu_components(stats)[0]
+
+
+def subgroup_bleu(item_scores, by: str) -> Dict[str, float]:
+    """
+    BLEU korpus per nilai kolom (misalnya kategori) dari statistik per item
+
+    Statistik dijumlahkan per grup tanpa tokenisasi ulang. Tabel dari
+    beberapa shard cukup digabung (concatenate) sebelum dipanggil.
+
+    Args:
+        item_scores: Tabel skor per item (dict kolom -> array atau DataFrame)
+            yang berisi kolom BLEU_STAT_COLUMNS
+        by: Nama kolom grup
+
+    Returns:
+        Dictionary nilai grup -> skor BLEU
+    """
+    groups, inverse = np.unique(np.asarray(item_scores[by]).astype(str), return_inverse=True)
+    stats = np.stack([np.asarray(item_scores[column], dtype=np.int64) for column in BLEU_STAT_COLUMNS], axis=1)
+    sums = np.zeros((len(groups), len(BLEU_STAT_COLUMNS)), dtype=np.int64)
+    np.add.at(sums, inverse, stats)
+    return dict(zip(groups.tolist(), corpus_bleu_from_stats(sums).tolist()))
+
+
+def _lcs_length(a: np.ndarray, b: np.ndarray) -> int:
+    """
+    Panjang LCS dua sekuens id dengan algoritma bit-parallel (Hyyrö)
+
+    Posisi token pada sekuens terpanjang direpresentasikan sebagai bit pada
+    integer Python, sehingga setiap token sekuens terpendek diproses dengan
+    beberapa operasi bitwise alih-alih satu baris tabel DP.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) == 0:
+        return 0
+
+    masks: Dict[int, int] = {}
+    for i, token in enumerate(a.tolist()):
+        masks[token] = masks.get(token, 0) | (1 << i)
+
+    full = (1 << len(a)) - 1
+    v = full
+    for token in b.tolist():
+        u = v & masks.get(token, 0)
+        v = ((v + u) | (v - u)) & full
+
+    # Setiap bit nol pada v menandai satu elemen LCS
+    return len(a) - bin(v).count("1")
+
+
+def _ngram_keys(ids: np.ndarray, n: int) -> np.ndarray:
+    """
+    Mengkodekan n-gram dari sekuens id menjadi satu kunci per n-gram
+
+    Unigram dan bigram dikodekan sebagai integer; n-gram yang lebih panjang
+    (BLEU) sebagai byte string sepanjang n id, sehingga tetap eksak berapa
+    pun ukuran vocab.
+    """
+    if n == 1:
+        return ids
+    if n == 2:
+        if len(ids) < 2:
+            return ids[:0]
+        return (ids[:-1] << 32) | ids[1:]
+    if len(ids) < n:
+        return np.zeros(0, dtype=f'V{8 * n}')
+    return np.ascontiguousarray(sliding_window_view(ids, n)).view(f'V{8 * n}').ravel()
+
+
+def _ngram_counts(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    N-gram unik beserta jumlah kemunculannya
+    """
+    return np.unique(keys, return_counts=True)
+
+
+def _ngram_overlap(ref_counts: Tuple[np.ndarray, np.ndarray], pred_counts: Tuple[np.ndarray, np.ndarray]) -> int:
+    """
+    Jumlah n-gram yang beririsan (dengan clipping count) antara reference dan prediction
+    """
+    ref_unique, ref_freq = ref_counts
+    pred_unique, pred_freq = pred_counts
+    if len(ref_unique) == 0 or len(pred_unique) == 0:
+        return 0
+    _, ref_idx, pred_idx = np.intersect1d(ref_unique, pred_unique, assume_unique=True, return_indices=True)
+    return int(np.minimum(ref_freq[ref_idx], pred_freq[pred_idx]).sum())
+
+
+def _prf(overlap: int, pred_total: int, ref_total: int) -> scoring.Score:
+    # Rumus yang sama dengan rouge_score agar hasil identik
+    precision = overlap / max(pred_total, 1)
+    recall = overlap / max(ref_total, 1)
+    return scoring.Score(precision=precision, recall=recall, fmeasure=scoring.fmeasure(precision, recall))
+
+
+class EncodedText(NamedTuple):
+    """
+    Teks yang sudah dikodekan ke id integer beserta hitungan n-gram-nya
+    """
+    ids: np.ndarray
+    ngrams: Dict[int, Tuple[np.ndarray, np.ndarray]]
+
+
+class NativeRougeScorer:
+    """
+    Implementasi ROUGE-1/2/L internal yang kompatibel dengan rouge_score.RougeScorer
+
+    Token dipetakan ke id integer, overlap n-gram dihitung dengan NumPy, dan
+    ROUGE-L memakai LCS bit-parallel. Reference yang sudah dikodekan disimpan
+    per key sehingga evaluasi berikutnya hanya menokenisasi prediction.
+    """
+
+    def __init__(self, rouge_types: List[str] = ROUGE_TYPES, tokenizer=None):
+        """
+        Args:
+            rouge_types: Subset dari rouge1, rouge2, rougeL
+            tokenizer: Objek dengan method tokenize(text); default tokenizer
+                rouge_score tanpa stemmer
+        """
+        unsupported = set(rouge_types) - set(ROUGE_TYPES)
+        if unsupported:
+            raise ValueError(f"Rouge type tidak didukung engine native: {sorted(unsupported)}")
+        self.rouge_types = list(rouge_types)
+        self.ngram_orders = sorted(int(rouge_type[5:]) for rouge_type in self.rouge_types if rouge_type != 'rougeL')
+        self.tokenizer = tokenizer or create_tokenizer('rouge_score')
+        self.vocab: Dict[str, int] = {}
+        self._reference_cache = ReferenceCache()
+
+    def tokenize(self, text: str) -> List[str]:
+        return self.tokenizer.tokenize(text)
+
+    def encode(self, text: str) -> EncodedText:
+        """
+        Tokenisasi teks, memetakan token ke id integer, dan menghitung n-gram
+        """
+        vocab = self.vocab
+        ids = np.asarray([vocab.setdefault(token, len(vocab)) for token in self.tokenize(text)], dtype=np.int64)
+        return EncodedText(ids, {n: _ngram_counts(_ngram_keys(ids, n)) for n in self.ngram_orders})
+
+    def encode_reference(self, text: str, key: Any = None) -> EncodedText:
+        """
+        Mengkodekan reference dengan cache per key (misalnya id artikel)
+        """
+        key = (key, text)
+        encoded = self._reference_cache.get(key)
+        if encoded is None:
+            encoded = self._reference_cache[key] = self.encode(text)
+        return encoded
+
+    def score_encoded(self, ref: EncodedText, pred: EncodedText) -> Dict[str, scoring.Score]:
+        """
+        Menghitung skor ROUGE dari teks yang sudah dikodekan
+        """
+        result = {}
+        for rouge_type in self.rouge_types:
+            if rouge_type == 'rougeL':
+                if len(ref.ids) == 0 or len(pred.ids) == 0:
+                    result[rouge_type] = scoring.Score(precision=0, recall=0, fmeasure=0)
+                    continue
+                lcs = _lcs_length(ref.ids, pred.ids)
+                result[rouge_type] = _prf(lcs, len(pred.ids), len(ref.ids))
+            else:
+                n = int(rouge_type[5:])
+                overlap = _ngram_overlap(ref.ngrams[n], pred.ngrams[n])
+                result[rouge_type] = _prf(overlap, max(len(pred.ids) - n + 1, 0), max(len(ref.ids) - n + 1, 0))
+        return result
+
+    def score(self, target: str, prediction: str) -> Dict[str, scoring.Score]:
+        """
+        Menghitung skor ROUGE dengan antarmuka yang sama seperti RougeScorer.score
+        """
+        return self.score_encoded(self.encode(target), self.encode(prediction))
+
+
+def create_rouge_scorer(engine: str = 'rouge_score', tokenizer: str = 'rouge_score', stemmer: Optional[str] = 'porter'):
+    """
+    Membuat scorer ROUGE sesuai engine
+
+    Args:
+        engine: 'rouge_score' (package referensi) atau 'native' (implementasi internal)
+        tokenizer: 'rouge_score' atau 'indonesian' (lihat text_normalizer)
+        stemmer: None, 'sastrawi', atau 'porter' (default sama dengan
+            RougeScorer(use_stemmer=True))
+
+    Returns:
+        Scorer dengan method score(target, prediction)
+    """
+    if engine == 'rouge_score':
+        if tokenizer == 'rouge_score' and stemmer in (None, 'porter'):
+            # Tokenizer bawaan package sebagai implementasi referensi
+            return rouge_scorer.RougeScorer(ROUGE_TYPES, use_stemmer=stemmer == 'porter')
+        return rouge_scorer.RougeScorer(ROUGE_TYPES, tokenizer=create_tokenizer(tokenizer, stemmer))
+    if engine == 'native':
+        return NativeRougeScorer(ROUGE_TYPES, tokenizer=create_tokenizer(tokenizer, stemmer))
+    raise ValueError(f"Engine ROUGE tidak dikenal: {engine}. Pilihan: {ROUGE_ENGINES}")
+
+
+# Scorer milik setiap worker process, dibuat sekali oleh _init_rouge_worker
+_worker_scorer = None
+
+
+def _init_rouge_worker(engine: str, tokenizer: str, stemmer: Optional[str]):
+    global _worker_scorer
+    _worker_scorer = create_rouge_scorer(engine, tokenizer, stemmer)
+
+
+def _score_rouge_chunk(scorer, pairs: List[Tuple[Any, Any]]) -> np.ndarray:
+    """
+    Menghitung F-measure ROUGE untuk sekumpulan pasangan (reference, prediction)
+
+    Pasangan berupa string, atau EncodedText untuk engine native.
+
+    Returns:
+        Array berukuran (len(pairs), 3) dengan kolom rouge1, rouge2, rougeL
+    """
+    scores = np.zeros((len(pairs), len(ROUGE_TYPES)))
+    for i, (ref, pred) in enumerate(pairs):
+        if isinstance(pred, EncodedText):
+            if len(pred.ids) == 0:  # Prediksi kosong tetap bernilai 0.0
+                continue
+            result = scorer.score_encoded(ref, pred)
+        else:
+            if not pred.strip():  # Prediksi kosong tetap bernilai 0.0
+                continue
+            result = scorer.score(ref, pred)
+        scores[i] = [result[rouge_type].fmeasure for rouge_type in ROUGE_TYPES]
+    return scores
+
+
+def _score_rouge_chunk_in_worker(pairs: List[Tuple[Any, Any]]) -> np.ndarray:
+    return _score_rouge_chunk(_worker_scorer, pairs)
+
+
 class SummarizationEvaluator:
     """
     Class untuk mengevaluasi hasil summarization menggunakan ROUGE, BLEU, dan BERTScore
     """
     
-    def __init__(self, lang: str = "id"):
+    def __init__(self, lang: str = "id", n_jobs: int = 1, chunk_size: int = 256, engine: str = "rouge_score",
+                 tokenizer: str = "rouge_score", stemmer: Optional[str] = "porter",
+                 bertscore_cache_dir: Optional[str] = None, bertscore_model: Optional[str] = None,
+                 bertscore_num_layers: Optional[int] = None, bertscore_max_tokens: Optional[int] = None,
+                 num_threads: Optional[int] = None, bertscore_isolated: bool = False,
+                 bertscore_batch_size: int = 64, verbose: bool = True):
         """
         Inisialisasi evaluator
         
         Args:
             lang: Bahasa untuk evaluasi (default: id untuk Indonesia)
+            n_jobs: Jumlah worker process untuk skor ROUGE (1 untuk serial,
+                -1 untuk semua core)
+            chunk_size: Jumlah pasangan per chunk yang dikirim ke worker
+            engine: Engine ROUGE, 'rouge_score' (package referensi) atau
+                'native' (id integer + NumPy + LCS bit-parallel, hasil identik)
+            tokenizer: Tokenizer ROUGE, 'rouge_score' (default, skor historis
+                bersama stemmer='porter') atau 'indonesian' (opt-in, biasanya
+                tanpa stemmer)
+            stemmer: Stemmer opsional yang di-memoize: None, 'sastrawi', atau 'porter'
+            bertscore_cache_dir: Direktori cache embedding reference BERTScore
+                (None untuk tanpa cache)
+            bertscore_model: Encoder BERTScore (default: model bert_score untuk lang)
+            bertscore_num_layers: Layer representasi BERTScore
+            bertscore_max_tokens: Token budget per batch encode BERTScore
+                (None untuk otomatis dari memori tersedia)
+            num_threads: Jumlah thread torch untuk BERTScore
+            bertscore_isolated: Hitung BERTScore di subprocess terpisah
+            bertscore_batch_size: Jumlah pasangan per batch BERTScore
+            verbose: Tampilkan progress BERTScore
         """
         self.lang = lang
+        self.engine = engine
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        self.chunk_size = chunk_size
+        self.tokenizer = tokenizer
+        self.stemmer = stemmer
+        self.verbose = verbose
         
         # Initialize ROUGE scorer
-        self.rouge_scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
+        self.rouge_scorer = create_rouge_scorer(engine, tokenizer=tokenizer, stemmer=stemmer)
+        
+        # Statistik n-gram BLEU per reference, dipakai ulang antar evaluasi.
+        # Tokenisasi 13a sama dengan sacrebleu BLEU default; n-gram dihitung
+        # dengan kode n-gram yang sama seperti engine ROUGE native.
+        self.bleu_tokenizer = Tokenizer13a()
+        self._bleu_vocab: Dict[str, int] = {}
+        self._bleu_reference_cache = ReferenceCache()
+        
+        # BERTScore dengan cache embedding reference (model dimuat saat dibutuhkan)
+        self.bertscore = BERTScoreEngine(
+            lang=lang,
+            model_type=bertscore_model,
+            num_layers=bertscore_num_layers,
+            batch_size=bertscore_batch_size,
+            cache_dir=bertscore_cache_dir,
+            max_tokens=bertscore_max_tokens,
+            num_threads=num_threads,
+            isolated=bertscore_isolated
+        )
+        
+        # Tabel skor per item dari evaluasi terakhir (kolom -> array)
+        self.item_scores: Optional[Dict[str, np.ndarray]] = None
+        self._item_scores_dataset = None
         
         print("Evaluator berhasil diinisialisasi!")
     
-    def calculate_rouge_scores(self, references: List[str], predictions: List[str]) -> Dict[str, float]:
+    def calculate_rouge_scores(self, references: List[str], predictions: List[str],
+                               reference_ids: Optional[List[Any]] = None) -> Dict[str, float]:
         """
         Menghitung skor ROUGE
         
         Args:
             references: List of reference summaries (ground truth)
             predictions: List of predicted summaries
+            reference_ids: Key cache reference (misalnya id artikel), opsional
             
         Returns:
             Dictionary berisi skor ROUGE
         """
-        rouge1_scores = []
-        rouge2_scores = []
-        rougeL_scores = []
+        scores = self.score_rouge_pairs(references, predictions, reference_ids)
+        return self.aggregate_rouge_scores(dict(zip(ROUGE_TYPES, scores.T)))
+    
+    @staticmethod
+    def aggregate_rouge_scores(item_scores: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """
+        Menghitung rata-rata dan standar deviasi ROUGE dari tabel skor per item
         
-        for ref, pred in tqdm(zip(references, predictions), desc="Calculating ROUGE scores", total=len(references)):
-            if not pred.strip():  # Skip empty predictions
-                rouge1_scores.append(0.0)
-                rouge2_scores.append(0.0)
-                rougeL_scores.append(0.0)
-                continue
-                
-            scores = self.rouge_scorer.score(ref, pred)
-            rouge1_scores.append(scores['rouge1'].fmeasure)
-            rouge2_scores.append(scores['rouge2'].fmeasure)
-            rougeL_scores.append(scores['rougeL'].fmeasure)
+        Args:
+            item_scores: Tabel skor per item (kolom rouge1, rouge2, rougeL)
+            
+        Returns:
+            Dictionary berisi skor ROUGE
+        """
+        summary = {rouge_type: float(np.mean(item_scores[rouge_type])) for rouge_type in ROUGE_TYPES}
+        summary.update({f'{rouge_type}_std': float(np.std(item_scores[rouge_type])) for rouge_type in ROUGE_TYPES})
+        return summary
+    
+    def score_rouge_pairs(self, references: List[str], predictions: List[str],
+                          reference_ids: Optional[List[Any]] = None) -> np.ndarray:
+        """
+        Menghitung F-measure ROUGE per pasangan, secara paralel jika n_jobs > 1
         
-        return {
-            'rouge1': np.mean(rouge1_scores),
-            'rouge2': np.mean(rouge2_scores),
-            'rougeL': np.mean(rougeL_scores),
-            'rouge1_std': np.std(rouge1_scores),
-            'rouge2_std': np.std(rouge2_scores),
-            'rougeL_std': np.std(rougeL_scores)
-        }
+        Pasangan dibagi menjadi chunk dan diskor di worker process; hasilnya
+        identik dengan jalur serial dan tetap berurutan sesuai input. Pada
+        engine native, teks dikodekan di proses utama dan reference diambil
+        dari cache per reference id, sehingga hanya prediction yang
+        ditokenisasi ulang.
+        
+        Args:
+            references: List of reference summaries
+            predictions: List of predicted summaries
+            reference_ids: Key cache reference (misalnya id artikel), opsional
+            
+        Returns:
+            Array berukuran (n, 3) dengan kolom rouge1, rouge2, rougeL
+        """
+        if isinstance(self.rouge_scorer, NativeRougeScorer):
+            reference_ids = reference_ids or [None] * len(references)
+            pairs = [
+                (self.rouge_scorer.encode_reference(ref, key), self.rouge_scorer.encode(pred))
+                for ref, pred, key in zip(references, predictions, reference_ids)
+            ]
+        else:
+            pairs = list(zip(references, predictions))
+        chunks = [pairs[i:i + self.chunk_size] for i in range(0, len(pairs), self.chunk_size)]
+        
+        if self.n_jobs <= 1 or len(chunks) <= 1:
+            results = [
+                _score_rouge_chunk(self.rouge_scorer, chunk)
+                for chunk in tqdm(chunks, desc="Calculating ROUGE scores")
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_init_rouge_worker,
+                initargs=(self.engine, self.tokenizer, self.stemmer)
+            ) as executor:
+                # executor.map mempertahankan urutan chunk
+                results = list(tqdm(
+                    executor.map(_score_rouge_chunk_in_worker, chunks),
+                    desc=f"Calculating ROUGE scores ({self.n_jobs} workers)",
+                    total=len(chunks)
+                ))
+        
+        if not results:
+            return np.zeros((0, len(ROUGE_TYPES)))
+        return np.concatenate(results)
     
-    def calculate_bleu_score(self, references: List[str], predictions: List[str]) -> Dict[str, float]:
+    def calculate_bleu_score(self, references: List[str], predictions: List[str],
+                             reference_ids: Optional[List[Any]] = None) -> Dict[str, float]:
         """
         Menghitung skor BLEU
         
+        Statistik n-gram setiap reference (tokenisasi sacrebleu 13a) disimpan
+        per reference id, sehingga evaluasi berikutnya hanya memproses
+        prediction. Skor korpus dihitung dari jumlah statistik per pasangan.
+        
         Args:
             references: List of reference summaries
             predictions: List of predicted summaries
+            reference_ids: Key cache reference (misalnya id artikel), opsional
             
         Returns:
             Dictionary berisi skor BLEU
         """
-        # Filter out empty predictions
-        valid_pairs = [(ref, pred) for ref, pred in zip(references, predictions) if pred.strip()]
+        stats = self.bleu_statistics(references, predictions, reference_ids)
+        n_valid = sum(1 for pred in predictions if pred.strip())
+        return self.bleu_from_statistics(stats.sum(axis=0), n_valid)
+    
+    def bleu_statistics(self, references: List[str], predictions: List[str],
+                        reference_ids: Optional[List[Any]] = None) -> np.ndarray:
+        """
+        Menghitung statistik cukup BLEU (sufficient statistics) per pasangan
         
-        if not valid_pairs:
-            return {'bleu': 0.0}
+        Args:
+            references: List of reference summaries
+            predictions: List of predicted summaries
+            reference_ids: Key cache reference (misalnya id artikel), opsional
+            
+        Returns:
+            Array integer berukuran (n, 2 + 2 * max_ngram_order) dengan kolom
+            panjang hipotesis, panjang reference, n-gram cocok, dan total
+            n-gram per orde. Prediksi kosong bernilai nol sehingga tidak
+            memengaruhi skor korpus.
+        """
+        reference_ids = reference_ids or [None] * len(references)
+        stats = np.zeros((len(predictions), len(BLEU_STAT_COLUMNS)), dtype=np.int64)
         
-        refs, preds = zip(*valid_pairs)
+        for i, (ref, pred, key) in enumerate(zip(references, predictions, reference_ids)):
+            # Filter out empty predictions
+            if not pred.strip():
+                continue
+            ref_len, ref_counts = self._bleu_reference(ref, key)
+            sys_len, pred_counts = self._bleu_encode(pred)
+            stats[i, 0] = sys_len
+            stats[i, 1] = ref_len
+            for n in range(1, BLEU_MAX_ORDER + 1):
+                stats[i, 1 + n] = _ngram_overlap(ref_counts[n], pred_counts[n])
+                stats[i, 1 + BLEU_MAX_ORDER + n] = max(0, sys_len - n + 1)
+        
+        return stats
+    
+    def bleu_from_statistics(self, stats: np.ndarray, n_valid: int) -> Dict[str, Any]:
+        """
+        Menghitung skor BLEU korpus dari jumlah statistik cukup
         
-        # Convert to list of lists for BLEU calculation
-        refs_list = [[ref] for ref in refs]
+        Args:
+            stats: Jumlah statistik per pasangan (hasil bleu_statistics)
+            n_valid: Jumlah pasangan dengan prediksi tidak kosong
+            
+        Returns:
+            Dictionary berisi skor BLEU
+        """
+        if n_valid == 0:
+            return {'bleu': 0.0}
         
-        # Calculate BLEU
-        bleu = BLEU()
-        result = bleu.corpus_score(preds, refs_list)
+        score, precisions, bp = _bleu_components(stats)
         
         return {
-            'bleu': result.score,
+            'bleu': float(score[0]),
             'bleu_details': {
-                'precisions': result.precisions,
-                'bp': result.bp,
-                'sys_len': result.sys_len,
-                'ref_len': result.ref_len
+                'precisions': precisions[0].tolist(),
+                'bp': float(bp[0]),
+                'sys_len': int(stats[0]),
+                'ref_len': int(stats[1])
             }
         }
     
+    def _bleu_encode(self, text: str) -> Tuple[int, Dict[int, Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Tokenisasi 13a, memetakan token ke id integer, dan menghitung n-gram orde 1..BLEU_MAX_ORDER
+        """
+        vocab = self._bleu_vocab
+        tokens = self.bleu_tokenizer(text.rstrip()).split()
+        ids = np.asarray([vocab.setdefault(token, len(vocab)) for token in tokens], dtype=np.int64)
+        return len(ids), {n: _ngram_counts(_ngram_keys(ids, n)) for n in range(1, BLEU_MAX_ORDER + 1)}
+    
+    def _bleu_reference(self, reference: str, key: Any = None) -> Tuple[int, Dict[int, Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Panjang dan n-gram BLEU untuk satu reference, dengan cache per key
+        """
+        key = (key, reference)
+        info = self._bleu_reference_cache.get(key)
+        if info is None:
+            info = self._bleu_reference_cache[key] = self._bleu_encode(reference)
+        return info
+    
     def calculate_bertscore(self, references: List[str], predictions: List[str]) -> Dict[str, float]:
         """
         Menghitung skor BERTScore
@@ -108,67 +608,130 @@ class SummarizationEvaluator:
         Returns:
             Dictionary berisi skor BERTScore
         """
+        scores = self.score_bertscore_pairs(references, predictions)
+        return self.aggregate_bertscore(dict(zip(BERTSCORE_COLUMNS, scores.T)))
+    
+    def score_bertscore_pairs(self, references: List[str], predictions: List[str]) -> np.ndarray:
+        """
+        Menghitung BERTScore per pasangan
+        
+        Embedding reference diambil dari cache jika tersedia, sehingga hanya
+        prediction yang di-encode.
+        
+        Args:
+            references: List of reference summaries
+            predictions: List of predicted summaries
+            
+        Returns:
+            Array berukuran (n, 3) dengan kolom precision, recall, F1.
+            Prediksi kosong bernilai NaN dan tidak ikut diagregasi.
+        """
+        scores = np.full((len(predictions), len(BERTSCORE_COLUMNS)), np.nan)
+        
         # Filter out empty predictions
-        valid_pairs = [(ref, pred) for ref, pred in zip(references, predictions) if pred.strip()]
+        valid_idx = [i for i, pred in enumerate(predictions) if pred.strip()]
         
-        if not valid_pairs:
-            return {'bertscore': 0.0}
+        if not valid_idx:
+            return scores
         
-        refs, preds = zip(*valid_pairs)
+        refs = [references[i] for i in valid_idx]
+        preds = [predictions[i] for i in valid_idx]
         
         try:
             # Calculate BERTScore
-            P, R, F1 = bert_score_func(
-                preds, 
-                refs, 
-                lang=self.lang, 
-                verbose=True,
-                batch_size=16
-            )
-            
-            return {
-                'bertscore_precision': P.mean().item(),
-                'bertscore_recall': R.mean().item(),
-                'bertscore_f1': F1.mean().item(),
-                'bertscore_precision_std': P.std().item(),
-                'bertscore_recall_std': R.std().item(),
-                'bertscore_f1_std': F1.std().item()
-            }
+            P, R, F1 = self.bertscore.score(refs, preds, verbose=self.verbose)
+            scores[valid_idx] = np.stack([P.numpy(), R.numpy(), F1.numpy()], axis=1)
         except Exception as e:
             print(f"Error calculating BERTScore: {e}")
-            return {
-                'bertscore_precision': 0.0,
-                'bertscore_recall': 0.0,
-                'bertscore_f1': 0.0,
-                'bertscore_precision_std': 0.0,
-                'bertscore_recall_std': 0.0,
-                'bertscore_f1_std': 0.0
-            }
+            scores[valid_idx] = 0.0
+        
+        return scores
     
-    def evaluate_summaries(self, references: List[str], predictions: List[str]) -> Dict[str, Any]:
+    @staticmethod
+    def aggregate_bertscore(item_scores: Dict[str, np.ndarray]) -> Dict[str, float]:
         """
-        Evaluasi lengkap menggunakan semua metrik
+        Menghitung rata-rata dan standar deviasi BERTScore dari tabel skor per item
+        
+        Args:
+            item_scores: Tabel skor per item (kolom bertscore_*)
+            
+        Returns:
+            Dictionary berisi skor BERTScore
+        """
+        summary = {}
+        for column in BERTSCORE_COLUMNS:
+            values = item_scores[column]
+            values = values[~np.isnan(values)]
+            summary[column] = float(values.mean()) if len(values) else 0.0
+        for column in BERTSCORE_COLUMNS:
+            values = item_scores[column]
+            values = values[~np.isnan(values)]
+            # Standar deviasi sampel (ddof=1), sama seperti torch.std
+            summary[f'{column}_std'] = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+        return summary
+    
+    def score_items(self, references: List[str], predictions: List[str],
+                    include_bertscore: bool = True, reference_ids: Optional[List[Any]] = None) -> Dict[str, np.ndarray]:
+        """
+        Menghitung semua metrik per item sekali ke dalam tabel kolumnar
         
         Args:
             references: List of reference summaries
             predictions: List of predicted summaries
+            include_bertscore: Hitung juga BERTScore per item
+            reference_ids: Key cache reference (misalnya id artikel), opsional
             
         Returns:
-            Dictionary berisi semua skor evaluasi
+            Dictionary nama kolom -> array per item
         """
-        print("Memulai evaluasi summarization...")
+        item_scores = {
+            'reference_length': np.array([len(ref.split()) for ref in references], dtype=np.int64),
+            'prediction_length': np.array([len(pred.split()) for pred in predictions], dtype=np.int64)
+        }
         
         # Calculate ROUGE scores
         print("Menghitung skor ROUGE...")
-        rouge_scores = self.calculate_rouge_scores(references, predictions)
+        rouge_scores = self.score_rouge_pairs(references, predictions, reference_ids)
+        for i, rouge_type in enumerate(ROUGE_TYPES):
+            item_scores[rouge_type] = rouge_scores[:, i]
+        
+        # Statistik cukup BLEU per item
+        bleu_stats = self.bleu_statistics(references, predictions, reference_ids)
+        for i, column in enumerate(BLEU_STAT_COLUMNS):
+            item_scores[column] = bleu_stats[:, i]
+        
+        if include_bertscore:
+            # Calculate BERTScore
+            print("Menghitung skor BERTScore...")
+            bert_scores = self.score_bertscore_pairs(references, predictions)
+            for i, column in enumerate(BERTSCORE_COLUMNS):
+                item_scores[column] = bert_scores[:, i]
+        
+        return item_scores
+    
+    def aggregate_item_scores(self, item_scores: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """
+        Menyusun hasil evaluasi agregat dari tabel skor per item
+        
+        BLEU korpus dihitung dari jumlah statistik cukup per item, sehingga
+        tidak ada tokenisasi ulang. Jika tabel berisi kolom metadata, BLEU per
+        kategori, sumber, dan bucket panjang ikut dihitung.
+        
+        Args:
+            item_scores: Tabel skor per item dari score_items
+            
+        Returns:
+            Dictionary berisi semua skor evaluasi
+        """
+        rouge_scores = self.aggregate_rouge_scores(item_scores)
         
         # Calculate BLEU score
         print("Menghitung skor BLEU...")
-        bleu_scores = self.calculate_bleu_score(references, predictions)
+        bleu_stats = np.stack([item_scores[column] for column in BLEU_STAT_COLUMNS], axis=1)
+        n_valid = int((item_scores['prediction_length'] > 0).sum())
+        bleu_scores = self.bleu_from_statistics(bleu_stats.sum(axis=0), n_valid)
         
-        # Calculate BERTScore
-        print("Menghitung skor BERTScore...")
-        bert_scores = self.calculate_bertscore(references, predictions)
+        bert_scores = self.aggregate_bertscore(item_scores)
         
         # Combine all scores
         results = {
@@ -183,13 +746,46 @@ class SummarizationEvaluator:
                 'bertscore_f1': bert_scores['bertscore_f1']
             }
         }
+
+        bleu_by_group = {
+            column: subgroup_bleu(item_scores, column) for column in BLEU_GROUP_COLUMNS if column in item_scores
+        }
+        if bleu_by_group:
+            results['bleu_by_group'] = bleu_by_group
         
         return results
     
+    def evaluate_summaries(self, references: List[str], predictions: List[str],
+                           reference_ids: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """
+        Evaluasi lengkap menggunakan semua metrik
+        
+        Setiap metrik per item dihitung sekali ke self.item_scores, lalu
+        agregat diturunkan dari tabel tersebut.
+        
+        Args:
+            references: List of reference summaries
+            predictions: List of predicted summaries
+            reference_ids: Key cache reference (misalnya id artikel), opsional
+            
+        Returns:
+            Dictionary berisi semua skor evaluasi
+        """
+        print("Memulai evaluasi summarization...")
+        
+        self.item_scores = self.score_items(references, predictions, reference_ids=reference_ids)
+        self._item_scores_dataset = None
+        
+        return self.aggregate_item_scores(self.item_scores)
+    
     def evaluate_dataset(self, dataset: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Evaluasi dataset yang sudah berisi generated summaries
         
+        Tabel skor per item (beserta id, kategori, sumber, bucket panjang, dan
+        statistik cukup BLEU) disimpan di self.item_scores dan dipakai ulang
+        oleh create_evaluation_dataframe.
+        
         Args:
             dataset: Dataset dengan field 'summary' dan 'generated_summary'
             
@@ -198,8 +794,31 @@ class SummarizationEvaluator:
         """
         references = [item['summary'] for item in dataset]
         predictions = [item['generated_summary'] for item in dataset]
+        reference_ids = [item['id'] for item in dataset]
+        
+        print("Memulai evaluasi summarization...")
+        
+        self.item_scores = {
+            **self._item_metadata(dataset),
+            **self.score_items(references, predictions, reference_ids=reference_ids)
+        }
+        self._item_scores_dataset = dataset
         
-        return self.evaluate_summaries(references, predictions)
+        return self.aggregate_item_scores(self.item_scores)
+    
+    @staticmethod
+    def _item_metadata(dataset: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        metadata = {
+            'id': np.array([item['id'] for item in dataset], dtype=object),
+            'category': np.array([item['category'] for item in dataset], dtype=object),
+            'source': np.array([item['source'] for item in dataset], dtype=object)
+        }
+        if all('text' in item for item in dataset):
+            # Bucket panjang artikel, sama seperti telemetry
+            metadata['length_bucket'] = np.array(
+                [length_bucket(len(item['text'].split())) for item in dataset], dtype=object
+            )
+        return metadata
     
     def print_results(self, results: Dict[str, Any]):
         """
@@ -245,41 +864,406 @@ class SummarizationEvaluator:
         
         print(f"Hasil evaluasi tersimpan di: {output_path}")
     
-    def create_evaluation_dataframe(self, dataset: List[Dict[str, Any]]) -> pd.DataFrame:
+    def create_evaluation_dataframe(self, dataset: List[Dict[str, Any]],
+                                    item_scores: Optional[Dict[str, np.ndarray]] = None) -> pd.DataFrame:
         """
         Membuat DataFrame untuk analisis detail hasil evaluasi
         
+        DataFrame diturunkan dari tabel skor per item. Jika dataset sama dengan
+        yang terakhir dievaluasi lewat evaluate_dataset, tabelnya dipakai ulang
+        sehingga ROUGE tidak dihitung dua kali.
+        
         Args:
             dataset: Dataset dengan generated summaries
+            item_scores: Tabel skor per item (opsional)
             
         Returns:
             DataFrame dengan skor per item
         """
-        evaluation_data = []
+        if item_scores is None and dataset is self._item_scores_dataset:
+            item_scores = self.item_scores
         
-        for item in dataset:
-            ref = item['summary']
-            pred = item['generated_summary']
-            
-            if not pred.strip():
-                rouge_scores = {'rouge1': 0.0, 'rouge2': 0.0, 'rougeL': 0.0}
-            else:
-                scores = self.rouge_scorer.score(ref, pred)
-                rouge_scores = {
-                    'rouge1': scores['rouge1'].fmeasure,
-                    'rouge2': scores['rouge2'].fmeasure,
-                    'rougeL': scores['rougeL'].fmeasure
-                }
-            
-            evaluation_data.append({
-                'id': item['id'],
-                'category': item['category'],
-                'source': item['source'],
-                'reference_length': len(ref.split()),
-                'prediction_length': len(pred.split()),
+        if item_scores is None:
+            references = [item['summary'] for item in dataset]
+            predictions = [item['generated_summary'] for item in dataset]
+            item_scores = {
+                **self._item_metadata(dataset),
+                **self.score_items(references, predictions, include_bertscore=False,
+                                   reference_ids=[item['id'] for item in dataset])
+            }
+        
+        return pd.DataFrame(item_scores)
+
+
+def read_item_batches(path: str) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Membaca tabel skor per item dari file spill StreamingEvaluator per batch
+
+    File di-memory-map dan hanya satu record batch yang diubah menjadi array
+    NumPy pada satu waktu.
+
+    Args:
+        path: File Arrow IPC (stream) hasil spill
+
+    Yields:
+        Dictionary kolom -> array untuk satu batch
+    """
+    with pa.memory_map(path, 'r') as source:
+        for batch in pa.ipc.open_stream(source):
+            yield {name: batch.column(i).to_numpy(zero_copy_only=False)
+                   for i, name in enumerate(batch.schema.names)}
+
+
+class SpilledItemScores:
+    """
+    Tabel skor per item yang tetap di file spill
+
+    Setiap iterasi membaca ulang file per batch sebagai DataFrame, sehingga
+    konsumen (cube agregat, results_store, results_db, bootstrap) dapat
+    melewati tabel berkali-kali tanpa memuat seluruhnya ke memori. Objek
+    hanya menyimpan path sehingga dapat dijadikan artefak stage.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: File Arrow IPC (stream) hasil spill StreamingEvaluator
+        """
+        self.path = path
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for batch in read_item_batches(self.path):
+            yield pd.DataFrame(batch)
+
+
+ItemScoreTable = Union[pd.DataFrame, Dict[str, np.ndarray], Iterable[pd.DataFrame]]
+
+
+def iter_item_frames(item_scores: ItemScoreTable) -> Iterator[pd.DataFrame]:
+    """
+    Menyeragamkan tabel skor per item menjadi DataFrame per batch
+
+    Args:
+        item_scores: DataFrame, dict kolom -> array, atau iterable DataFrame
+            per batch (misalnya SpilledItemScores)
+
+    Yields:
+        DataFrame skor per item untuk satu batch
+    """
+    if isinstance(item_scores, pd.DataFrame):
+        yield item_scores
+    elif isinstance(item_scores, dict):
+        yield pd.DataFrame(item_scores)
+    else:
+        yield from item_scores
+
+
+class RunningMoments:
+    """
+    Rata-rata dan variansi berjalan (algoritma Welford, digabung per batch)
+
+    Hanya menyimpan jumlah data, rata-rata, dan jumlah kuadrat selisih,
+    sehingga memori tetap konstan berapa pun jumlah item yang diproses.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        """
+        Menambahkan satu batch nilai (NaN diabaikan)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch_count = len(values)
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+
+        # Penggabungan dua himpunan (Chan et al.)
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_count / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * batch_count / total
+        self.count = total
+
+    def std(self, ddof: int = 0) -> float:
+        if self.count - ddof <= 0:
+            return 0.0
+        return float(np.sqrt(self.m2 / (self.count - ddof)))
+
+
+class StreamingEvaluator:
+    """
+    Evaluator inkremental yang menerima hasil summarization per batch
+
+    Setiap batch langsung diskor dengan SummarizationEvaluator (termasuk
+    cache reference-nya), lalu hanya agregat yang disimpan: momen berjalan
+    ROUGE/BERTScore dan jumlah statistik cukup BLEU. Hasil akhir memiliki
+    struktur yang sama dengan SummarizationEvaluator.evaluate_dataset dan
+    siap begitu generate selesai. Tabel skor per item hanya disimpan jika
+    diminta: di memori (keep_item_scores) atau ditulis ke file Arrow per
+    batch (spill_path) sehingga memori tetap terbatas.
+    """
+
+    def __init__(self, evaluator: SummarizationEvaluator, include_bertscore: bool = True,
+                 keep_item_scores: bool = False, spill_path: Optional[str] = None):
+        """
+        Inisialisasi streaming evaluator
+
+        Args:
+            evaluator: Evaluator yang dipakai untuk menskor setiap batch
+            include_bertscore: Hitung BERTScore per batch
+            keep_item_scores: Simpan tabel skor per item di memori (memori
+                bertambah dengan ukuran dataset)
+            spill_path: File Arrow IPC (stream) tempat tabel skor per item
+                setiap batch ditulis begitu batch selesai diskor; file tidak
+                dibaca kembali sekaligus, melainkan per batch lewat
+                iter_item_batches atau SpilledItemScores
+        """
+        self.evaluator = evaluator
+        self.include_bertscore = include_bertscore
+        self.keep_item_scores = keep_item_scores
+        self.spill_path = spill_path
+        self._spill_writer = None
+        self._spill_sink = None
+
+        columns = ROUGE_TYPES + (BERTSCORE_COLUMNS if include_bertscore else [])
+        self.moments: Dict[str, RunningMoments] = {column: RunningMoments() for column in columns}
+        self.bleu_stats = np.zeros(len(BLEU_STAT_COLUMNS), dtype=np.int64)
+        # Jumlah statistik BLEU per nilai grup (kategori, sumber, bucket panjang)
+        self.group_bleu_stats: Dict[str, Dict[str, np.ndarray]] = {column: {} for column in BLEU_GROUP_COLUMNS}
+        self.n_items = 0
+        self.n_valid = 0
+        self._item_batches: List[Dict[str, np.ndarray]] = []
+
+    def update(self, batch: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Menskor satu batch item dan memperbarui agregat
+
+        Args:
+            batch: Item dengan field 'id', 'category', 'source', 'summary', dan
+                'generated_summary'
+
+        Returns:
+            Tabel skor per item untuk batch ini
+        """
+        references = [item['summary'] for item in batch]
+        predictions = [item['generated_summary'] for item in batch]
+        reference_ids = [item['id'] for item in batch]
+
+        item_scores = {
+            **self.evaluator._item_metadata(batch),
+            **self.evaluator.score_items(references, predictions, include_bertscore=self.include_bertscore,
+                                         reference_ids=reference_ids)
+        }
+
+        for column, moments in self.moments.items():
+            moments.update(item_scores[column])
+        
+        bleu_stats = np.stack([item_scores[column] for column in BLEU_STAT_COLUMNS], axis=1)
+        self.bleu_stats += bleu_stats.sum(axis=0)
+        for column, groups in self.group_bleu_stats.items():
+            if column not in item_scores:
+                continue
+            for value, row in zip(item_scores[column], bleu_stats):
+                groups[value] = groups.get(value, 0) + row
+        self.n_items += len(batch)
+        self.n_valid += sum(1 for pred in predictions if pred.strip())
+
+        if self.keep_item_scores:
+            self._item_batches.append(item_scores)
+        if self.spill_path is not None:
+            self._spill(item_scores)
+        return item_scores
+
+    def _spill(self, item_scores: Dict[str, np.ndarray]):
+        batch = pa.record_batch({column: pa.array(values) for column, values in item_scores.items()})
+        if self._spill_writer is None:
+            self._spill_sink = pa.OSFile(self.spill_path, 'wb')
+            self._spill_writer = pa.ipc.new_stream(self._spill_sink, batch.schema)
+        self._spill_writer.write_batch(batch)
+
+    def _close_spill(self):
+        if self._spill_writer is not None:
+            self._spill_writer.close()
+            self._spill_sink.close()
+            self._spill_writer = None
+
+    @property
+    def item_scores(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Tabel skor per item seluruh batch di memori (None jika keep_item_scores
+        tidak aktif; skor yang di-spill dibaca lewat iter_item_batches)
+        """
+        if not self.keep_item_scores or not self._item_batches:
+            return None
+        return {
+            column: np.concatenate([batch[column] for batch in self._item_batches])
+            for column in self._item_batches[0]
+        }
+
+    def iter_item_batches(self) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Tabel skor per item per batch, dari file spill atau dari memori
+
+        Yields:
+            Dictionary kolom -> array untuk satu batch
+        """
+        if self.spill_path is not None:
+            self._close_spill()
+            if self.n_items:
+                yield from read_item_batches(self.spill_path)
+            return
+        yield from self._item_batches
+
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Menyusun hasil evaluasi dari agregat berjalan
+
+        Returns:
+            Dictionary berisi semua skor evaluasi (struktur sama dengan
+            SummarizationEvaluator.evaluate_summaries)
+        """
+        rouge_scores = {rouge_type: self.moments[rouge_type].mean for rouge_type in ROUGE_TYPES}
+        rouge_scores.update({f'{rouge_type}_std': self.moments[rouge_type].std() for rouge_type in ROUGE_TYPES})
+
+        bleu_scores = self.evaluator.bleu_from_statistics(self.bleu_stats, self.n_valid)
+
+        bert_scores = {column: 0.0 for column in BERTSCORE_COLUMNS}
+        bert_scores.update({f'{column}_std': 0.0 for column in BERTSCORE_COLUMNS})
+        if self.include_bertscore:
+            for column in BERTSCORE_COLUMNS:
+                bert_scores[column] = self.moments[column].mean if self.moments[column].count else 0.0
+                # Standar deviasi sampel (ddof=1), sama seperti aggregate_bertscore
+                bert_scores[f'{column}_std'] = self.moments[column].std(ddof=1)
+
+        # Tabel per item di memori tersedia untuk create_evaluation_dataframe;
+        # skor yang di-spill tetap di disk dan dibaca per batch
+        self._close_spill()
+        self.evaluator.item_scores = self.item_scores
+        self.evaluator._item_scores_dataset = None
+
+        results = {
+            'rouge': rouge_scores,
+            'bleu': bleu_scores,
+            'bertscore': bert_scores,
+            'summary': {
                 'rouge1': rouge_scores['rouge1'],
                 'rouge2': rouge_scores['rouge2'],
-                'rougeL': rouge_scores['rougeL']
-            })
-        
-        return pd.DataFrame(evaluation_data)
\ No newline at end of file
+                'rougeL': rouge_scores['rougeL'],
+                'bleu': bleu_scores['bleu'],
+                'bertscore_f1': bert_scores['bertscore_f1']
+            }
+        }
+
+        bleu_by_group = {}
+        for column, groups in self.group_bleu_stats.items():
+            if groups:
+                values = sorted(groups)
+                scores = corpus_bleu_from_stats(np.stack([groups[value] for value in values]))
+                bleu_by_group[column] = dict(zip(values, scores.tolist()))
+        if bleu_by_group:
+            results['bleu_by_group'] = bleu_by_group
+
+        return results
+
+
+class EvaluationPipeline:
+    """
+    Pipeline producer-consumer antara generate dan evaluasi
+
+    Item hasil generate dikumpulkan per batch lalu dimasukkan ke queue
+    berukuran terbatas. Thread evaluator mengambil batch dari queue dan
+    memanggil StreamingEvaluator.update, sehingga skor ROUGE/BLEU/BERTScore
+    dihitung selagi generate berjalan (operasi torch saat generate melepas
+    GIL). Jika evaluator tertinggal, queue penuh dan generate menunggu,
+    sehingga memori tetap terbatas.
+    """
+
+    _SENTINEL = None
+
+    def __init__(self, streaming: StreamingEvaluator, batch_size: int = 32,
+                 max_pending_batches: int = 4, threaded: bool = True,
+                 on_batch: Optional[Callable[[StreamingEvaluator], None]] = None):
+        """
+        Inisialisasi pipeline
+
+        Args:
+            streaming: Streaming evaluator yang menskor setiap batch
+            batch_size: Jumlah item per batch evaluasi
+            max_pending_batches: Kapasitas queue (dalam batch)
+            threaded: Evaluasi di thread terpisah; jika False, batch diskor
+                langsung di thread pemanggil
+            on_batch: Dipanggil dengan streaming evaluator setelah setiap batch
+                diskor (di thread evaluator), misalnya untuk aturan berhenti
+        """
+        self.streaming = streaming
+        self.batch_size = batch_size
+        self.threaded = threaded
+        self.on_batch = on_batch
+        self.wait_time = 0.0
+        self._batch: List[Dict[str, Any]] = []
+        self._error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+        self._thread = None
+        if threaded:
+            self._thread = threading.Thread(target=self._consume, name="evaluation-pipeline", daemon=True)
+            self._thread.start()
+
+    def _consume(self):
+        while True:
+            batch = self._queue.get()
+            if batch is self._SENTINEL:
+                return
+            if self._error is not None:
+                # Tetap mengosongkan queue agar producer tidak tertahan
+                continue
+            try:
+                self._evaluate(batch)
+            except BaseException as e:
+                self._error = e
+
+    def _evaluate(self, batch: List[Dict[str, Any]]):
+        self.streaming.update(batch)
+        if self.on_batch is not None:
+            self.on_batch(self.streaming)
+
+    def _dispatch(self, batch: List[Dict[str, Any]]):
+        if self.threaded:
+            self._queue.put(batch)
+        else:
+            self._evaluate(batch)
+
+    def submit(self, item: Dict[str, Any]):
+        """
+        Menambahkan satu item hasil generate ke pipeline
+        """
+        self._batch.append(item)
+        if len(self._batch) >= self.batch_size:
+            self._dispatch(self._batch)
+            self._batch = []
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Mengirim sisa batch, menunggu evaluator selesai, dan menyusun hasil
+
+        Returns:
+            Hasil evaluasi dari StreamingEvaluator.finalize
+        """
+        start_time = time.perf_counter()
+        if self._batch:
+            self._dispatch(self._batch)
+            self._batch = []
+        if self.threaded:
+            self._queue.put(self._SENTINEL)
+            self._thread.join()
+        # Waktu evaluasi yang tidak tertutupi oleh generate
+        self.wait_time = time.perf_counter() - start_time
+
+        if self._error is not None:
+            raise self._error
+        return self.streaming.finalize()
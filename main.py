@@ -5,14 +5,82 @@ Script utama untuk evaluasi text summarization menggunakan Gemma2 9B
 
 import os
 import json
+import random
 import argparse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
 
 # Import custom modules
 from data_loader import NewsDatasetLoader
-from summarizer import GemmaSummarizer
-from evaluator import SummarizationEvaluator
-from visualizer import SummarizationVisualizer
+from summarizer import GemmaSummarizer, SummaryLengthPredictor
+from evaluator import SummarizationEvaluator, StreamingEvaluator, EvaluationPipeline, SpilledItemScores, ItemScoreTable
+from text_normalizer import TOKENIZERS, STEMMERS, resolve_stemmer
+from visualizer import render_plots, BinnedAggregates
+from aggregates import AggregateCube
+from dashboard import build_dashboard
+from results_store import save_results, RESULTS_FILE
+from results_db import ResultsDatabase
+from telemetry import aggregate_telemetry, StageMemoryTracker
+from significance import bootstrap_ci, print_intervals
+from baselines import evaluate_baselines
+from adaptive import ADAPTIVE_METRICS, AdaptiveStoppingRule, stratified_order
+from dag import Stage, StageRunner, StageFailed
+
+def add_evaluator_arguments(parser: argparse.ArgumentParser):
+    """
+    Menambahkan opsi evaluator (ROUGE, BERTScore) ke parser; dipakai bersama
+    oleh main.py dan sweep.py
+
+    Args:
+        parser: Parser argumen command line
+    """
+    parser.add_argument('--n_jobs', type=int, default=1,
+                       help='Jumlah worker process untuk skor ROUGE (-1 untuk semua core)')
+    parser.add_argument('--rouge_engine', type=str, default='rouge_score', choices=['rouge_score', 'native'],
+                       help='Engine ROUGE: package rouge_score atau implementasi native')
+    parser.add_argument('--rouge_tokenizer', type=str, default='rouge_score', choices=list(TOKENIZERS),
+                       help='Tokenizer ROUGE: rouge_score (default, sebanding dengan run historis) atau indonesian '
+                            '(opt-in; skor tidak sebanding dengan run rouge_score)')
+    parser.add_argument('--stemmer', type=str, default=None, choices=list(STEMMERS) + ['none'],
+                       help='Stemmer ROUGE (default: porter untuk tokenizer rouge_score, tanpa stemmer untuk '
+                            'indonesian; none untuk menonaktifkan; sastrawi membutuhkan PySastrawi)')
+    parser.add_argument('--bertscore_cache_dir', type=str, default='cache/bertscore',
+                       help='Direktori cache embedding reference BERTScore')
+    parser.add_argument('--no_bertscore_cache', action='store_true',
+                       help='Nonaktifkan cache embedding reference BERTScore')
+    parser.add_argument('--bertscore_model', type=str, default=None,
+                       help='Encoder BERTScore, misalnya distilbert-base-multilingual-cased (default: model bert_score untuk bahasa id)')
+    parser.add_argument('--bertscore_layers', type=int, default=None,
+                       help='Layer representasi BERTScore (wajib untuk model di luar daftar bert_score)')
+    parser.add_argument('--bertscore_max_tokens', type=int, default=None,
+                       help='Token budget per batch encode BERTScore (default: otomatis dari memori tersedia)')
+    parser.add_argument('--bertscore_batch_size', type=int, default=64,
+                       help='Jumlah pasangan per batch greedy matching BERTScore')
+    parser.add_argument('--torch_threads', type=int, default=None,
+                       help='Jumlah thread torch untuk BERTScore')
+
+def evaluator_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Menyusun konfigurasi evaluator dari opsi add_evaluator_arguments
+
+    Args:
+        args: Hasil parse argumen
+
+    Returns:
+        Dictionary konfigurasi untuk build_evaluator
+    """
+    return {
+        'n_jobs': args.n_jobs,
+        'rouge_engine': args.rouge_engine,
+        'rouge_tokenizer': args.rouge_tokenizer,
+        'stemmer': resolve_stemmer(args.rouge_tokenizer, args.stemmer),
+        'bertscore_cache_dir': None if args.no_bertscore_cache else args.bertscore_cache_dir,
+        'bertscore_model': args.bertscore_model,
+        'bertscore_layers': args.bertscore_layers,
+        'bertscore_max_tokens': args.bertscore_max_tokens,
+        'bertscore_batch_size': args.bertscore_batch_size,
+        'torch_threads': args.torch_threads
+    }
 
 def main():
     """
@@ -33,8 +101,81 @@ def main():
                        help='Jumlah sampel untuk evaluasi (None untuk semua)')
     parser.add_argument('--output_dir', type=str, default='results',
                        help='Direktori untuk menyimpan hasil')
+    parser.add_argument('--revision', type=str, default=None,
+                       help='Revisi model/tokenizer di HuggingFace Hub')
+    parser.add_argument('--token_cache_dir', type=str, default='cache/tokens',
+                       help='Direktori token store hasil pre-tokenisasi prompt')
+    parser.add_argument('--no_token_cache', action='store_true',
+                       help='Nonaktifkan pre-tokenisasi dan tokenisasi prompt saat generate')
+    parser.add_argument('--adaptive_length', action='store_true',
+                       help='Prediksi max_new_tokens per artikel dari rasio panjang ringkasan/teks korpus')
+    parser.add_argument('--length_quantile', type=float, default=0.95,
+                       help='Kuantil panjang ringkasan untuk budget adaptif')
+    parser.add_argument('--no_stop_criteria', action='store_true',
+                       help='Jangan hentikan generate pada bagian "Artikel:" baru')
+    parser.add_argument('--stop_on_blank_line', action='store_true',
+                       help='Hentikan generate juga pada baris kosong pertama (memotong ringkasan multi-paragraf)')
+    add_evaluator_arguments(parser)
+    parser.add_argument('--streaming_eval', action='store_true',
+                       help='Skor summary per batch selama generate (agregat berjalan)')
+    parser.add_argument('--eval_batch_size', type=int, default=32,
+                       help='Jumlah summary per batch evaluasi streaming')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Evaluasi di thread terpisah selagi generate berjalan (queue terbatas)')
+    parser.add_argument('--max_pending_batches', type=int, default=4,
+                       help='Kapasitas queue pipeline dalam batch evaluasi')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Sampling adaptif: generate per batch terstratifikasi sampai CI cukup sempit '
+                            '(sample_size menjadi budget artikel)')
+    parser.add_argument('--target_half_width', type=float, default=0.01,
+                       help='Target half-width CI 95%% untuk sampling adaptif')
+    parser.add_argument('--adaptive_metrics', type=str, nargs='+', default=ADAPTIVE_METRICS,
+                       help='Metrik yang dipantau sampling adaptif')
+    parser.add_argument('--min_articles', type=int, default=30,
+                       help='Jumlah artikel minimum sebelum sampling adaptif boleh berhenti')
+    parser.add_argument('--time_budget', type=float, default=None,
+                       help='Budget waktu generate sampling adaptif (detik)')
+    parser.add_argument('--plot_workers', type=int, default=min(5, os.cpu_count() or 1),
+                       help='Jumlah worker process untuk render plot (1 untuk serial)')
+    parser.add_argument('--plot_dpi', type=int, default=300,
+                       help='Resolusi file plot')
+    parser.add_argument('--plot_preview_dpi', type=int, default=None,
+                       help='Simpan juga preview plot beresolusi rendah (mis. 60)')
+    parser.add_argument('--no_baselines', action='store_true',
+                       help='Lewati baseline gold extractive, lead-k, dan oracle ROUGE')
+    parser.add_argument('--lead_k', type=int, default=3,
+                       help='Jumlah kalimat baseline lead-k')
+    parser.add_argument('--results_db', type=str, default='results/results.db',
+                       help='Database SQLite hasil lintas run ("" untuk menonaktifkan)')
+    parser.add_argument('--run_name', type=str, default=None,
+                       help='Nama run di database hasil (default: output_dir)')
+    parser.add_argument('--isolate_stages', action='store_true',
+                       help='Hitung BERTScore di subprocess terpisah agar model summarizer dan BERTScore '
+                            'tidak pernah resident bersamaan. Hanya BERTScore yang diisolasi: generate tetap '
+                            'berjalan di proses utama (model summarizer selalu dibebaskan setelah generate)')
+    parser.add_argument('--bootstrap_resamples', type=int, default=1000,
+                       help='Jumlah resample bootstrap untuk confidence interval (0 untuk menonaktifkan)')
+    parser.add_argument('--compile', action='store_true',
+                       help='Gunakan torch.compile dengan bucket panjang prompt (termasuk warmup)')
+    parser.add_argument('--compile_mode', type=str, default='default',
+                       help='Mode torch.compile (default/reduce-overhead/max-autotune)')
+    parser.add_argument('--from_stage', '--from-stage', type=str, default=None, choices=STAGE_NAMES,
+                       help='Jalankan ulang stage ini dan semua stage turunannya (abaikan cache)')
+    parser.add_argument('--only_stage', '--only-stage', type=str, default=None, choices=STAGE_NAMES,
+                       help='Jalankan ulang hanya stage ini; artefak input dimuat dari cache')
+    parser.add_argument('--stage_cache_dir', type=str, default='cache/stages',
+                       help='Direktori cache artefak stage pipeline')
+    parser.add_argument('--no_stage_cache', action='store_true',
+                       help='Jalankan semua stage tanpa cache artefak')
     
     args = parser.parse_args()
+    if args.isolate_stages and (args.streaming_eval or args.pipeline or args.adaptive):
+        parser.error("--isolate_stages tidak dapat digabung dengan --streaming_eval/--pipeline/--adaptive "
+                     "(BERTScore per batch berjalan selagi model summarizer dimuat)")
+    if args.from_stage and args.only_stage:
+        parser.error("--from_stage dan --only_stage tidak dapat digabung")
+    if args.only_stage and args.no_stage_cache:
+        parser.error("--only_stage membutuhkan cache artefak stage (hapus --no_stage_cache)")
     
     # Konfigurasi
     CONFIG = {
@@ -44,167 +185,611 @@ def main():
         'max_length': args.max_length,
         'temperature': args.temperature,
         'sample_size': args.sample_size,
-        'output_dir': args.output_dir
+        'output_dir': args.output_dir,
+        'revision': args.revision,
+        'token_cache_dir': None if args.no_token_cache else args.token_cache_dir,
+        'adaptive_length': args.adaptive_length,
+        'length_quantile': args.length_quantile,
+        'stop_on_summary_end': not args.no_stop_criteria,
+        'stop_on_blank_line': args.stop_on_blank_line,
+        **evaluator_config(args),
+        'streaming_eval': args.streaming_eval,
+        'eval_batch_size': args.eval_batch_size,
+        'pipeline': args.pipeline,
+        'max_pending_batches': args.max_pending_batches,
+        'adaptive': args.adaptive,
+        'target_half_width': args.target_half_width,
+        'adaptive_metrics': args.adaptive_metrics,
+        'min_articles': args.min_articles,
+        'time_budget': args.time_budget,
+        'plot_workers': args.plot_workers,
+        'plot_dpi': args.plot_dpi,
+        'plot_preview_dpi': args.plot_preview_dpi,
+        'baselines': not args.no_baselines,
+        'lead_k': args.lead_k,
+        'results_db': args.results_db,
+        'run_name': args.run_name,
+        'isolate_stages': args.isolate_stages,
+        'bootstrap_resamples': args.bootstrap_resamples,
+        'compile': args.compile,
+        'compile_mode': args.compile_mode,
+        'stage_cache_dir': None if args.no_stage_cache else args.stage_cache_dir
     }
     
     print("="*60)
     print("EVALUASI TEXT SUMMARIZATION DENGAN GEMMA2 9B")
     print("="*60)
-    
+
     # Buat direktori output
     os.makedirs(CONFIG['output_dir'], exist_ok=True)
-    
-    # 1. Load Dataset
-    print("\n1. MEMUAT DATASET")
-    print("-" * 30)
-    
-    data_loader = NewsDatasetLoader(data_dir=CONFIG['data_dir'])
-    
-    if not os.path.exists(CONFIG['data_dir']):
-        print(f"Error: Direktori {CONFIG['data_dir']} tidak ditemukan!")
+
+    # 1-7. Pipeline per stage; stage yang key input dan konfigurasinya tidak
+    # berubah dipakai dari cache artefak
+    runner = StageRunner(PIPELINE_STAGES, CONFIG, cache_dir=CONFIG['stage_cache_dir'])
+    try:
+        runner.run(from_stage=args.from_stage, only_stage=args.only_stage)
+        report = runner.artifact('report') if args.only_stage in (None, 'report') else None
+    except StageFailed as e:
+        print(f"Error: {e}")
         return
+
+    print("\nDurasi per stage:")
+    runner.print_report()
+    timings_path = os.path.join(CONFIG['output_dir'], 'stage_timings.json')
+    with open(timings_path, 'w', encoding='utf-8') as f:
+        json.dump(runner.timings, f, indent=2)
+
+    if report is not None:
+        # 8. Print Summary
+        print("\n8. RINGKASAN")
+        print("-" * 30)
+        print(f"Total artikel: {report['total_articles']}")
+        if report['articles_needed'] is not None:
+            print(f"Artikel yang dibutuhkan (adaptif): {report['articles_needed']}")
+        print(f"ROUGE-1: {report['summary']['rouge1']:.3f}")
+        print(f"ROUGE-2: {report['summary']['rouge2']:.3f}")
+        print(f"ROUGE-L: {report['summary']['rougeL']:.3f}")
+        print(f"BLEU: {report['summary']['bleu']:.3f}")
+        print(f"BERTScore-F1: {report['summary']['bertscore_f1']:.3f}")
+        print(f"\nHasil tersimpan di: {CONFIG['output_dir']}")
+
+    print("\n" + "="*60)
+    print("EVALUASI SELESAI!")
+    print("="*60)
+
+def load_dataset(data_loader: NewsDatasetLoader, data_dir: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Memuat dan preprocess seluruh file train.XX.jsonl
+    
+    Args:
+        data_loader: Data loader dataset berita
+        data_dir: Direktori dataset
+        
+    Returns:
+        Data yang sudah dipreprocess, atau None jika direktori tidak ditemukan
+    """
+    if not os.path.exists(data_dir):
+        print(f"Error: Direktori {data_dir} tidak ditemukan!")
+        return None
     
     # Load dan preprocess data
     raw_data = data_loader.load_all_train_files()
     processed_data = data_loader.preprocess_data(raw_data)
     
     print(f"Dataset berhasil dimuat: {len(processed_data)} artikel")
+    return processed_data
+
+def sample_dataset(processed_data: List[Dict[str, Any]], sample_size: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Mengambil sampel artikel untuk evaluasi (seed tetap agar dapat direproduksi)
     
-    # 2. Sampling Data
-    print("\n2. SAMPLING DATA")
-    print("-" * 30)
-    
-    if CONFIG['sample_size'] and CONFIG['sample_size'] < len(processed_data):
-        import random
+    Args:
+        processed_data: Data yang sudah dipreprocess
+        sample_size: Jumlah sampel (None untuk semua)
+        
+    Returns:
+        Data untuk evaluasi
+    """
+    if sample_size and sample_size < len(processed_data):
         random.seed(42)
-        evaluation_data = random.sample(processed_data, CONFIG['sample_size'])
+        evaluation_data = random.sample(processed_data, sample_size)
         print(f"Sampling {len(evaluation_data)} artikel untuk evaluasi")
     else:
         evaluation_data = processed_data
         print(f"Menggunakan semua {len(evaluation_data)} artikel")
-    
-    # 3. Initialize Model
-    print("\n3. INISIALISASI MODEL")
-    print("-" * 30)
-    
-    try:
-        summarizer = GemmaSummarizer(
-            model_name=CONFIG['model_name'],
-            device=CONFIG['device']
-        )
-        print("Model berhasil diinisialisasi!")
-    except Exception as e:
-        print(f"Error saat inisialisasi model: {e}")
-        return
-    
-    # 4. Generate Summaries
-    print("\n4. GENERATE SUMMARIES")
-    print("-" * 30)
-    
-    try:
-        results_with_summaries = summarizer.summarize_dataset(
-            dataset=evaluation_data,
-            max_length=CONFIG['max_length'],
-            temperature=CONFIG['temperature']
-        )
-        print(f"Berhasil generate {len(results_with_summaries)} summaries")
-    except Exception as e:
-        print(f"Error saat generate summaries: {e}")
-        return
-    
+    return evaluation_data
+
+def build_evaluator(config: Dict[str, Any]) -> SummarizationEvaluator:
+    """
+    Membuat evaluator sesuai konfigurasi run
+
+    Args:
+        config: Konfigurasi run
+
+    Returns:
+        SummarizationEvaluator
+    """
+    return SummarizationEvaluator(
+        lang="id",
+        n_jobs=config['n_jobs'],
+        engine=config['rouge_engine'],
+        tokenizer=config['rouge_tokenizer'],
+        stemmer=config['stemmer'],
+        bertscore_cache_dir=config['bertscore_cache_dir'],
+        bertscore_model=config['bertscore_model'],
+        bertscore_num_layers=config['bertscore_layers'],
+        bertscore_max_tokens=config['bertscore_max_tokens'],
+        bertscore_batch_size=config['bertscore_batch_size'],
+        num_threads=config['torch_threads'],
+        bertscore_isolated=config.get('isolate_stages', False)
+    )
+
+def evaluate_results(config: Dict[str, Any], results_with_summaries: List[Dict[str, Any]],
+                     evaluator: SummarizationEvaluator,
+                     evaluation_results: Optional[Dict[str, Any]] = None,
+                     item_scores: Optional[Dict[str, Any]] = None,
+                     memory_tracker: Optional[StageMemoryTracker] = None) -> Tuple[Dict[str, Any], ItemScoreTable]:
+    """
+    Mengevaluasi summary, menghitung confidence interval dan baseline
+
+    Args:
+        config: Konfigurasi run
+        results_with_summaries: Dataset dengan generated summaries
+        evaluator: Evaluator yang dipakai
+        evaluation_results: Hasil evaluasi yang sudah dihitung (misalnya dari
+            StreamingEvaluator); jika None, dataset dievaluasi di sini
+        item_scores: Skor per item milik evaluation_results (default: skor
+            per item evaluator); SpilledItemScores dipakai apa adanya tanpa
+            dimuat ke memori
+        memory_tracker: Tracker durasi dan peak memori per stage (opsional)
+
+    Returns:
+        Tuple (hasil evaluasi, tabel skor per item: DataFrame atau SpilledItemScores)
+    """
     # 5. Evaluate Results
     print("\n5. EVALUASI HASIL")
     print("-" * 30)
-    
-    evaluator = SummarizationEvaluator(lang="id")
-    evaluation_results = evaluator.evaluate_dataset(results_with_summaries)
-    
+
+    if memory_tracker is None:
+        memory_tracker = StageMemoryTracker()
+    with memory_tracker.stage('evaluate'):
+        if evaluation_results is None:
+            evaluation_results = evaluator.evaluate_dataset(results_with_summaries)
+            item_scores = evaluator.item_scores
+
     # Print results
     evaluator.print_results(evaluation_results)
-    
+
+    if isinstance(item_scores, SpilledItemScores):
+        # Skor evaluasi streaming tetap di file spill dan dibaca per batch
+        evaluation_df = item_scores
+    else:
+        evaluation_df = evaluator.create_evaluation_dataframe(
+            results_with_summaries, item_scores=item_scores if item_scores is not None else evaluator.item_scores
+        )
+
+    # Confidence interval bootstrap dari skor per item
+    if config.get('bootstrap_resamples', 1000) > 0:
+        evaluation_results['confidence_intervals'] = bootstrap_ci(
+            evaluation_df, n_resamples=config.get('bootstrap_resamples', 1000)
+        )
+        print(f"\nConfidence interval 95% ({config.get('bootstrap_resamples', 1000)} resample):")
+        print_intervals(evaluation_results['confidence_intervals'])
+
+    # Baseline ekstraktif sebagai pembanding skor model
+    if config.get('baselines', True):
+        print("\nMenghitung baseline ekstraktif...")
+        evaluation_results['baselines'] = evaluate_baselines(
+            evaluator, results_with_summaries, lead_k=config.get('lead_k', 3)
+        )
+        for name, scores in evaluation_results['baselines'].items():
+            print(f"  {name}: ROUGE-1 {scores['rouge1']:.4f}, ROUGE-2 {scores['rouge2']:.4f}, "
+                  f"ROUGE-L {scores['rougeL']:.4f}, BLEU {scores['bleu']:.4f}")
+
+    return evaluation_results, evaluation_df
+
+def create_visualizations(config: Dict[str, Any], evaluation_results: Dict[str, Any],
+                          evaluation_df: ItemScoreTable) -> AggregateCube:
+    """
+    Membangun cube agregat dan merender plot ke config['output_dir']
+
+    Args:
+        config: Konfigurasi run
+        evaluation_results: Hasil evaluasi
+        evaluation_df: Tabel skor per item (DataFrame atau SpilledItemScores)
+
+    Returns:
+        Cube agregat kategori x sumber x bucket panjang
+    """
+    os.makedirs(config['output_dir'], exist_ok=True)
+
     # 6. Create Visualizations
     print("\n6. MEMBUAT VISUALISASI")
     print("-" * 30)
-    
-    visualizer = SummarizationVisualizer()
-    evaluation_df = evaluator.create_evaluation_dataframe(results_with_summaries)
-    
-    # Generate plots
+
+    # Cube agregat kategori x sumber x bucket panjang: dihitung sekali, dipakai
+    # oleh semua plot dan laporan, dan disimpan untuk analisis lanjutan
+    cube = AggregateCube.from_batches(evaluation_df)
+    cube.save(os.path.join(config['output_dir'], 'aggregate_cube.npz'))
+    plot_data = BinnedAggregates.from_cube(cube)
+
+    # Generate plots (headless, paralel per plot)
     plots = [
-        ('metrics_comparison.png', lambda: visualizer.plot_metrics_comparison(evaluation_results)),
-        ('category_analysis.png', lambda: visualizer.plot_category_analysis(evaluation_df)),
-        ('source_analysis.png', lambda: visualizer.plot_source_analysis(evaluation_df)),
-        ('length_analysis.png', lambda: visualizer.plot_length_analysis(evaluation_df)),
-        ('summary_report.png', lambda: visualizer.create_summary_report(evaluation_results, evaluation_df))
+        ('metrics_comparison.png', 'plot_metrics_comparison', (evaluation_results,)),
+        ('category_analysis.png', 'plot_category_analysis', (plot_data,)),
+        ('source_analysis.png', 'plot_source_analysis', (plot_data,)),
+        ('length_analysis.png', 'plot_length_analysis', (plot_data,)),
+        ('summary_report.png', 'create_summary_report', (evaluation_results, plot_data))
     ]
-    
-    for plot_name, plot_func in plots:
-        try:
-            plot_path = os.path.join(CONFIG['output_dir'], plot_name)
-            plot_func()
+    jobs = [(method, args, os.path.join(config['output_dir'], plot_name)) for plot_name, method, args in plots]
+
+    plot_errors = render_plots(
+        jobs,
+        n_workers=config.get('plot_workers', 1),
+        dpi=config.get('plot_dpi', 300),
+        preview_dpi=config.get('plot_preview_dpi')
+    )
+    for plot_name, _, _ in plots:
+        error = plot_errors[os.path.join(config['output_dir'], plot_name)]
+        if error is None:
             print(f"Plot tersimpan: {plot_name}")
-        except Exception as e:
-            print(f"Error saat membuat {plot_name}: {e}")
-    
+        else:
+            print(f"Error saat membuat {plot_name}: {error}")
+
+    return cube
+
+def save_outputs(config: Dict[str, Any], total_articles: int, results_with_summaries: List[Dict[str, Any]],
+                 evaluation_results: Dict[str, Any], evaluation_df: ItemScoreTable, cube: AggregateCube):
+    """
+    Menyimpan hasil evaluasi, hasil per item, laporan akhir, dan dashboard ke config['output_dir']
+
+    Args:
+        config: Konfigurasi run
+        total_articles: Jumlah artikel yang dievaluasi
+        results_with_summaries: Dataset dengan generated summaries
+        evaluation_results: Hasil evaluasi (termasuk 'stage_memory')
+        evaluation_df: Tabel skor per item (DataFrame atau SpilledItemScores)
+        cube: Cube agregat hasil create_visualizations
+    """
+    os.makedirs(config['output_dir'], exist_ok=True)
+
     # 7. Save Results
     print("\n7. MENYIMPAN HASIL")
     print("-" * 30)
-    
+
+    # Durasi dan peak memori per stage
+    memory_tracker = StageMemoryTracker()
+    memory_tracker.stages = evaluation_results.get('stage_memory', {})
+    print("Peak memori per stage:")
+    memory_tracker.print_report()
+
     # Save evaluation results
-    results_path = os.path.join(CONFIG['output_dir'], 'evaluation_results.json')
-    evaluator.save_results(evaluation_results, results_path)
-    
-    # Save results with summaries
-    summaries_path = os.path.join(CONFIG['output_dir'], 'results_with_summaries.jsonl')
-    data_loader.save_processed_data(results_with_summaries, summaries_path)
-    
-    # Save evaluation dataframe
-    df_path = os.path.join(CONFIG['output_dir'], 'evaluation_dataframe.csv')
-    evaluation_df.to_csv(df_path, index=False)
-    
+    results_path = os.path.join(config['output_dir'], 'evaluation_results.json')
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(evaluation_results, f, indent=2, ensure_ascii=False)
+    print(f"Hasil evaluasi tersimpan di: {results_path}")
+
+    # Hasil per item (skor, generated summary, telemetry) dalam format kolumnar;
+    # teks artikel dan reference dirujuk lewat id ke dataset sumber
+    save_results(evaluation_df, results_with_summaries, os.path.join(config['output_dir'], RESULTS_FILE),
+                 data_dir=config.get('data_dir'))
+
+    # Daftarkan konfigurasi dan skor per item ke database hasil lintas run
+    if config.get('results_db'):
+        database = ResultsDatabase(config['results_db'])
+        run_name = config.get('run_name') or os.path.normpath(config['output_dir'])
+        database.register_run(run_name, evaluation_df, config=config,
+                              summary=evaluation_results['summary'], output_dir=config['output_dir'])
+        database.close()
+        print(f"Run '{run_name}' terdaftar di: {config['results_db']}")
+
+    plot_data = BinnedAggregates.from_cube(cube)
+
     # Create final report
     report = {
-        'config': CONFIG,
+        'config': config,
         'dataset_info': {
-            'total_articles': len(evaluation_data),
-            'categories': evaluation_df['category'].nunique(),
-            'sources': evaluation_df['source'].nunique(),
-            'avg_text_length': evaluation_df['reference_length'].mean(),
-            'avg_summary_length': evaluation_df['prediction_length'].mean()
+            'total_articles': total_articles,
+            'categories': len(cube.labels['category']),
+            'sources': len(cube.labels['source']),
+            'avg_text_length': plot_data.mean('reference_length'),
+            'avg_summary_length': plot_data.mean('prediction_length')
         },
         'evaluation_results': evaluation_results,
-        'files_generated': [
-            'evaluation_results.json',
-            'results_with_summaries.jsonl',
-            'evaluation_dataframe.csv',
-            'metrics_comparison.png',
-            'category_analysis.png',
-            'source_analysis.png',
-            'length_analysis.png',
-            'summary_report.png'
-        ]
+        'telemetry': aggregate_telemetry(results_with_summaries),
+        'files_generated': OUTPUT_FILES
     }
-    
-    report_path = os.path.join(CONFIG['output_dir'], 'final_report.json')
+
+    report_path = os.path.join(config['output_dir'], 'final_report.json')
     with open(report_path, 'w', encoding='utf-8') as f:
         json.dump(report, f, indent=2, ensure_ascii=False)
-    
+
+    # Dashboard HTML dari artefak yang baru disimpan
+    build_dashboard([config['output_dir']], os.path.join(config['output_dir'], 'dashboard.html'))
+
     print("Semua hasil tersimpan!")
-    
-    # 8. Print Summary
-    print("\n8. RINGKASAN")
+
+def evaluate_and_save(config: Dict[str, Any], evaluation_data: List[Dict[str, Any]],
+                      results_with_summaries: List[Dict[str, Any]],
+                      evaluator: SummarizationEvaluator,
+                      evaluation_results: Optional[Dict[str, Any]] = None,
+                      memory_tracker: Optional[StageMemoryTracker] = None) -> Dict[str, Any]:
+    """
+    Menjalankan evaluasi, visualisasi, dan menyimpan seluruh hasil ke config['output_dir']
+
+    Args:
+        config: Konfigurasi run
+        evaluation_data: Data yang dievaluasi
+        results_with_summaries: Dataset dengan generated summaries
+        evaluator: Evaluator yang dipakai
+        evaluation_results: Hasil evaluasi yang sudah dihitung (misalnya dari
+            StreamingEvaluator); jika None, dataset dievaluasi di sini
+        memory_tracker: Tracker durasi dan peak memori per stage (opsional);
+            laporannya disimpan di evaluation_results['stage_memory']
+
+    Returns:
+        Hasil evaluasi
+    """
+    if memory_tracker is None:
+        memory_tracker = StageMemoryTracker()
+    evaluation_results, evaluation_df = evaluate_results(
+        config, results_with_summaries, evaluator, evaluation_results=evaluation_results,
+        memory_tracker=memory_tracker
+    )
+    cube = create_visualizations(config, evaluation_results, evaluation_df)
+    evaluation_results['stage_memory'] = memory_tracker.stages
+    save_outputs(config, len(evaluation_data), results_with_summaries, evaluation_results, evaluation_df, cube)
+    return evaluation_results
+
+def _train_files(config: Dict[str, Any]) -> List[str]:
+    data_dir = config['data_dir']
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(os.path.join(data_dir, file) for file in os.listdir(data_dir)
+                  if file.startswith('train.') and file.endswith('.jsonl'))
+
+def _output_paths(*files: str) -> Callable[[Dict[str, Any]], List[str]]:
+    return lambda config: [os.path.join(config['output_dir'], file) for file in files]
+
+def _generate_outputs(config: Dict[str, Any]) -> List[str]:
+    # Skor per item evaluasi streaming dibaca stage berikutnya dari file spill
+    if config['streaming_eval'] or config['pipeline'] or config['adaptive']:
+        return [os.path.join(config['output_dir'], STREAM_SCORES_FILE)]
+    return []
+
+def _generate_config_keys(config: Dict[str, Any]) -> List[str]:
+    keys = list(GENERATE_CONFIG_KEYS)
+    # Evaluasi streaming/adaptif berjalan di dalam stage generate (dan
+    # menentukan kapan generate berhenti)
+    if config['streaming_eval'] or config['pipeline'] or config['adaptive']:
+        keys += EVALUATOR_CONFIG_KEYS + STREAMING_CONFIG_KEYS
+    return keys
+
+def stage_load(config: Dict[str, Any], inputs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Stage load: membaca seluruh file train.XX.jsonl
+    """
+    # 1. Load Dataset
+    print("\n1. MEMUAT DATASET")
     print("-" * 30)
-    print(f"Total artikel: {len(evaluation_data)}")
-    print(f"ROUGE-1: {evaluation_results['summary']['rouge1']:.3f}")
-    print(f"ROUGE-2: {evaluation_results['summary']['rouge2']:.3f}")
-    print(f"ROUGE-L: {evaluation_results['summary']['rougeL']:.3f}")
-    print(f"BLEU: {evaluation_results['summary']['bleu']:.3f}")
-    print(f"BERTScore-F1: {evaluation_results['summary']['bertscore_f1']:.3f}")
-    print(f"\nHasil tersimpan di: {CONFIG['output_dir']}")
-    
-    print("\n" + "="*60)
-    print("EVALUASI SELESAI!")
-    print("="*60)
+
+    if not os.path.exists(config['data_dir']):
+        raise StageFailed(f"Direktori {config['data_dir']} tidak ditemukan!")
+    return NewsDatasetLoader(data_dir=config['data_dir']).load_all_train_files()
+
+def stage_preprocess(config: Dict[str, Any], inputs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Stage preprocess: membersihkan data mentah
+    """
+    processed_data = NewsDatasetLoader(data_dir=config['data_dir']).preprocess_data(inputs['load'])
+    print(f"Dataset berhasil dimuat: {len(processed_data)} artikel")
+    return processed_data
+
+def stage_sample(config: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage sample: memilih artikel evaluasi dan mengepas prediktor panjang summary
+    """
+    # 2. Sampling Data
+    print("\n2. SAMPLING DATA")
+    print("-" * 30)
+
+    processed_data = inputs['preprocess']
+    if config['adaptive']:
+        # Urutan terstratifikasi per kategori; generate berhenti saat CI cukup sempit
+        evaluation_data = stratified_order(processed_data)[:config['sample_size']]
+        print(f"Sampling adaptif: maksimal {len(evaluation_data)} artikel, "
+              f"target half-width CI {config['target_half_width']}")
+    else:
+        evaluation_data = sample_dataset(processed_data, config['sample_size'])
+
+    # Prediktor dikepas pada seluruh korpus, bukan hanya sampel
+    length_predictor = None
+    if config['adaptive_length']:
+        length_predictor = SummaryLengthPredictor(quantile=config['length_quantile']).fit(processed_data)
+
+    return {'evaluation_data': evaluation_data, 'length_predictor': length_predictor}
+
+def stage_generate(config: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage generate: memuat model dan generate summary (beserta evaluasi streaming/adaptif)
+    """
+    evaluation_data = inputs['sample']['evaluation_data']
+
+    # 3. Initialize Model
+    print("\n3. INISIALISASI MODEL")
+    print("-" * 30)
+
+    memory_tracker = StageMemoryTracker()
+    with memory_tracker.stage('load_model'):
+        try:
+            summarizer = GemmaSummarizer(
+                model_name=config['model_name'],
+                device=config['device'],
+                revision=config['revision']
+            )
+            print("Model berhasil diinisialisasi!")
+        except Exception as e:
+            raise StageFailed(f"Inisialisasi model gagal: {e}") from e
+
+        if config['compile']:
+            summarizer.enable_compile(mode=config['compile_mode'])
+            warmup_timings = summarizer.warmup(max_length=config['max_length'])
+            print(f"Warmup selesai dalam {sum(warmup_timings.values()):.2f} detik")
+
+    # 4. Generate Summaries
+    print("\n4. GENERATE SUMMARIES")
+    print("-" * 30)
+
+    token_store = None
+    if config['token_cache_dir']:
+        token_store = summarizer.pretokenize_dataset(evaluation_data, config['token_cache_dir'])
+
+    evaluator = None
+    stopping_rule = None
+    if config['adaptive']:
+        stopping_rule = AdaptiveStoppingRule(
+            target_half_width=config['target_half_width'],
+            metrics=config['adaptive_metrics'],
+            min_articles=config['min_articles'],
+            max_articles=len(evaluation_data),
+            time_budget=config['time_budget']
+        )
+    pipeline = None
+    # Skor per item evaluasi streaming ditulis ke disk per batch, bukan ditahan
+    # di memori; stage berikutnya membacanya per batch dari file ini
+    spill_path = os.path.join(config['output_dir'], STREAM_SCORES_FILE)
+    if config['streaming_eval'] or config['pipeline'] or config['adaptive']:
+        evaluator = build_evaluator(config)
+        pipeline = EvaluationPipeline(
+            StreamingEvaluator(evaluator, spill_path=spill_path),
+            batch_size=config['eval_batch_size'],
+            max_pending_batches=config['max_pending_batches'],
+            threaded=config['pipeline'],
+            on_batch=stopping_rule.update if stopping_rule is not None else None
+        )
+
+    with memory_tracker.stage('generate'):
+        try:
+            results_with_summaries = []
+            for result_item in summarizer.iter_summaries(
+                dataset=evaluation_data,
+                max_length=config['max_length'],
+                temperature=config['temperature'],
+                token_store=token_store,
+                length_predictor=inputs['sample']['length_predictor'],
+                stop_on_summary_end=config['stop_on_summary_end'],
+                stop_on_blank_line=config['stop_on_blank_line']
+            ):
+                results_with_summaries.append(result_item)
+                if pipeline is not None:
+                    pipeline.submit(result_item)
+                if stopping_rule is not None and stopping_rule.should_stop(len(results_with_summaries)):
+                    break
+            print(f"Berhasil generate {len(results_with_summaries)} summaries")
+        except Exception as e:
+            raise StageFailed(f"Generate summaries gagal: {e}") from e
+
+        evaluation_results = None
+        if pipeline is not None:
+            evaluation_results = pipeline.finish()
+            print(f"Evaluasi selesai {pipeline.wait_time:.2f} detik setelah generate")
+
+    # Model summarizer tidak dibutuhkan lagi; bebaskan sebelum model BERTScore dimuat
+    summarizer.release()
+
+    if stopping_rule is not None:
+        evaluation_data = evaluation_data[:len(results_with_summaries)]
+        evaluation_results['adaptive_sampling'] = stopping_rule.report(len(results_with_summaries))
+        half_widths = ", ".join(f"{metric} ±{width:.4f}" for metric, width in stopping_rule.half_widths.items())
+        print(f"Sampling adaptif berhenti setelah {len(results_with_summaries)} artikel "
+              f"({evaluation_results['adaptive_sampling']['stop_reason']}): {half_widths}")
+
+    return {
+        'results': results_with_summaries,
+        'total_articles': len(evaluation_data),
+        'evaluation_results': evaluation_results,
+        'item_scores': SpilledItemScores(spill_path) if pipeline is not None else None,
+        'stage_memory': memory_tracker.stages
+    }
+
+def stage_evaluate(config: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage evaluate: skor per item, confidence interval, dan baseline
+    """
+    generated = inputs['generate']
+    # Salinan agar artefak stage generate di memori tidak ikut berubah
+    evaluation_results = generated['evaluation_results']
+    if evaluation_results is not None:
+        evaluation_results = dict(evaluation_results)
+
+    memory_tracker = StageMemoryTracker()
+    evaluation_results, evaluation_df = evaluate_results(
+        config, generated['results'], build_evaluator(config),
+        evaluation_results=evaluation_results, item_scores=generated['item_scores'],
+        memory_tracker=memory_tracker
+    )
+    return {
+        'evaluation_results': evaluation_results,
+        'evaluation_df': evaluation_df,
+        'stage_memory': {**generated['stage_memory'], **memory_tracker.stages}
+    }
+
+def stage_visualize(config: Dict[str, Any], inputs: Dict[str, Any]) -> AggregateCube:
+    """
+    Stage visualize: cube agregat dan plot
+    """
+    evaluated = inputs['evaluate']
+    return create_visualizations(config, evaluated['evaluation_results'], evaluated['evaluation_df'])
+
+def stage_report(config: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage report: hasil evaluasi, hasil per item, database hasil, laporan akhir, dan dashboard
+    """
+    generated = inputs['generate']
+    evaluated = inputs['evaluate']
+    evaluation_results = dict(evaluated['evaluation_results'])
+    evaluation_results['stage_memory'] = evaluated['stage_memory']
+    save_outputs(config, generated['total_articles'], generated['results'], evaluation_results,
+                 evaluated['evaluation_df'], inputs['visualize'])
+    adaptive_sampling = evaluation_results.get('adaptive_sampling')
+    return {
+        'summary': evaluation_results['summary'],
+        'total_articles': generated['total_articles'],
+        'articles_needed': adaptive_sampling['articles_needed'] if adaptive_sampling else None
+    }
+
+# File yang ditulis ke direktori output run
+STREAM_SCORES_FILE = 'item_scores.stream.arrow'
+PLOT_OUTPUTS = ['aggregate_cube.npz', 'metrics_comparison.png', 'category_analysis.png',
+                'source_analysis.png', 'length_analysis.png', 'summary_report.png']
+REPORT_OUTPUTS = ['evaluation_results.json', RESULTS_FILE, 'final_report.json', 'dashboard.html']
+OUTPUT_FILES = ['evaluation_results.json', RESULTS_FILE] + PLOT_OUTPUTS + ['dashboard.html']
+
+# Field konfigurasi yang memengaruhi artefak tiap stage
+GENERATE_CONFIG_KEYS = ['model_name', 'revision', 'device', 'max_length', 'temperature',
+                        'stop_on_summary_end', 'stop_on_blank_line', 'compile', 'compile_mode',
+                        'streaming_eval', 'pipeline', 'adaptive']
+EVALUATOR_CONFIG_KEYS = ['rouge_engine', 'rouge_tokenizer', 'stemmer', 'bertscore_model', 'bertscore_layers']
+STREAMING_CONFIG_KEYS = ['eval_batch_size', 'target_half_width', 'adaptive_metrics', 'min_articles', 'time_budget']
+
+# DAG pipeline: load -> preprocess -> sample -> generate -> evaluate -> visualize -> report
+PIPELINE_STAGES = [
+    # Data mentah tidak di-cache: preprocess yang di-cache sudah mewakilinya
+    Stage('load', stage_load, config_keys=['data_dir'], external_inputs=_train_files, persist=False),
+    Stage('preprocess', stage_preprocess, inputs=['load']),
+    Stage('sample', stage_sample, inputs=['preprocess'],
+          config_keys=['sample_size', 'adaptive', 'adaptive_length', 'length_quantile']),
+    Stage('generate', stage_generate, inputs=['sample'], config_keys=_generate_config_keys,
+          outputs=_generate_outputs),
+    Stage('evaluate', stage_evaluate, inputs=['generate'],
+          config_keys=EVALUATOR_CONFIG_KEYS + ['bootstrap_resamples', 'baselines', 'lead_k']),
+    Stage('visualize', stage_visualize, inputs=['evaluate'],
+          config_keys=['output_dir', 'plot_dpi', 'plot_preview_dpi'], outputs=_output_paths(*PLOT_OUTPUTS)),
+    # Laporan akhir memuat seluruh konfigurasi run
+    Stage('report', stage_report, inputs=['generate', 'evaluate', 'visualize'],
+          config_keys=lambda config: list(config), outputs=_output_paths(*REPORT_OUTPUTS))
+]
+STAGE_NAMES = [stage.name for stage in PIPELINE_STAGES]
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Database hasil lintas run (SQLite) dengan skor per item dan query diff antar run
+"""
+
+import os
+import json
+import time
+import sqlite3
+import argparse
+from typing import List, Dict, Any, Optional
+
+import pandas as pd
+
+from evaluator import ROUGE_TYPES, BERTSCORE_COLUMNS, BLEU_STAT_COLUMNS, iter_item_frames
+from results_store import load_results_frame
+
+# Kolom skor per item yang disimpan di tabel items
+ITEM_COLUMNS = ROUGE_TYPES + BERTSCORE_COLUMNS + ['reference_length', 'prediction_length'] + BLEU_STAT_COLUMNS
+
+# Metrik yang dapat dipakai pada query diff (nama kolom divalidasi sebelum masuk SQL)
+DIFF_METRICS = ROUGE_TYPES + BERTSCORE_COLUMNS + ['prediction_length']
+
+# Metadata per item
+METADATA_COLUMNS = ['category', 'source', 'length_bucket']
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    output_dir TEXT,
+    created_at TEXT NOT NULL,
+    n_items INTEGER NOT NULL,
+    config TEXT,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS articles (
+    article_id INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS items (
+    run_id INTEGER NOT NULL,
+    article_id INTEGER NOT NULL,
+    {', '.join(f'{column} TEXT' for column in METADATA_COLUMNS)},
+    {', '.join(f'{column} REAL' for column in ITEM_COLUMNS)},
+    PRIMARY KEY (run_id, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS items_article ON items (article_id, run_id);
+"""
+
+
+class ResultsDatabase:
+    """
+    Database SQLite berisi konfigurasi dan skor per item setiap run
+
+    Id artikel diinternalisasi ke integer (tabel articles). Tabel items
+    berkunci (run_id, article_id) tanpa rowid, sehingga baris satu run
+    tersimpan berdampingan dan pasangan item dua run ditemukan lewat
+    lookup primary key; index (article_id, run_id) melayani riwayat satu
+    artikel lintas run.
+    """
+
+    def __init__(self, path: str = 'results/results.db'):
+        """
+        Args:
+            path: Path file database (dibuat jika belum ada)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def run_id(self, name: str) -> int:
+        row = self.connection.execute('SELECT run_id FROM runs WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Run tidak ditemukan: {name}")
+        return row[0]
+
+    def register_run(self, name: str, item_scores, config: Optional[Dict[str, Any]] = None,
+                     summary: Optional[Dict[str, Any]] = None, output_dir: Optional[str] = None) -> int:
+        """
+        Mendaftarkan satu run beserta skor per item (menggantikan run bernama sama)
+
+        Skor per item dimasukkan per batch dalam satu transaksi.
+
+        Args:
+            name: Nama unik run
+            item_scores: Tabel skor per item (DataFrame berisi 'id', atau
+                iterable DataFrame per batch, misalnya SpilledItemScores)
+            config: Konfigurasi run
+            summary: Skor agregat run (evaluation_results['summary'])
+            output_dir: Direktori output run
+
+        Returns:
+            run_id
+        """
+        with self.connection:
+            cursor = self.connection.cursor()
+            cursor.execute('DELETE FROM items WHERE run_id IN (SELECT run_id FROM runs WHERE name = ?)', (name,))
+            cursor.execute('DELETE FROM runs WHERE name = ?', (name,))
+            cursor.execute(
+                'INSERT INTO runs (name, output_dir, created_at, n_items, config, summary) VALUES (?, ?, ?, ?, ?, ?)',
+                (name, output_dir, time.strftime('%Y-%m-%d %H:%M:%S'), 0,
+                 json.dumps(config, default=str), json.dumps(summary, default=str))
+            )
+            run_id = cursor.lastrowid
+
+            n_items = 0
+            for frame in iter_item_frames(item_scores):
+                ids = frame['id'].astype(str).tolist()
+                n_items += len(ids)
+                cursor.executemany('INSERT OR IGNORE INTO articles (id) VALUES (?)', ((item_id,) for item_id in ids))
+                article_ids = dict(cursor.execute(
+                    'SELECT id, article_id FROM articles WHERE id IN (SELECT value FROM json_each(?))',
+                    (json.dumps(ids),)
+                ).fetchall())
+
+                columns = [column for column in METADATA_COLUMNS + ITEM_COLUMNS if column in frame]
+                values = [frame[column].astype(str).tolist() if column in METADATA_COLUMNS
+                          else frame[column].astype(float).tolist() for column in columns]
+                placeholders = ', '.join('?' * (len(columns) + 2))
+                cursor.executemany(
+                    f"INSERT OR REPLACE INTO items (run_id, article_id, {', '.join(columns)}) VALUES ({placeholders})",
+                    ((run_id, article_ids[item_id], *row) for item_id, *row in zip(ids, *values))
+                )
+            cursor.execute('UPDATE runs SET n_items = ? WHERE run_id = ?', (n_items, run_id))
+        return run_id
+
+    def register_output_dir(self, output_dir: str, name: Optional[str] = None) -> int:
+        """
+        Mendaftarkan run dari direktori output yang sudah tersimpan
+
+        Args:
+            output_dir: Direktori run (berisi results.arrow dan final_report.json)
+            name: Nama run (default: path direktori)
+
+        Returns:
+            run_id
+        """
+        report_path = os.path.join(output_dir, 'final_report.json')
+        report = {}
+        if os.path.exists(report_path):
+            with open(report_path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        return self.register_run(
+            name or os.path.normpath(output_dir),
+            load_results_frame(output_dir),
+            config=report.get('config'),
+            summary=report.get('evaluation_results', {}).get('summary'),
+            output_dir=output_dir
+        )
+
+    def runs(self) -> pd.DataFrame:
+        """
+        Daftar run beserta skor agregatnya
+        """
+        frame = pd.read_sql_query(
+            'SELECT run_id, name, created_at, n_items, output_dir, summary FROM runs ORDER BY run_id',
+            self.connection
+        )
+        summaries = pd.DataFrame([json.loads(summary or '{}') or {} for summary in frame.pop('summary')])
+        return pd.concat([frame, summaries], axis=1)
+
+    def regressions(self, run_a: str, run_b: str, metric: str = 'rougeL', threshold: float = 0.1,
+                    limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Item di mana run B turun lebih dari threshold dibandingkan run A
+
+        Args:
+            run_a: Nama run acuan
+            run_b: Nama run pembanding
+            metric: Metrik per item (DIFF_METRICS)
+            threshold: Batas penurunan (misalnya 0.1 ROUGE-L)
+            limit: Jumlah baris maksimum (penurunan terbesar lebih dulu)
+
+        Returns:
+            DataFrame id, category, source, skor A, skor B, dan delta (B - A)
+        """
+        if metric not in DIFF_METRICS:
+            raise ValueError(f"Metrik tidak dikenal: {metric}. Pilihan: {DIFF_METRICS}")
+        query = f"""
+            SELECT articles.id AS id, a.category AS category, a.source AS source,
+                   a.{metric} AS {metric}_a, b.{metric} AS {metric}_b, b.{metric} - a.{metric} AS delta
+            FROM items AS a
+            JOIN items AS b ON b.run_id = ? AND b.article_id = a.article_id
+            JOIN articles ON articles.article_id = a.article_id
+            WHERE a.run_id = ? AND b.{metric} - a.{metric} < ?
+            ORDER BY delta
+        """
+        params: List[Any] = [self.run_id(run_b), self.run_id(run_a), -threshold]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return pd.read_sql_query(query, self.connection, params=params)
+
+    def compare(self, run_a: str, run_b: str, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Ringkasan item berpasangan dua run: rata-rata delta, jumlah menang/kalah
+
+        Args:
+            run_a: Nama run acuan
+            run_b: Nama run pembanding
+            metrics: Metrik per item (default: DIFF_METRICS)
+
+        Returns:
+            DataFrame per metrik: n_items, mean_delta, wins_b, losses_b
+        """
+        metrics = metrics or DIFF_METRICS
+        unknown = set(metrics) - set(DIFF_METRICS)
+        if unknown:
+            raise ValueError(f"Metrik tidak dikenal: {sorted(unknown)}. Pilihan: {DIFF_METRICS}")
+        selects = ', '.join(
+            f"AVG(b.{metric} - a.{metric}), SUM(b.{metric} > a.{metric}), SUM(b.{metric} < a.{metric})"
+            for metric in metrics
+        )
+        row = self.connection.execute(
+            f"""SELECT COUNT(*), {selects} FROM items AS a
+                JOIN items AS b ON b.run_id = ? AND b.article_id = a.article_id
+                WHERE a.run_id = ?""",
+            (self.run_id(run_b), self.run_id(run_a))
+        ).fetchone()
+        return pd.DataFrame(
+            [{'metric': metric, 'n_items': row[0], 'mean_delta': row[1 + 3 * i],
+              'wins_b': row[2 + 3 * i], 'losses_b': row[3 + 3 * i]} for i, metric in enumerate(metrics)]
+        ).set_index('metric')
+
+    def article_history(self, article_id: str) -> pd.DataFrame:
+        """
+        Skor satu artikel di semua run
+        """
+        return pd.read_sql_query(
+            f"""SELECT runs.name AS run, {', '.join(f'items.{metric}' for metric in DIFF_METRICS)}
+                FROM items JOIN runs ON runs.run_id = items.run_id
+                WHERE items.article_id = (SELECT article_id FROM articles WHERE id = ?)
+                ORDER BY items.run_id""",
+            self.connection, params=(article_id,)
+        )
+
+
+def main():
+    """
+    Fungsi utama: mendaftarkan run dan menjalankan query diff
+    """
+    parser = argparse.ArgumentParser(description='Database hasil evaluasi lintas run')
+    parser.add_argument('--db', type=str, default='results/results.db',
+                       help='Path file database SQLite')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    register_parser = subparsers.add_parser('register', help='Daftarkan direktori run yang sudah tersimpan')
+    register_parser.add_argument('output_dirs', type=str, nargs='+', help='Direktori run')
+
+    subparsers.add_parser('runs', help='Daftar run')
+
+    diff_parser = subparsers.add_parser('diff', help='Item di mana run B kalah dari run A')
+    diff_parser.add_argument('--run_a', type=str, required=True, help='Nama run acuan')
+    diff_parser.add_argument('--run_b', type=str, required=True, help='Nama run pembanding')
+    diff_parser.add_argument('--metric', type=str, default='rougeL', choices=DIFF_METRICS,
+                            help='Metrik per item')
+    diff_parser.add_argument('--threshold', type=float, default=0.1,
+                            help='Batas penurunan skor')
+    diff_parser.add_argument('--limit', type=int, default=20,
+                            help='Jumlah item yang ditampilkan')
+
+    args = parser.parse_args()
+    database = ResultsDatabase(args.db)
+
+    if args.command == 'register':
+        for output_dir in args.output_dirs:
+            run_id = database.register_output_dir(output_dir)
+            print(f"Run terdaftar: {os.path.normpath(output_dir)} (run_id {run_id})")
+    elif args.command == 'runs':
+        print(database.runs().to_string(index=False))
+    else:
+        start_time = time.perf_counter()
+        regressions = database.regressions(args.run_a, args.run_b, args.metric, args.threshold, args.limit)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        print(database.compare(args.run_a, args.run_b, [args.metric]).to_string())
+        print(f"\nItem dengan {args.metric} turun > {args.threshold} ({elapsed:.1f} ms):")
+        print(regressions.to_string(index=False))
+
+    database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Penyimpanan hasil per item dalam format kolumnar (Arrow IPC)
+"""
+
+import os
+import json
+from typing import List, Dict, Any, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from telemetry import TELEMETRY_FIELDS
+from evaluator import iter_item_frames
+
+# Nama file hasil per item di direktori output run
+RESULTS_FILE = 'results.arrow'
+
+# Kolom bernilai berulang yang disimpan dengan dictionary encoding
+DICTIONARY_COLUMNS = ['category', 'source', 'length_bucket']
+
+
+def _results_path(path: str) -> str:
+    return os.path.join(path, RESULTS_FILE) if os.path.isdir(path) else path
+
+
+def _dictionary_array(values: List[str], dictionary: Dict[str, int]) -> pa.DictionaryArray:
+    """
+    Dictionary encoding dengan kamus yang hanya bertambah, sehingga batch
+    berikutnya cukup ditulis sebagai delta kamus batch sebelumnya
+    """
+    indices = [dictionary.setdefault(value, len(dictionary)) for value in values]
+    return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()),
+                                          pa.array(list(dictionary), type=pa.string()))
+
+
+def results_table(item_scores: pd.DataFrame, results: List[Dict[str, Any]],
+                  data_dir: Optional[str] = None,
+                  dictionaries: Optional[Dict[str, Dict[str, int]]] = None) -> pa.Table:
+    """
+    Menyusun tabel Arrow hasil per item
+
+    Tabel berisi id, metadata (dictionary-encoded), generated summary, skor
+    per item, dan telemetry (kolom telemetry_<field>). Teks artikel,
+    paragraf, reference, dan gold label tidak disalin: item dirujuk lewat
+    id ke dataset sumber yang dicatat di metadata schema.
+
+    Args:
+        item_scores: Tabel skor per item (DataFrame hasil evaluasi, berisi 'id')
+        results: Dataset dengan field 'generated_summary' dan 'telemetry'
+            (atau dictionary id -> item)
+        data_dir: Direktori dataset sumber (dicatat di metadata)
+        dictionaries: Kamus dictionary encoding per kolom yang dipakai ulang
+            antar batch (default: kamus baru)
+
+    Returns:
+        pyarrow.Table
+    """
+    by_id = results if isinstance(results, dict) else {item['id']: item for item in results}
+    items = [by_id.get(item_id, {}) for item_id in item_scores['id']]
+    if dictionaries is None:
+        dictionaries = {}
+
+    columns: Dict[str, pa.Array] = {'id': pa.array(item_scores['id'].astype(str).tolist(), type=pa.string())}
+    for column in item_scores.columns:
+        if column == 'id':
+            continue
+        if column in DICTIONARY_COLUMNS:
+            columns[column] = _dictionary_array(item_scores[column].astype(str).tolist(),
+                                                dictionaries.setdefault(column, {}))
+        else:
+            columns[column] = pa.array(item_scores[column].to_numpy())
+    columns['generated_summary'] = pa.array([item.get('generated_summary') for item in items], type=pa.string())
+    for field in TELEMETRY_FIELDS:
+        columns[f'telemetry_{field}'] = pa.array(
+            [(item.get('telemetry') or {}).get(field) for item in items], type=pa.float64()
+        )
+
+    metadata = {'source': json.dumps({'data_dir': data_dir, 'key': 'id'})}
+    return pa.table(columns).replace_schema_metadata(metadata)
+
+
+def save_results(item_scores, results: List[Dict[str, Any]], path: str,
+                 data_dir: Optional[str] = None):
+    """
+    Menyimpan hasil per item ke file Arrow IPC (tanpa kompresi agar dapat di-mmap)
+
+    Tabel ditulis per batch: hanya satu batch skor per item yang berada di
+    memori, dan kolom dictionary ditulis sebagai delta kamus.
+
+    Args:
+        item_scores: Tabel skor per item (DataFrame atau iterable DataFrame
+            per batch, misalnya SpilledItemScores)
+        results: Dataset dengan field 'generated_summary' dan 'telemetry'
+        path: Path file output (atau direktori run)
+        data_dir: Direktori dataset sumber
+    """
+    path = _results_path(path)
+    by_id = {item['id']: item for item in results}
+    dictionaries: Dict[str, Dict[str, int]] = {}
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    writer, schema = None, None
+    with pa.OSFile(path, 'wb') as sink:
+        for frame in iter_item_frames(item_scores):
+            table = results_table(frame, by_id, data_dir, dictionaries)
+            if writer is None:
+                schema = table.schema
+                writer = pa.ipc.new_file(sink, schema, options=options)
+            # Tipe kolom batch berikutnya disamakan dengan batch pertama
+            writer.write_table(table.cast(schema))
+        if writer is None:
+            table = results_table(pd.DataFrame({'id': []}), by_id, data_dir)
+            writer = pa.ipc.new_file(sink, table.schema, options=options)
+        writer.close()
+    print(f"Hasil per item tersimpan di: {path}")
+
+
+def load_results(path: str, columns: Optional[List[str]] = None) -> pa.Table:
+    """
+    Memuat hasil per item secara zero-copy
+
+    File di-memory-map sehingga buffer kolom menunjuk langsung ke halaman
+    file; hanya kolom yang dipilih (dan yang benar-benar diakses) yang
+    dibaca dari disk.
+
+    Args:
+        path: File results.arrow atau direktori run
+        columns: Kolom yang dimuat (default: semua)
+
+    Returns:
+        pyarrow.Table
+    """
+    source = pa.memory_map(_results_path(path), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def load_results_frame(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Memuat hasil per item sebagai DataFrame (kolom dictionary menjadi Categorical)
+
+    Args:
+        path: File results.arrow atau direktori run
+        columns: Kolom yang dimuat (default: semua)
+
+    Returns:
+        DataFrame hasil per item
+    """
+    return load_results(path, columns).to_pandas()
+
+
+def results_source(path: str) -> Dict[str, Any]:
+    """
+    Dataset sumber yang dirujuk oleh file hasil ({'data_dir', 'key'})
+    """
+    metadata = load_results(path).schema.metadata or {}
+    return json.loads(metadata.get(b'source', b'{}'))
+
+
+def attach_source(frame: pd.DataFrame, dataset: List[Dict[str, Any]],
+                  fields: Tuple[str, ...] = ('text', 'summary')) -> pd.DataFrame:
+    """
+    Menggabungkan field dataset sumber (misalnya teks dan reference) berdasarkan id
+
+    Args:
+        frame: DataFrame hasil per item (berisi 'id')
+        dataset: Dataset sumber yang sudah dipreprocess
+        fields: Field dataset yang ditambahkan
+
+    Returns:
+        DataFrame dengan kolom tambahan
+    """
+    by_id = {item['id']: item for item in dataset}
+    frame = frame.copy()
+    for field in fields:
+        frame[field] = [by_id.get(item_id, {}).get(field) for item_id in frame['id']]
+    return frame
+
+
+def load_summary_pairs(path: str, dataset: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """
+    Pasangan (reference, generated summary) dari file hasil dan dataset sumber
+
+    Args:
+        path: File results.arrow atau direktori run
+        dataset: Dataset sumber yang sudah dipreprocess
+
+    Returns:
+        Tuple (references, predictions) untuk item yang ditemukan di dataset
+    """
+    frame = attach_source(load_results_frame(path, ['id', 'generated_summary']), dataset, ('summary',))
+    frame = frame[frame['summary'].notna()]
+    predictions = frame['generated_summary'].fillna('').tolist()
+    return frame['summary'].tolist(), predictions
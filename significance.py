@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Bootstrap confidence interval dan uji signifikansi berpasangan dari tabel skor per item
+"""
+
+import os
+import json
+import argparse
+from typing import Dict, Any, Tuple, Iterator
+
+import numpy as np
+import pandas as pd
+
+from evaluator import ROUGE_TYPES, BERTSCORE_COLUMNS, BLEU_STAT_COLUMNS, corpus_bleu_from_stats, iter_item_frames
+from results_store import RESULTS_FILE, load_results, load_results_frame
+
+# Metrik rata-rata per item yang diberi confidence interval
+MEAN_METRICS = ROUGE_TYPES + BERTSCORE_COLUMNS
+
+# Kolom yang dibutuhkan dari file hasil per item
+SCORE_COLUMNS = ['id'] + MEAN_METRICS + BLEU_STAT_COLUMNS
+
+
+def load_item_scores(path: str) -> pd.DataFrame:
+    """
+    Memuat tabel skor per item dari direktori hasil run atau file
+
+    Hanya kolom id dan skor yang dibaca dari results.arrow (memory-mapped);
+    evaluation_dataframe.csv dari run lama tetap didukung.
+
+    Args:
+        path: Direktori output run, file results.arrow, atau file CSV
+
+    Returns:
+        DataFrame skor per item
+    """
+    if os.path.isdir(path):
+        arrow_path = os.path.join(path, RESULTS_FILE)
+        path = arrow_path if os.path.exists(arrow_path) else os.path.join(path, 'evaluation_dataframe.csv')
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    names = load_results(path).column_names
+    return load_results_frame(path, [name for name in names if name in SCORE_COLUMNS])
+
+
+def _metric_layout(table) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Menyusun matriks nilai (n, m) yang dapat dijumlahkan per resample
+
+    Setiap metrik rata-rata mendapat satu kolom nilai (NaN diganti 0) dan
+    satu kolom indikator item valid, sehingga rata-rata resample adalah
+    jumlah nilai / jumlah item valid. Statistik cukup BLEU ditambahkan apa
+    adanya sehingga BLEU korpus resample dihitung dari jumlahnya.
+    """
+    columns, layout = [], {'mean': {}, 'bleu': None}
+    for metric in MEAN_METRICS:
+        if metric not in table:
+            continue
+        values = np.asarray(table[metric], dtype=np.float64)
+        valid = ~np.isnan(values)
+        if not valid.any():
+            continue
+        layout['mean'][metric] = (len(columns), len(columns) + 1)
+        columns.extend([np.where(valid, values, 0.0), valid.astype(np.float64)])
+
+    if all(column in table for column in BLEU_STAT_COLUMNS):
+        layout['bleu'] = list(range(len(columns), len(columns) + len(BLEU_STAT_COLUMNS)))
+        columns.extend(np.asarray(table[column], dtype=np.float64) for column in BLEU_STAT_COLUMNS)
+
+    return np.stack(columns, axis=1), layout
+
+
+def _metrics_from_sums(sums: np.ndarray, layout: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Menghitung metrik dari jumlah kolom matriks nilai
+
+    Args:
+        sums: Array (B, m) jumlah kolom per resample
+        layout: Layout kolom dari _metric_layout
+
+    Returns:
+        Dictionary nama metrik -> array (B,)
+    """
+    sums = np.atleast_2d(sums)
+    metrics = {}
+    for metric, (value_col, valid_col) in layout['mean'].items():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            metrics[metric] = sums[:, value_col] / sums[:, valid_col]
+    if layout['bleu'] is not None:
+        metrics['bleu'] = corpus_bleu_from_stats(np.rint(sums[:, layout['bleu']]))
+    return metrics
+
+
+def bootstrap_weights(n_items: int, n_resamples: int, rng: np.random.Generator,
+                      chunk_size: int = 128) -> Iterator[np.ndarray]:
+    """
+    Menghasilkan matriks bobot bootstrap per chunk resample
+
+    Setiap chunk dibuat dari satu matriks indeks acak (chunk, n_items) yang
+    diubah menjadi hitungan kemunculan per item dengan satu np.bincount,
+    sehingga jumlah nilai per resample cukup dihitung dengan perkalian
+    matriks bobot @ nilai.
+
+    Args:
+        n_items: Jumlah item
+        n_resamples: Jumlah resample
+        rng: Generator bilangan acak
+        chunk_size: Jumlah resample per chunk (membatasi memori)
+
+    Yields:
+        Array float (chunk, n_items) berisi hitungan kemunculan setiap item
+    """
+    for start in range(0, n_resamples, chunk_size):
+        size = min(chunk_size, n_resamples - start)
+        indices = rng.integers(0, n_items, size=(size, n_items))
+        indices += np.arange(size)[:, None] * n_items
+        counts = np.bincount(indices.ravel(), minlength=size * n_items)
+        yield counts.reshape(size, n_items).astype(np.float64)
+
+
+def _interval(distribution: np.ndarray, confidence: float) -> Tuple[float, float]:
+    alpha = (1 - confidence) / 2
+    distribution = distribution[~np.isnan(distribution)]
+    if len(distribution) == 0:
+        return float('nan'), float('nan')
+    low, high = np.percentile(distribution, [100 * alpha, 100 * (1 - alpha)])
+    return float(low), float(high)
+
+
+def bootstrap_ci(item_scores, n_resamples: int = 10000, confidence: float = 0.95,
+                 seed: int = 42, chunk_size: int = 128) -> Dict[str, Dict[str, float]]:
+    """
+    Confidence interval bootstrap untuk setiap metrik
+
+    Tabel per batch (misalnya SpilledItemScores) dibaca satu batch per
+    langkah dan hanya kolom skor yang dikumpulkan, karena resample bootstrap
+    membutuhkan nilai setiap item.
+
+    Args:
+        item_scores: Tabel skor per item (DataFrame, dict kolom -> array, atau
+            iterable DataFrame per batch)
+        n_resamples: Jumlah resample bootstrap
+        confidence: Tingkat kepercayaan
+        seed: Seed generator acak
+        chunk_size: Jumlah resample per chunk
+
+    Returns:
+        Dictionary metrik -> {'value', 'ci_low', 'ci_high', 'std_error'}
+    """
+    if not isinstance(item_scores, (pd.DataFrame, dict)):
+        item_scores = pd.concat([frame[[column for column in frame.columns if column in SCORE_COLUMNS]]
+                                 for frame in iter_item_frames(item_scores)], ignore_index=True)
+    values, layout = _metric_layout(item_scores)
+    point = _metrics_from_sums(values.sum(axis=0), layout)
+
+    rng = np.random.default_rng(seed)
+    sums = np.concatenate([
+        weights @ values for weights in bootstrap_weights(len(values), n_resamples, rng, chunk_size)
+    ])
+    distributions = _metrics_from_sums(sums, layout)
+
+    intervals = {}
+    for metric, distribution in distributions.items():
+        low, high = _interval(distribution, confidence)
+        intervals[metric] = {
+            'value': float(point[metric][0]),
+            'ci_low': low,
+            'ci_high': high,
+            'std_error': float(np.nanstd(distribution, ddof=1))
+        }
+    return intervals
+
+
+def paired_test(scores_a, scores_b, n_resamples: int = 10000, confidence: float = 0.95,
+                seed: int = 42, chunk_size: int = 128) -> Dict[str, Dict[str, float]]:
+    """
+    Uji berpasangan (paired bootstrap dan permutation test) antara dua run
+
+    Item dipasangkan berdasarkan kolom 'id'. Paired bootstrap memakai indeks
+    resample yang sama untuk kedua run; permutation test menukar skor A/B
+    per item secara acak (approximate randomization), termasuk statistik
+    cukup BLEU.
+
+    Args:
+        scores_a: Tabel skor per item run A
+        scores_b: Tabel skor per item run B
+        n_resamples: Jumlah resample bootstrap dan permutasi
+        confidence: Tingkat kepercayaan interval selisih
+        seed: Seed generator acak
+        chunk_size: Jumlah resample per chunk
+
+    Returns:
+        Dictionary metrik -> {'a', 'b', 'delta', 'ci_low', 'ci_high',
+        'p_bootstrap', 'p_permutation', 'n_items'}
+    """
+    scores_a, scores_b = pd.DataFrame(scores_a), pd.DataFrame(scores_b)
+    merged = scores_a.merge(scores_b, on='id', suffixes=('_a', '_b'))
+    table_a = {column[:-2]: merged[column] for column in merged.columns if column.endswith('_a')}
+    table_b = {column[:-2]: merged[column] for column in merged.columns if column.endswith('_b')}
+
+    values_a, layout = _metric_layout(table_a)
+    values_b, layout_b = _metric_layout(table_b)
+    if layout != layout_b:
+        raise ValueError("Kedua run harus memiliki kolom metrik yang sama")
+
+    total_a, total_b = values_a.sum(axis=0), values_b.sum(axis=0)
+    point_a = _metrics_from_sums(total_a, layout)
+    point_b = _metrics_from_sums(total_b, layout)
+    observed = {metric: point_a[metric][0] - point_b[metric][0] for metric in point_a}
+
+    rng = np.random.default_rng(seed)
+    n_items = len(merged)
+
+    # Paired bootstrap: bobot yang sama untuk kedua run
+    stacked = np.concatenate([values_a, values_b], axis=1)
+    width = values_a.shape[1]
+    sums = np.concatenate([
+        weights @ stacked for weights in bootstrap_weights(n_items, n_resamples, rng, chunk_size)
+    ])
+    boot_a = _metrics_from_sums(sums[:, :width], layout)
+    boot_b = _metrics_from_sums(sums[:, width:], layout)
+
+    # Permutation test: item yang ditukar memindahkan selisihnya antar run
+    diff = values_b - values_a
+    perm_a, perm_b = [], []
+    for start in range(0, n_resamples, chunk_size):
+        size = min(chunk_size, n_resamples - start)
+        swaps = rng.integers(0, 2, size=(size, n_items)).astype(np.float64)
+        moved = swaps @ diff
+        perm_a.append(total_a + moved)
+        perm_b.append(total_b - moved)
+    perm_a = _metrics_from_sums(np.concatenate(perm_a), layout)
+    perm_b = _metrics_from_sums(np.concatenate(perm_b), layout)
+
+    results = {}
+    for metric, delta in observed.items():
+        boot_delta = boot_a[metric] - boot_b[metric]
+        perm_delta = perm_a[metric] - perm_b[metric]
+        low, high = _interval(boot_delta, confidence)
+        p_bootstrap = 2 * min(np.mean(boot_delta <= 0), np.mean(boot_delta >= 0))
+        p_permutation = (1 + np.sum(np.abs(perm_delta) >= abs(delta) - 1e-12)) / (1 + len(perm_delta))
+        results[metric] = {
+            'a': float(point_a[metric][0]),
+            'b': float(point_b[metric][0]),
+            'delta': float(delta),
+            'ci_low': low,
+            'ci_high': high,
+            'p_bootstrap': float(min(p_bootstrap, 1.0)),
+            'p_permutation': float(p_permutation),
+            'n_items': n_items
+        }
+    return results
+
+
+def print_intervals(intervals: Dict[str, Dict[str, float]], confidence: float = 0.95):
+    """
+    Mencetak confidence interval setiap metrik
+    """
+    for metric, stats in intervals.items():
+        print(f"  {metric}: {stats['value']:.4f} "
+              f"[{stats['ci_low']:.4f}, {stats['ci_high']:.4f}] ({confidence:.0%} CI)")
+
+
+def main():
+    """
+    Fungsi utama: CI satu run, atau uji berpasangan jika dua run diberikan
+    """
+    parser = argparse.ArgumentParser(description='Bootstrap CI dan uji signifikansi hasil evaluasi')
+    parser.add_argument('--results_a', type=str, required=True,
+                       help='Direktori output run (atau results.arrow / evaluation_dataframe.csv)')
+    parser.add_argument('--results_b', type=str, default=None,
+                       help='Run pembanding untuk uji berpasangan (opsional)')
+    parser.add_argument('--n_resamples', type=int, default=10000,
+                       help='Jumlah resample bootstrap/permutasi')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                       help='Tingkat kepercayaan')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Seed generator acak')
+    parser.add_argument('--output_path', type=str, default=None,
+                       help='File JSON untuk menyimpan hasil')
+
+    args = parser.parse_args()
+
+    scores_a = load_item_scores(args.results_a)
+
+    if args.results_b is None:
+        results = bootstrap_ci(scores_a, n_resamples=args.n_resamples,
+                               confidence=args.confidence, seed=args.seed)
+        print(f"Confidence interval ({len(scores_a)} item, {args.n_resamples} resample):")
+        print_intervals(results, args.confidence)
+    else:
+        scores_b = load_item_scores(args.results_b)
+        results = paired_test(scores_a, scores_b, n_resamples=args.n_resamples,
+                              confidence=args.confidence, seed=args.seed)
+        print(f"Uji berpasangan A - B ({args.n_resamples} resample):")
+        for metric, stats in results.items():
+            print(f"  {metric}: A={stats['a']:.4f} B={stats['b']:.4f} delta={stats['delta']:+.4f} "
+                  f"[{stats['ci_low']:+.4f}, {stats['ci_high']:+.4f}] "
+                  f"p_bootstrap={stats['p_bootstrap']:.4f} p_permutation={stats['p_permutation']:.4f}")
+
+    if args.output_path:
+        with open(args.output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nHasil tersimpan di: {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,240 @@
+import gc
+import time
+import numpy as np
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
-from typing import List, Dict, Any
+from transformers import (
+    AutoTokenizer, AutoModelForCausalLM,
+    LogitsProcessor, LogitsProcessorList,
+    StoppingCriteria, StoppingCriteriaList
+)
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union, Iterator
 import re
 from tqdm import tqdm
 
+from telemetry import current_rss_mb, reset_peak_rss, peak_rss_since_reset_mb
+from token_store import TokenizedCorpusStore
+
+# Prompt template untuk summarization dalam bahasa Indonesia
+PROMPT_TEMPLATE = """Berikut adalah artikel berita dalam bahasa Indonesia. Buatlah ringkasan yang singkat dan informatif dalam bahasa Indonesia.
+
+Artikel:
+{text}
+
+Ringkasan:"""
+
+# Panjang maksimal prompt dalam token
+MAX_INPUT_LENGTH = 2048
+
+# Bucket panjang prompt untuk mode compiled. Prompt di-pad ke bucket terdekat
+# sehingga jumlah shape yang di-compile terbatas pada jumlah bucket.
+PROMPT_BUCKETS = (256, 512, 1024, 2048)
+
+# Penanda bahwa ringkasan sudah selesai: awal artikel baru (penanda prompt)
+STOP_STRINGS = ("Artikel:",)
+
+# Stop string dengan baris kosong (opt-in: reference dapat terdiri dari
+# beberapa paragraf yang dipisah baris kosong)
+BLANK_LINE_STOP_STRINGS = ("\n\n",) + STOP_STRINGS
+
+# Jumlah kata pada template prompt (di luar teks artikel)
+PROMPT_TEMPLATE_WORDS = len(PROMPT_TEMPLATE.format(text="").split())
+
+
+def _count_words(tokens: Any) -> int:
+    """
+    Menghitung jumlah token pada struktur list bertingkat (paragraf/kalimat/token)
+    """
+    if isinstance(tokens, str):
+        return 1
+    return sum(_count_words(t) for t in tokens)
+
+
+def truncate_at_stop_strings(text: str, stop_strings: Sequence[str] = STOP_STRINGS) -> str:
+    """
+    Memotong teks pada kemunculan pertama salah satu stop string
+
+    Args:
+        text: Teks hasil generate
+        stop_strings: Daftar penanda akhir ringkasan
+
+    Returns:
+        Teks sebelum stop string pertama
+    """
+    text = text.lstrip()
+    cut = len(text)
+    for stop in stop_strings:
+        pos = text.find(stop)
+        if pos != -1:
+            cut = min(cut, pos)
+    return text[:cut].strip()
+
+
+class SummaryStoppingCriteria(StoppingCriteria):
+    """
+    Stopping criteria yang menghentikan generate saat ringkasan selesai,
+    yaitu ketika muncul salah satu stop string (default: bagian "Artikel:" baru)
+
+    Setiap langkah hanya men-decode ekor output yang cukup panjang untuk
+    memuat stop string yang berakhir di token terbaru, sehingga biayanya
+    konstan per token, bukan sebanding dengan panjang output.
+    """
+
+    def __init__(self, tokenizer, prompt_length: int, stop_strings: Sequence[str] = STOP_STRINGS):
+        """
+        Args:
+            tokenizer: Tokenizer untuk decode token yang sudah dihasilkan
+            prompt_length: Panjang prompt dalam token
+            stop_strings: Daftar penanda akhir ringkasan
+        """
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.stop_strings = stop_strings
+        # Setiap token menghasilkan minimal satu karakter, jadi stop string
+        # yang berakhir di token terbaru termuat di ekor sepanjang ini
+        stop_tokens = [len(tokenizer.encode(stop, add_special_tokens=False)) for stop in stop_strings]
+        self.tail_length = max(stop_tokens + [len(stop) for stop in stop_strings]) + 2
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        start = max(self.prompt_length, input_ids.shape[1] - self.tail_length)
+        done = []
+        for row in input_ids:
+            text = self.tokenizer.decode(row[start:], skip_special_tokens=True)
+            if start == self.prompt_length:
+                # Whitespace di awal output tidak dihitung sebagai baris kosong
+                text = text.lstrip()
+            done.append(any(stop in text for stop in self.stop_strings))
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+
+class NewTokenBudgetCriteria(StoppingCriteria):
+    """
+    Stopping criteria yang membatasi jumlah token baru tanpa mengubah
+    max_new_tokens (dipakai mode compiled agar ukuran static cache tetap)
+    """
+
+    def __init__(self, prompt_length: int, max_new_tokens: int):
+        self.max_total_length = prompt_length + max_new_tokens
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        done = input_ids.shape[1] >= self.max_total_length
+        return torch.full((input_ids.shape[0],), done, dtype=torch.bool, device=input_ids.device)
+
+
+class FirstTokenTimer(LogitsProcessor):
+    """
+    Logits processor pasif yang mencatat waktu saat logits token pertama
+    tersedia, yaitu akhir fase prefill (time to first token)
+    """
+
+    def __init__(self, synchronize: bool = False):
+        """
+        Args:
+            synchronize: Panggil torch.cuda.synchronize sebelum mencatat waktu
+        """
+        self.synchronize = synchronize
+        self.first_token_time = None
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        if self.first_token_time is None:
+            if self.synchronize:
+                torch.cuda.synchronize()
+            self.first_token_time = time.perf_counter()
+        return scores
+
+
+class SummaryLengthPredictor:
+    """
+    Memprediksi budget max_new_tokens per artikel dari panjang artikel,
+    berdasarkan rasio panjang ringkasan referensi terhadap teks di korpus
+    """
+
+    def __init__(self, quantile: float = 0.95, margin: float = 1.2, min_new_tokens: int = 32):
+        """
+        Args:
+            quantile: Kuantil residual yang dipakai sebagai batas atas panjang ringkasan
+            margin: Faktor pengali keamanan untuk budget token
+            min_new_tokens: Budget minimal token baru
+        """
+        self.quantile = quantile
+        self.margin = margin
+        self.min_new_tokens = min_new_tokens
+        self.coef = None
+
+    def fit(self, dataset: List[Dict[str, Any]]) -> 'SummaryLengthPredictor':
+        """
+        Fit regresi log(panjang ringkasan) terhadap log(panjang artikel)
+
+        Args:
+            dataset: Dataset hasil preprocess_data (field 'text' dan 'summary_paragraphs')
+
+        Returns:
+            Predictor yang sudah di-fit
+        """
+        text_words = np.array([len(item['text'].split()) for item in dataset], dtype=np.float64)
+        summary_words = np.array([_count_words(item['summary_paragraphs']) for item in dataset], dtype=np.float64)
+
+        valid = (text_words > 0) & (summary_words > 0)
+        log_text = np.log(text_words[valid])
+        log_summary = np.log(summary_words[valid])
+
+        if valid.sum() >= 2 and np.ptp(log_text) > 0:
+            slope, intercept = np.polyfit(log_text, log_summary, 1)
+        else:
+            slope, intercept = 1.0, float(np.mean(log_summary - log_text)) if valid.any() else 0.0
+
+        residuals = log_summary - (slope * log_text + intercept)
+        offset = float(np.quantile(residuals, self.quantile)) if residuals.size else 0.0
+        self.coef = (float(slope), float(intercept) + offset)
+
+        ratios = summary_words[valid] / text_words[valid]
+        print(f"Length predictor: rasio ringkasan/teks median {np.median(ratios):.3f} "
+              f"dari {int(valid.sum())} artikel")
+        return self
+
+    def predict_words(self, text_words: int) -> float:
+        """
+        Memprediksi batas atas panjang ringkasan dalam kata
+        """
+        slope, intercept = self.coef
+        return float(np.exp(slope * np.log(max(text_words, 1)) + intercept))
+
+    def predict_tokens(self, text_words: int, prompt_tokens: int, max_new_tokens: int) -> int:
+        """
+        Memprediksi budget max_new_tokens untuk satu artikel
+
+        Args:
+            text_words: Jumlah kata artikel
+            prompt_tokens: Jumlah token prompt (untuk estimasi token per kata)
+            max_new_tokens: Batas atas budget
+
+        Returns:
+            Budget token baru
+        """
+        if self.coef is None:
+            return max_new_tokens
+        tokens_per_word = max(prompt_tokens / (text_words + PROMPT_TEMPLATE_WORDS), 1.0)
+        budget = int(np.ceil(self.predict_words(text_words) * tokens_per_word * self.margin))
+        return int(np.clip(budget, self.min_new_tokens, max_new_tokens))
+
+
 class GemmaSummarizer:
     """
     Class untuk melakukan summarization menggunakan model Gemma2 9B
     """
     
-    def __init__(self, model_name: str = "google/gemma2-9b", device: str = None):
+    def __init__(self, model_name: str = "google/gemma2-9b", device: str = None, revision: str = None):
         """
         Inisialisasi summarizer dengan model Gemma2 9B
         
         Args:
             model_name: Nama model yang akan digunakan
             device: Device untuk inference (cuda/cpu)
+            revision: Revisi model/tokenizer di HuggingFace Hub (None untuk default)
         """
         self.model_name = model_name
+        self.revision = revision
+        self.compiled = False
+        self.prompt_buckets = None
         
         # Set device
         if device is None:
@@ -29,11 +246,12 @@ class GemmaSummarizer:
         
         # Load tokenizer dan model
         print("Memuat tokenizer...")
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
         
         print("Memuat model...")
         self.model = AutoModelForCausalLM.from_pretrained(
             model_name,
+            revision=revision,
             torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
             device_map="auto" if self.device == "cuda" else None
         )
@@ -44,7 +262,115 @@ class GemmaSummarizer:
             
         print("Model berhasil dimuat!")
     
-    def generate_summary(self, text: str, max_length: int = 512, temperature: float = 0.7) -> str:
+    def release(self):
+        """
+        Membebaskan model dari memori (CPU/GPU) setelah generate selesai,
+        sehingga tidak ikut resident saat model BERTScore dimuat
+        """
+        self.model = None
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        print("Model summarizer dibebaskan dari memori")
+    
+    def build_prompt(self, text: str) -> str:
+        """
+        Membuat prompt summarization untuk teks input
+        
+        Args:
+            text: Teks artikel
+            
+        Returns:
+            Prompt yang siap ditokenisasi
+        """
+        return PROMPT_TEMPLATE.format(text=text)
+    
+    def enable_compile(self, mode: str = "default", prompt_buckets: Sequence[int] = PROMPT_BUCKETS):
+        """
+        Mengaktifkan inference dengan torch.compile (opt-in)
+        
+        Forward model di-compile dengan shape statis: KV cache memakai
+        implementasi static dan prompt di-pad ke bucket panjang terdekat,
+        sehingga recompile terbatas pada satu graph prefill dan satu graph
+        decode per bucket. Panggil warmup() sebelum mengukur performa.
+        
+        Args:
+            mode: Mode torch.compile ("default", "reduce-overhead", "max-autotune")
+            prompt_buckets: Bucket panjang prompt dalam token
+        """
+        self.prompt_buckets = sorted(prompt_buckets)
+        self.model.generation_config.cache_implementation = "static"
+        self.model.forward = torch.compile(self.model.forward, mode=mode, dynamic=False)
+        
+        # Satu graph prefill per bucket + graph decode, dengan ruang untuk guard tambahan
+        limit = 2 * len(self.prompt_buckets) + 2
+        torch._dynamo.config.cache_size_limit = max(torch._dynamo.config.cache_size_limit, limit)
+        
+        self.compiled = True
+        print(f"Mode compiled aktif (mode={mode}, bucket prompt={self.prompt_buckets})")
+    
+    def _pad_to_bucket(self, inputs: Dict[str, torch.Tensor], bucket: Optional[int] = None) -> Dict[str, torch.Tensor]:
+        """
+        Left-padding prompt ke bucket panjang terdekat (atau ke bucket tertentu) untuk mode compiled
+        """
+        length = inputs['input_ids'].shape[1]
+        if bucket is None:
+            bucket = next((b for b in self.prompt_buckets if b >= length), length)
+        if bucket <= length:
+            return inputs
+        
+        pad = bucket - length
+        input_ids = torch.nn.functional.pad(inputs['input_ids'], (pad, 0), value=self.tokenizer.pad_token_id)
+        attention_mask = torch.nn.functional.pad(inputs['attention_mask'], (pad, 0), value=0)
+        return {'input_ids': input_ids, 'attention_mask': attention_mask}
+    
+    def warmup(self, max_length: int = 512, decode_steps: int = 4) -> Dict[int, float]:
+        """
+        Menjalankan generate singkat untuk setiap bucket prompt agar semua
+        graph sudah di-compile sebelum inference sebenarnya
+        
+        Args:
+            max_length: max_length yang akan dipakai saat inference (menentukan
+                ukuran static KV cache, harus sama dengan run sebenarnya)
+            decode_steps: Jumlah langkah decode per bucket
+            
+        Returns:
+            Dictionary bucket -> waktu warmup (detik)
+        """
+        if not self.compiled:
+            return {}
+        
+        base = self.tokenizer(self.build_prompt(""), return_tensors="pt")
+        timings = {}
+        
+        # Bucket terbesar lebih dulu: static cache yang sudah cukup besar dipakai
+        # ulang oleh generate, sehingga semua bucket berbagi satu ukuran cache
+        for bucket in reversed(self.prompt_buckets):
+            ids = base['input_ids'][:, -bucket:]
+            inputs = self._pad_to_bucket({'input_ids': ids, 'attention_mask': torch.ones_like(ids)}, bucket)
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            stopping_criteria = StoppingCriteriaList([NewTokenBudgetCriteria(bucket, decode_steps)])
+            
+            start_time = time.perf_counter()
+            with torch.no_grad():
+                self.model.generate(
+                    **inputs,
+                    max_new_tokens=max_length,
+                    do_sample=False,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    stopping_criteria=stopping_criteria
+                )
+            timings[bucket] = time.perf_counter() - start_time
+            print(f"Warmup bucket {bucket}: {timings[bucket]:.2f} detik")
+        
+        return timings
+    
+    def generate_summary(self, text: str, max_length: int = 512, temperature: float = 0.7,
+                         input_ids: Optional[Sequence[int]] = None,
+                         length_predictor: Optional[SummaryLengthPredictor] = None,
+                         stop_on_summary_end: bool = True,
+                         stop_on_blank_line: bool = False,
+                         return_telemetry: bool = False) -> Union[str, Tuple[str, Dict[str, Any]]]:
         """
         Generate summary untuk teks input
         
@@ -52,41 +378,100 @@ class GemmaSummarizer:
             text: Teks yang akan diringkas
             max_length: Panjang maksimal summary
             temperature: Temperature untuk sampling
+            input_ids: Token id prompt hasil pre-tokenisasi (opsional). Jika
+                diberikan, prompt tidak ditokenisasi ulang.
+            length_predictor: Predictor budget token per artikel (opsional).
+                Budget tetap dibatasi oleh max_length.
+            stop_on_summary_end: Hentikan generate pada bagian "Artikel:" baru
+            stop_on_blank_line: Hentikan generate juga pada baris kosong pertama
+                (memotong ringkasan multi-paragraf)
+            return_telemetry: Kembalikan juga telemetry inference (jumlah token,
+                waktu prefill/decode, throughput, dan kenaikan peak RSS)
             
         Returns:
-            Summary yang dihasilkan
+            Summary yang dihasilkan, atau tuple (summary, telemetry) jika
+            return_telemetry=True
         """
-        # Prompt template untuk summarization dalam bahasa Indonesia
-        prompt = f"""Berikut adalah artikel berita dalam bahasa Indonesia. Buatlah ringkasan yang singkat dan informatif dalam bahasa Indonesia.
-
-Artikel:
-{text}
-
-Ringkasan:"""
-        
-        # Tokenize input
-        inputs = self.tokenizer(prompt, return_tensors="pt", truncation=True, max_length=2048)
+        if input_ids is None:
+            # Tokenize input
+            prompt = self.build_prompt(text)
+            inputs = self.tokenizer(prompt, return_tensors="pt", truncation=True, max_length=MAX_INPUT_LENGTH)
+        else:
+            ids = torch.as_tensor(np.asarray(input_ids, dtype=np.int64)).unsqueeze(0)
+            inputs = {'input_ids': ids, 'attention_mask': torch.ones_like(ids)}
+        n_prompt_tokens = inputs['input_ids'].shape[1]
+        if self.compiled:
+            inputs = self._pad_to_bucket(inputs)
         inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        prompt_length = inputs['input_ids'].shape[1]
+        
+        max_new_tokens = max_length
+        if length_predictor is not None:
+            max_new_tokens = length_predictor.predict_tokens(len(text.split()), n_prompt_tokens, max_length)
+        
+        stop_strings = BLANK_LINE_STOP_STRINGS if stop_on_blank_line else STOP_STRINGS
+        criteria = []
+        if stop_on_summary_end:
+            criteria.append(SummaryStoppingCriteria(self.tokenizer, prompt_length, stop_strings))
+        if self.compiled:
+            # Ukuran static cache tetap (prompt bucket + max_length), budget
+            # adaptif ditegakkan lewat stopping criteria agar shape tidak berubah
+            criteria.append(NewTokenBudgetCriteria(prompt_length, max_new_tokens))
+            max_new_tokens = max_length
+        stopping_criteria = StoppingCriteriaList(criteria) if criteria else None
+        
+        synchronize = self.device == "cuda"
+        timer = FirstTokenTimer(synchronize=synchronize)
+        # Reset high-water mark agar peak yang dicatat hanya milik artikel ini
+        per_item_peak = reset_peak_rss(carry=True)
+        rss_before = current_rss_mb()
+        start_time = time.perf_counter()
         
         # Generate summary
         with torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
-                max_new_tokens=max_length,
+                max_new_tokens=max_new_tokens,
                 temperature=temperature,
                 do_sample=True,
                 pad_token_id=self.tokenizer.eos_token_id,
                 eos_token_id=self.tokenizer.eos_token_id,
-                repetition_penalty=1.1
+                repetition_penalty=1.1,
+                stopping_criteria=stopping_criteria,
+                logits_processor=LogitsProcessorList([timer])
             )
         
-        # Decode output
-        generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+        if synchronize:
+            torch.cuda.synchronize()
+        end_time = time.perf_counter()
         
-        # Extract summary (hapus prompt)
-        summary = generated_text[len(prompt):].strip()
+        # Decode hanya token baru (tanpa prompt)
+        summary = self.tokenizer.decode(outputs[0][prompt_length:], skip_special_tokens=True)
+        if stop_on_summary_end:
+            summary = truncate_at_stop_strings(summary, stop_strings)
+        else:
+            summary = summary.strip()
+        
+        if not return_telemetry:
+            return summary
         
-        return summary
+        generated_tokens = int(outputs.shape[1] - prompt_length)
+        peak = peak_rss_since_reset_mb() if per_item_peak else None
+        first_token_time = timer.first_token_time or end_time
+        decode_time = end_time - first_token_time
+        telemetry = {
+            'prompt_tokens': int(n_prompt_tokens),
+            'generated_tokens': generated_tokens,
+            'prefill_time': first_token_time - start_time,
+            'decode_time': decode_time,
+            'total_time': end_time - start_time,
+            # Token pertama dihasilkan oleh prefill, sisanya oleh langkah decode
+            'tokens_per_sec': (generated_tokens - 1) / decode_time if decode_time > 0 and generated_tokens > 1 else 0.0,
+            # None jika peak per item tidak dapat diukur (bukan 0 palsu)
+            'peak_rss_delta_mb': peak - rss_before if peak is not None and rss_before is not None else None
+        }
+        
+        return summary, telemetry
     
     def batch_summarize(self, texts: List[str], max_length: int = 512, temperature: float = 0.7) -> List[str]:
         """
@@ -112,7 +497,32 @@ Ringkasan:"""
                 
         return summaries
     
-    def summarize_dataset(self, dataset: List[Dict[str, Any]], max_length: int = 512, temperature: float = 0.7) -> List[Dict[str, Any]]:
+    def pretokenize_dataset(self, dataset: List[Dict[str, Any]], cache_dir: str) -> TokenizedCorpusStore:
+        """
+        Pre-tokenisasi prompt seluruh dataset ke token store di disk
+        
+        Args:
+            dataset: Dataset yang berisi field 'id' dan 'text'
+            cache_dir: Direktori root token store
+            
+        Returns:
+            Token store yang berisi token id prompt per artikel
+        """
+        store = TokenizedCorpusStore(
+            cache_dir=cache_dir,
+            tokenizer_name=self.model_name,
+            revision=self.revision,
+            max_length=MAX_INPUT_LENGTH
+        )
+        n_new = store.build(dataset, self.tokenizer, self.build_prompt)
+        print(f"Token store: {len(store)} artikel ({n_new} baru ditokenisasi)")
+        return store
+    
+    def summarize_dataset(self, dataset: List[Dict[str, Any]], max_length: int = 512, temperature: float = 0.7,
+                          token_store: Optional[TokenizedCorpusStore] = None,
+                          length_predictor: Optional[SummaryLengthPredictor] = None,
+                          stop_on_summary_end: bool = True,
+                          stop_on_blank_line: bool = False) -> List[Dict[str, Any]]:
         """
         Generate summary untuk seluruh dataset
         
@@ -120,33 +530,74 @@ Ringkasan:"""
             dataset: Dataset yang berisi teks berita
             max_length: Panjang maksimal summary
             temperature: Temperature untuk sampling
+            token_store: Token store hasil pretokenize_dataset (opsional)
+            length_predictor: Predictor budget token per artikel (opsional)
+            stop_on_summary_end: Hentikan generate pada akhir ringkasan
+            stop_on_blank_line: Anggap baris kosong pertama sebagai akhir ringkasan
             
         Returns:
             Dataset dengan summary yang dihasilkan
         """
-        results = []
+        return list(self.iter_summaries(
+            dataset,
+            max_length=max_length,
+            temperature=temperature,
+            token_store=token_store,
+            length_predictor=length_predictor,
+            stop_on_summary_end=stop_on_summary_end,
+            stop_on_blank_line=stop_on_blank_line
+        ))
+    
+    def iter_summaries(self, dataset: List[Dict[str, Any]], max_length: int = 512, temperature: float = 0.7,
+                       token_store: Optional[TokenizedCorpusStore] = None,
+                       length_predictor: Optional[SummaryLengthPredictor] = None,
+                       stop_on_summary_end: bool = True,
+                       stop_on_blank_line: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Generate summary per artikel dan mengembalikan hasilnya satu per satu
         
+        Dipakai untuk evaluasi streaming: setiap hasil dapat langsung
+        diskor tanpa menunggu seluruh dataset selesai di-generate.
+        
+        Args:
+            dataset: Dataset yang berisi teks berita
+            max_length: Panjang maksimal summary
+            temperature: Temperature untuk sampling
+            token_store: Token store hasil pretokenize_dataset (opsional)
+            length_predictor: Predictor budget token per artikel (opsional)
+            stop_on_summary_end: Hentikan generate pada akhir ringkasan
+            stop_on_blank_line: Anggap baris kosong pertama sebagai akhir ringkasan
+            
+        Yields:
+            Item dataset dengan field 'generated_summary' dan 'telemetry'
+        """
         for item in tqdm(dataset, desc="Processing dataset"):
             try:
                 # Generate summary
-                generated_summary = self.generate_summary(
+                input_ids = token_store.get(item['id']) if token_store is not None else None
+                generated_summary, telemetry = self.generate_summary(
                     item['text'], 
                     max_length=max_length, 
-                    temperature=temperature
+                    temperature=temperature,
+                    input_ids=input_ids,
+                    length_predictor=length_predictor,
+                    stop_on_summary_end=stop_on_summary_end,
+                    stop_on_blank_line=stop_on_blank_line,
+                    return_telemetry=True
                 )
                 
                 # Tambahkan hasil ke item
                 result_item = item.copy()
                 result_item['generated_summary'] = generated_summary
-                results.append(result_item)
+                result_item['telemetry'] = telemetry
                 
             except Exception as e:
                 print(f"Error processing item {item.get('id', 'unknown')}: {e}")
                 result_item = item.copy()
                 result_item['generated_summary'] = ""
-                results.append(result_item)
-                
-        return results
+                result_item['telemetry'] = None
+            
+            yield result_item
     
     def clean_summary(self, summary: str) -> str:
         """
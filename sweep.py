@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Script sweep beberapa konfigurasi decoding (dan beberapa model) untuk evaluasi
+text summarization. Dataset dimuat sekali dan setiap model dimuat sekali,
+lalu semua konfigurasi dijalankan pada sampel artikel yang sama. Summary
+semua konfigurasi satu model di-generate terlebih dahulu; model dibebaskan
+sebelum evaluasi sehingga model summarizer dan model BERTScore tidak pernah
+resident bersamaan.
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+import itertools
+from typing import List, Dict, Any, Tuple
+
+import pandas as pd
+
+from data_loader import NewsDatasetLoader
+from summarizer import GemmaSummarizer, SummaryLengthPredictor
+from telemetry import aggregate_telemetry
+from main import (load_dataset, sample_dataset, evaluate_and_save, build_evaluator,
+                  add_evaluator_arguments, evaluator_config)
+
+# Parameter decoding yang dapat di-sweep beserta nilai default-nya
+DECODING_DEFAULTS = {
+    'temperature': 0.7,
+    'max_length': 512,
+    'adaptive_length': False,
+    'length_quantile': 0.95,
+    'stop_on_summary_end': True,
+    'stop_on_blank_line': False
+}
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Membuat semua kombinasi dari grid parameter
+
+    Args:
+        grid: Dictionary nama parameter -> list nilai
+
+    Returns:
+        List konfigurasi decoding
+    """
+    keys = list(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def load_sweep_spec(path: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Memuat spesifikasi sweep dari file JSON
+
+    Format yang didukung::
+
+        {"models": ["google/gemma2-9b"], "grid": {"temperature": [0.3, 0.7], "max_length": [256, 512]}}
+        {"models": ["google/gemma2-9b"], "configs": [{"temperature": 0.3}, {"temperature": 0.7, "max_length": 256}]}
+
+    Args:
+        path: Path ke file JSON
+
+    Returns:
+        Tuple (list nama model, list konfigurasi decoding)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    configs = list(spec.get('configs', []))
+    if 'grid' in spec:
+        configs.extend(expand_grid(spec['grid']))
+
+    return spec.get('models', []), configs
+
+
+def config_name(decoding: Dict[str, Any]) -> str:
+    """
+    Membuat nama direktori yang stabil untuk satu konfigurasi decoding
+    """
+    parts = []
+    for key in sorted(decoding):
+        if decoding[key] == DECODING_DEFAULTS.get(key):
+            continue
+        parts.append(f"{key}-{decoding[key]}")
+    return "_".join(parts) or "default"
+
+
+def model_slug(model_name: str) -> str:
+    return re.sub(r'[^\w\-.]', '_', model_name)
+
+
+def run_sweep(base_config: Dict[str, Any], model_names: List[str],
+              decoding_configs: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Menjalankan semua konfigurasi decoding untuk setiap model
+
+    Args:
+        base_config: Konfigurasi umum (data_dir, device, sample_size, output_dir,
+            opsi evaluator dari evaluator_config, ...)
+        model_names: Model yang dijalankan secara berurutan
+        decoding_configs: Konfigurasi decoding yang dijalankan per model
+
+    Returns:
+        DataFrame perbandingan seluruh konfigurasi
+    """
+    # 1. Load dataset sekali
+    print("\n1. MEMUAT DATASET")
+    print("-" * 30)
+
+    data_loader = NewsDatasetLoader(data_dir=base_config['data_dir'])
+    processed_data = load_dataset(data_loader, base_config['data_dir'])
+    if processed_data is None:
+        return pd.DataFrame()
+
+    # 2. Sampel yang sama untuk semua konfigurasi
+    print("\n2. SAMPLING DATA")
+    print("-" * 30)
+
+    evaluation_data = sample_dataset(processed_data, base_config['sample_size'])
+
+    evaluator = build_evaluator(base_config)
+    length_predictors: Dict[float, SummaryLengthPredictor] = {}
+    rows = []
+
+    for model_name in model_names:
+        # 3. Load model sekali per model
+        print("\n3. INISIALISASI MODEL")
+        print("-" * 30)
+
+        try:
+            summarizer = GemmaSummarizer(
+                model_name=model_name,
+                device=base_config['device'],
+                revision=base_config['revision']
+            )
+        except Exception as e:
+            print(f"Error saat inisialisasi model {model_name}: {e}")
+            continue
+
+        token_store = None
+        if base_config['token_cache_dir']:
+            token_store = summarizer.pretokenize_dataset(evaluation_data, base_config['token_cache_dir'])
+
+        # 4. Generate summaries untuk semua konfigurasi dengan model ini
+        generated = []
+        for i, overrides in enumerate(decoding_configs, 1):
+            decoding = {**DECODING_DEFAULTS, **overrides}
+            name = config_name(decoding)
+            run_config = {
+                **base_config,
+                **decoding,
+                'model_name': model_name,
+                'output_dir': os.path.join(base_config['output_dir'], model_slug(model_name), name)
+            }
+
+            print("\n" + "=" * 60)
+            print(f"KONFIGURASI {i}/{len(decoding_configs)}: {model_name} [{name}]")
+            print("=" * 60)
+
+            length_predictor = None
+            if decoding['adaptive_length']:
+                quantile = decoding['length_quantile']
+                if quantile not in length_predictors:
+                    length_predictors[quantile] = SummaryLengthPredictor(quantile=quantile).fit(processed_data)
+                length_predictor = length_predictors[quantile]
+
+            print("\n4. GENERATE SUMMARIES")
+            print("-" * 30)
+
+            start_time = time.perf_counter()
+            try:
+                results_with_summaries = summarizer.summarize_dataset(
+                    dataset=evaluation_data,
+                    max_length=decoding['max_length'],
+                    temperature=decoding['temperature'],
+                    token_store=token_store,
+                    length_predictor=length_predictor,
+                    stop_on_summary_end=decoding['stop_on_summary_end'],
+                    stop_on_blank_line=decoding['stop_on_blank_line']
+                )
+            except Exception as e:
+                print(f"Error saat generate summaries: {e}")
+                continue
+            generated.append((name, decoding, run_config, results_with_summaries,
+                              time.perf_counter() - start_time))
+
+        # Model summarizer dibebaskan sebelum model BERTScore dimuat saat evaluasi;
+        # model berikutnya dimuat ulang pada iterasi selanjutnya
+        summarizer.release()
+        del summarizer
+
+        # 5-7. Evaluasi dan simpan ke direktori per konfigurasi
+        for name, decoding, run_config, results_with_summaries, generation_time in generated:
+            print("\n" + "=" * 60)
+            print(f"EVALUASI: {model_name} [{name}]")
+            print("=" * 60)
+
+            evaluation_results = evaluate_and_save(
+                run_config, evaluation_data, results_with_summaries, evaluator
+            )
+
+            telemetry = aggregate_telemetry(results_with_summaries).get('overall', {})
+            rows.append({
+                'model_name': model_name,
+                'config': name,
+                **decoding,
+                **evaluation_results['summary'],
+                'generation_time': generation_time,
+                'generated_tokens_mean': telemetry.get('generated_tokens', {}).get('mean'),
+                'tokens_per_sec_p50': telemetry.get('tokens_per_sec', {}).get('p50'),
+                'output_dir': run_config['output_dir']
+            })
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    """
+    Fungsi utama untuk menjalankan sweep konfigurasi
+    """
+    parser = argparse.ArgumentParser(description='Sweep konfigurasi decoding untuk Text Summarization')
+    parser.add_argument('--data_dir', type=str, default='data',
+                       help='Direktori yang berisi file dataset train.XX.jsonl')
+    parser.add_argument('--sweep_config', type=str, default=None,
+                       help='File JSON berisi "models" dan "grid" atau "configs"')
+    parser.add_argument('--model_names', type=str, nargs='+', default=None,
+                       help='Satu atau beberapa model (dijalankan berurutan)')
+    parser.add_argument('--temperatures', type=float, nargs='+', default=None,
+                       help='Nilai temperature untuk grid')
+    parser.add_argument('--max_lengths', type=int, nargs='+', default=None,
+                       help='Nilai max_length untuk grid')
+    parser.add_argument('--device', type=str, default=None,
+                       help='Device untuk inference (cuda/cpu)')
+    parser.add_argument('--revision', type=str, default=None,
+                       help='Revisi model/tokenizer di HuggingFace Hub')
+    parser.add_argument('--sample_size', type=int, default=None,
+                       help='Jumlah sampel untuk evaluasi (None untuk semua)')
+    parser.add_argument('--output_dir', type=str, default='results/sweep',
+                       help='Direktori untuk menyimpan hasil sweep')
+    parser.add_argument('--token_cache_dir', type=str, default='cache/tokens',
+                       help='Direktori token store hasil pre-tokenisasi prompt')
+    parser.add_argument('--no_token_cache', action='store_true',
+                       help='Nonaktifkan pre-tokenisasi')
+    add_evaluator_arguments(parser)
+    parser.add_argument('--results_db', type=str, default='results/results.db',
+                       help='Database SQLite hasil lintas run ("" untuk menonaktifkan)')
+
+    args = parser.parse_args()
+
+    model_names, decoding_configs = [], []
+    if args.sweep_config:
+        model_names, decoding_configs = load_sweep_spec(args.sweep_config)
+
+    grid = {}
+    if args.temperatures:
+        grid['temperature'] = args.temperatures
+    if args.max_lengths:
+        grid['max_length'] = args.max_lengths
+    if grid:
+        decoding_configs.extend(expand_grid(grid))
+
+    model_names = args.model_names or model_names or ['google/gemma2-9b']
+    decoding_configs = decoding_configs or [{}]
+
+    base_config = {
+        'data_dir': args.data_dir,
+        'device': args.device,
+        'revision': args.revision,
+        'sample_size': args.sample_size,
+        'output_dir': args.output_dir,
+        'token_cache_dir': None if args.no_token_cache else args.token_cache_dir,
+        **evaluator_config(args),
+        'results_db': args.results_db
+    }
+
+    print("=" * 60)
+    print(f"SWEEP {len(model_names)} MODEL x {len(decoding_configs)} KONFIGURASI")
+    print("=" * 60)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    comparison = run_sweep(base_config, model_names, decoding_configs)
+
+    if comparison.empty:
+        print("Tidak ada konfigurasi yang berhasil dijalankan")
+        return
+
+    comparison_path = os.path.join(args.output_dir, 'sweep_comparison.csv')
+    comparison.to_csv(comparison_path, index=False)
+    comparison.to_json(os.path.join(args.output_dir, 'sweep_comparison.json'),
+                       orient='records', indent=2, force_ascii=False)
+
+    print("\n" + "=" * 60)
+    print("PERBANDINGAN KONFIGURASI")
+    print("=" * 60)
+    columns = ['model_name', 'config', 'rouge1', 'rouge2', 'rougeL', 'bleu', 'bertscore_f1', 'generation_time']
+    print(comparison[columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\nTabel perbandingan tersimpan di: {comparison_path}")
+
+
+if __name__ == "__main__":
+    main()
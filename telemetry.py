@@ -0,0 +1,268 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Sequence, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Field telemetry per item yang diagregasi menjadi persentil
+TELEMETRY_FIELDS = [
+    'prompt_tokens',
+    'generated_tokens',
+    'prefill_time',
+    'decode_time',
+    'total_time',
+    'tokens_per_sec',
+    'peak_rss_delta_mb'
+]
+
+# Batas bucket panjang artikel (dalam kata)
+LENGTH_BUCKETS = [0, 200, 400, 800, 1600]
+
+
+# High-water mark yang sudah di-reset oleh pengukuran per item selama stage berjalan
+_carried_peak_mb = 0.0
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Mengembalikan peak resident set size proses saat ini dalam MB
+
+    Returns:
+        Peak RSS (high-water mark) dalam MB, atau None jika tidak dapat dibaca
+    """
+    if resource is None:
+        if psutil is None:
+            return None
+        memory = psutil.Process().memory_info()
+        # peak_wset hanya tersedia di Windows
+        return getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam byte di macOS dan dalam KB di Linux
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    Mengembalikan resident set size proses saat ini dalam MB (Linux; di
+    platform lain memakai psutil atau peak RSS)
+    """
+    rss = _proc_status_mb('VmRSS')
+    if rss is None and psutil is not None:
+        rss = psutil.Process().memory_info().rss / (1024 * 1024)
+    return rss if rss is not None else peak_rss_mb()
+
+
+def reset_peak_rss(carry: bool = False) -> bool:
+    """
+    Me-reset high-water mark RSS proses (Linux >= 4.0, /proc/self/clear_refs)
+
+    Args:
+        carry: Simpan high-water mark sebelum reset, agar peak stage yang
+            sedang dicatat StageMemoryTracker tidak hilang (untuk pengukuran
+            per item di dalam stage)
+
+    Returns:
+        True jika berhasil; jika tidak, peak RSS mencakup seluruh umur proses
+    """
+    global _carried_peak_mb
+    peak = _proc_status_mb('VmHWM') if carry else None
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    _carried_peak_mb = max(_carried_peak_mb, peak or 0.0) if carry else 0.0
+    return True
+
+
+def peak_rss_since_reset_mb() -> Optional[float]:
+    """
+    Mengembalikan high-water mark RSS sejak reset_peak_rss terakhir dalam MB
+
+    Returns:
+        Peak RSS dalam MB, atau None jika tidak tersedia (di luar Linux)
+    """
+    return _proc_status_mb('VmHWM')
+
+
+def children_peak_rss_mb() -> float:
+    """
+    Mengembalikan peak RSS terbesar dari subprocess yang sudah selesai dalam MB
+    (0 jika tidak tersedia)
+    """
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class StageMemoryTracker:
+    """
+    Mencatat durasi dan peak memori per stage pipeline
+
+    Di awal setiap stage high-water mark RSS di-reset, sehingga peak yang
+    dicatat hanya milik stage tersebut. Peak subprocess (misalnya BERTScore
+    terisolasi) dicatat terpisah jika bertambah selama stage.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Context manager untuk satu stage
+
+        Args:
+            name: Nama stage
+        """
+        per_stage = reset_peak_rss()
+        children_before = children_peak_rss_mb()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            peak = peak_rss_since_reset_mb() if per_stage else None
+            if peak is not None:
+                peak = max(peak, _carried_peak_mb)
+            children_after = children_peak_rss_mb()
+            self.stages[name] = {
+                'duration': time.perf_counter() - start_time,
+                'peak_rss_mb': peak if peak is not None else peak_rss_mb(),
+                'end_rss_mb': current_rss_mb(),
+                'peak_is_per_stage': per_stage,
+                'subprocess_peak_rss_mb': children_after if children_after > children_before else None
+            }
+
+    def print_report(self):
+        """
+        Mencetak durasi dan peak memori setiap stage
+        """
+        for name, stats in self.stages.items():
+            peak = stats['peak_rss_mb']
+            line = f"  {name}: {stats['duration']:.2f} detik, peak RSS " + (f"{peak:.0f} MB" if peak is not None else "n/a")
+            if stats['subprocess_peak_rss_mb'] is not None:
+                line += f", subprocess {stats['subprocess_peak_rss_mb']:.0f} MB"
+            print(line)
+
+
+def available_memory_mb() -> Optional[float]:
+    """
+    Mengembalikan memori yang masih tersedia untuk proses baru dalam MB
+
+    Di Linux memakai MemAvailable dari /proc/meminfo (termasuk page cache
+    yang dapat dibebaskan); di platform lain memakai psutil.
+
+    Returns:
+        Memori tersedia dalam MB, atau None jika tidak dapat dibaca
+    """
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if psutil is not None:
+        return psutil.virtual_memory().available / (1024 * 1024)
+    return None
+
+
+def length_bucket(n_words: int, edges: Sequence[int] = LENGTH_BUCKETS) -> str:
+    """
+    Mengembalikan label bucket panjang artikel, misalnya "200-399"
+
+    Args:
+        n_words: Jumlah kata artikel
+        edges: Batas bawah setiap bucket (terurut naik)
+
+    Returns:
+        Label bucket
+    """
+    idx = int(np.searchsorted(edges, n_words, side='right')) - 1
+    idx = max(idx, 0)
+    if idx == len(edges) - 1:
+        return f"{edges[idx]}+"
+    return f"{edges[idx]}-{edges[idx + 1] - 1}"
+
+
+def _percentiles(values: np.ndarray, percentiles: Sequence[int]) -> Dict[str, float]:
+    stats = {f'p{p}': float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+    stats['mean'] = float(values.mean())
+    return stats
+
+
+def _aggregate_rows(rows: List[Dict[str, Any]], percentiles: Sequence[int]) -> Dict[str, Any]:
+    summary = {'count': len(rows)}
+    for field in TELEMETRY_FIELDS:
+        values = np.array([row[field] for row in rows if row.get(field) is not None], dtype=np.float64)
+        if values.size:
+            summary[field] = _percentiles(values, percentiles)
+    return summary
+
+
+def aggregate_telemetry(results: List[Dict[str, Any]], percentiles: Sequence[int] = (50, 90, 99)) -> Dict[str, Any]:
+    """
+    Mengagregasi telemetry per item menjadi persentil
+
+    Agregasi dilakukan untuk keseluruhan dataset, per kategori, dan per
+    bucket panjang artikel.
+
+    Args:
+        results: Dataset hasil summarize_dataset (item berisi field 'telemetry')
+        percentiles: Persentil yang dihitung
+
+    Returns:
+        Dictionary berisi ringkasan telemetry
+    """
+    rows = []
+    for item in results:
+        telemetry = item.get('telemetry')
+        if not telemetry:
+            continue
+        rows.append((item.get('category', 'unknown'), length_bucket(len(item['text'].split())), telemetry))
+
+    if not rows:
+        return {}
+
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    by_length: Dict[str, List[Dict[str, Any]]] = {}
+    for category, bucket, telemetry in rows:
+        by_category.setdefault(category, []).append(telemetry)
+        by_length.setdefault(bucket, []).append(telemetry)
+
+    return {
+        'overall': _aggregate_rows([telemetry for _, _, telemetry in rows], percentiles),
+        'by_category': {key: _aggregate_rows(value, percentiles) for key, value in sorted(by_category.items())},
+        'by_length_bucket': {
+            key: _aggregate_rows(value, percentiles)
+            for key, value in sorted(by_length.items(), key=lambda kv: int(kv[0].split('-')[0].rstrip('+')))
+        }
+    }
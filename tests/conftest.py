@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul proyek berada di root repository (tanpa package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
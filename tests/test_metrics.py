@@ -0,0 +1,91 @@
+"""
+Regresi metrik: engine ROUGE native dan paralel terhadap rouge_score, serta
+BLEU dari statistik cukup terhadap sacrebleu.corpus_bleu
+"""
+
+import numpy as np
+import pytest
+from sacrebleu import corpus_bleu
+
+from evaluator import ROUGE_TYPES, NativeRougeScorer, SummarizationEvaluator, create_rouge_scorer
+
+# Sampel tetap berbahasa Indonesia, termasuk input kosong dan satu token
+SAMPLE = [
+    ("Presiden Joko Widodo meresmikan jalan tol Trans-Jawa pada Senin (20/12).",
+     "Jokowi meresmikan jalan tol Trans-Jawa hari Senin."),
+    ("Harga beras naik menjadi Rp 12.500 per kilogram di pasar tradisional.",
+     "Harga beras di pasar tradisional naik menjadi Rp 12.500 per kilogram."),
+    ("Anak-anak bermain bola di lapangan desa setiap sore.",
+     "Setiap sore anak-anak bermain di lapangan."),
+    ("Banjir merendam ratusan rumah warga di Jakarta Timur.",
+     "Ratusan rumah di Jakarta Timur terendam banjir, warga mengungsi ke masjid."),
+    ("Gempa berkekuatan 5,6 SR mengguncang Cianjur.", "gempa"),
+    ("Tim nasional menang 2-0 atas Vietnam.", "menang"),
+    ("kata", "kata"),
+    ("rumah", "mobil"),
+    ("Pemerintah menaikkan harga BBM bersubsidi.", ""),
+    ("", "Ringkasan tanpa reference."),
+    ("", ""),
+    ("Menteri Keuangan Sri Mulyani menyampaikan APBN 2023 defisit 2,8 persen.",
+     "Menteri Keuangan menyampaikan defisit APBN 2023 sebesar 2,8 persen; defisit lebih rendah dari target."),
+]
+REFERENCES = [reference for reference, _ in SAMPLE]
+PREDICTIONS = [prediction for _, prediction in SAMPLE]
+
+
+@pytest.mark.parametrize("tokenizer,stemmer", [
+    ('rouge_score', 'porter'),
+    ('rouge_score', None),
+    ('indonesian', None),
+])
+def test_native_rouge_matches_rouge_score(tokenizer, stemmer):
+    reference_scorer = create_rouge_scorer('rouge_score', tokenizer, stemmer)
+    native_scorer = create_rouge_scorer('native', tokenizer, stemmer)
+    assert isinstance(native_scorer, NativeRougeScorer)
+
+    for reference, prediction in SAMPLE:
+        expected = reference_scorer.score(reference, prediction)
+        actual = native_scorer.score(reference, prediction)
+        for rouge_type in ROUGE_TYPES:
+            np.testing.assert_allclose(tuple(actual[rouge_type]), tuple(expected[rouge_type]), atol=1e-12,
+                                       err_msg=f"{rouge_type}: {reference!r} / {prediction!r}")
+
+
+@pytest.mark.parametrize("engine", ['rouge_score', 'native'])
+def test_parallel_rouge_matches_serial(engine):
+    serial = SummarizationEvaluator(engine=engine, n_jobs=1)
+    parallel = SummarizationEvaluator(engine=engine, n_jobs=2, chunk_size=3)
+
+    np.testing.assert_array_equal(parallel.score_rouge_pairs(REFERENCES, PREDICTIONS),
+                                  serial.score_rouge_pairs(REFERENCES, PREDICTIONS))
+
+
+def _sacrebleu(references, predictions):
+    # Sama seperti evaluator: prediksi kosong tidak ikut dihitung
+    pairs = [(reference, prediction) for reference, prediction in zip(references, predictions) if prediction.strip()]
+    return corpus_bleu([prediction for _, prediction in pairs], [[reference for reference, _ in pairs]])
+
+
+@pytest.mark.parametrize("indices", [
+    list(range(len(SAMPLE))),
+    [4, 5],
+    [6],
+    [7],
+    [11],
+])
+def test_corpus_bleu_matches_sacrebleu(indices):
+    references = [REFERENCES[i] for i in indices]
+    predictions = [PREDICTIONS[i] for i in indices]
+
+    actual = SummarizationEvaluator().calculate_bleu_score(references, predictions)
+    expected = _sacrebleu(references, predictions)
+
+    assert actual['bleu'] == pytest.approx(expected.score, abs=1e-9)
+    np.testing.assert_allclose(actual['bleu_details']['precisions'], expected.precisions, atol=1e-9)
+    assert actual['bleu_details']['bp'] == pytest.approx(expected.bp, abs=1e-12)
+    assert actual['bleu_details']['sys_len'] == expected.sys_len
+    assert actual['bleu_details']['ref_len'] == expected.ref_len
+
+
+def test_bleu_without_predictions_is_zero():
+    assert SummarizationEvaluator().calculate_bleu_score(["Banjir di Jakarta."], [""]) == {'bleu': 0.0}
@@ -0,0 +1,137 @@
+import re
+import unicodedata
+from typing import List, Dict, Optional
+
+from nltk.stem import porter
+from rouge_score import tokenize as rouge_tokenize
+
+# Tokenizer yang dapat dipakai untuk ROUGE
+TOKENIZERS = ('indonesian', 'rouge_score')
+
+# Stemmer opsional; 'sastrawi' membutuhkan package PySastrawi
+STEMMERS = ('porter', 'sastrawi')
+
+# Stemmer default per tokenizer. rouge_score + porter sama dengan
+# RougeScorer(use_stemmer=True), yaitu konfigurasi skor run historis;
+# tokenizer indonesian (opt-in) dipakai tanpa stemmer
+DEFAULT_STEMMERS = {'rouge_score': 'porter', 'indonesian': None}
+
+# Angka dengan pemisah ribuan/desimal ("1.500", "2,5") dan kata yang dapat
+# berisi tanda hubung (reduplikasi "anak-anak", "covid-19") dipertahankan utuh
+INDONESIAN_TOKEN_RE = re.compile(r"\d+(?:[.,]\d+)*|[^\W_]+(?:-[^\W_]+)*")
+
+
+class MemoizedStemmer:
+    """
+    Stemmer dengan cache hasil stemming per kata
+
+    Korpus berita memiliki kosakata yang relatif kecil dibanding jumlah token,
+    sehingga setiap kata cukup di-stem sekali.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: 'porter' (nltk) atau 'sastrawi' (stemmer bahasa Indonesia)
+        """
+        if name == 'porter':
+            self._stem = porter.PorterStemmer().stem
+        elif name == 'sastrawi':
+            try:
+                from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+            except ImportError as e:
+                raise ImportError(
+                    "Stemmer 'sastrawi' membutuhkan package PySastrawi (pip install PySastrawi)"
+                ) from e
+            self._stem = StemmerFactory().create_stemmer().stem
+        else:
+            raise ValueError(f"Stemmer tidak dikenal: {name}. Pilihan: {STEMMERS}")
+        self.name = name
+        self._cache: Dict[str, str] = {}
+
+    def stem(self, word: str) -> str:
+        stem = self._cache.get(word)
+        if stem is None:
+            stem = self._cache[word] = self._stem(word)
+        return stem
+
+
+class IndonesianTokenizer:
+    """
+    Tokenizer untuk teks berita berbahasa Indonesia
+
+    Teks dinormalisasi (NFKC, huruf kecil), lalu dipecah menjadi kata dan
+    angka. Berbeda dengan tokenizer rouge_score, kata bertanda hubung dan
+    angka berpemisah tidak dipecah, dan stemming bersifat opsional.
+    """
+
+    def __init__(self, stemmer: Optional[str] = None):
+        """
+        Args:
+            stemmer: None, 'sastrawi', atau 'porter'
+        """
+        self.stemmer = MemoizedStemmer(stemmer) if stemmer else None
+
+    def tokenize(self, text: str) -> List[str]:
+        text = unicodedata.normalize('NFKC', text).lower()
+        tokens = INDONESIAN_TOKEN_RE.findall(text)
+        if self.stemmer:
+            tokens = [token if token[0].isdigit() else self.stemmer.stem(token) for token in tokens]
+        return tokens
+
+
+class RougeScoreTokenizer:
+    """
+    Tokenisasi identik dengan rouge_score.tokenize.tokenize, dengan stemmer
+    yang di-memoize
+    """
+
+    def __init__(self, stemmer: Optional[str] = None):
+        """
+        Args:
+            stemmer: None, 'porter' (sama dengan use_stemmer=True), atau 'sastrawi'
+        """
+        self.stemmer = MemoizedStemmer(stemmer) if stemmer else None
+
+    def tokenize(self, text: str) -> List[str]:
+        text = rouge_tokenize.NON_ALPHANUM_RE.sub(" ", text.lower())
+        tokens = rouge_tokenize.SPACES_RE.split(text)
+        if self.stemmer:
+            # Hanya kata lebih dari 3 karakter yang di-stem
+            tokens = [self.stemmer.stem(token) if len(token) > 3 else token for token in tokens]
+        return [token for token in tokens if rouge_tokenize.VALID_TOKEN_RE.match(token)]
+
+
+def resolve_stemmer(tokenizer: str, stemmer: Optional[str]) -> Optional[str]:
+    """
+    Menentukan stemmer efektif dari opsi command line
+
+    Args:
+        tokenizer: Nama tokenizer ROUGE
+        stemmer: None untuk default tokenizer (DEFAULT_STEMMERS), 'none' untuk
+            tanpa stemmer, atau nama stemmer
+
+    Returns:
+        Nama stemmer atau None
+    """
+    if stemmer is None:
+        return DEFAULT_STEMMERS[tokenizer]
+    return None if stemmer == 'none' else stemmer
+
+
+def create_tokenizer(name: str = 'rouge_score', stemmer: Optional[str] = None):
+    """
+    Membuat tokenizer untuk metrik berbasis token
+
+    Args:
+        name: 'rouge_score' atau 'indonesian'
+        stemmer: None, 'sastrawi', atau 'porter'
+
+    Returns:
+        Tokenizer dengan method tokenize(text) (kompatibel dengan rouge_score)
+    """
+    if name == 'indonesian':
+        return IndonesianTokenizer(stemmer)
+    if name == 'rouge_score':
+        return RougeScoreTokenizer(stemmer)
+    raise ValueError(f"Tokenizer tidak dikenal: {name}. Pilihan: {TOKENIZERS}")
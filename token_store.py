@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import re
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from tqdm import tqdm
+
+# Porsi token dari baris usang (prompt yang sudah berubah) yang memicu compaction
+COMPACT_STALE_FRACTION = 0.25
+
+
+class TokenizedCorpusStore:
+    """
+    Class untuk menyimpan token id prompt per artikel agar tidak perlu
+    ditokenisasi ulang di setiap run atau sweep.
+
+    Token id seluruh artikel disimpan sebagai satu array NumPy datar
+    (`tokens.npy`) beserta array offset (`offsets.npy`), sehingga token
+    artikel ke-i adalah `tokens[offsets[i]:offsets[i + 1]]`. Setiap store
+    dipisahkan per nama dan revisi tokenizer. Artikel yang prompt-nya
+    berubah ditambahkan sebagai baris baru; baris lama dibuang oleh
+    compact() begitu porsinya melewati COMPACT_STALE_FRACTION.
+    """
+
+    def __init__(self, cache_dir: str, tokenizer_name: str, revision: Optional[str] = None,
+                 max_length: int = 2048):
+        """
+        Inisialisasi token store
+
+        Args:
+            cache_dir: Direktori root untuk menyimpan token store
+            tokenizer_name: Nama tokenizer (biasanya sama dengan nama model)
+            revision: Revisi tokenizer (branch, tag, atau commit hash)
+            max_length: Panjang maksimal prompt dalam token (truncation)
+        """
+        self.tokenizer_name = tokenizer_name
+        self.revision = revision or "main"
+        self.max_length = max_length
+
+        key = re.sub(r'[^\w\-.]', '_', f"{tokenizer_name}@{self.revision}")
+        self.store_dir = os.path.join(cache_dir, key)
+
+        self._index: Dict[str, int] = {}
+        self._row_ids: List[str] = []
+        self._digests: List[str] = []
+        self._tokens = np.zeros(0, dtype=np.int32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, article_id: str) -> bool:
+        return article_id in self._index
+
+    @staticmethod
+    def _digest(prompt: str) -> str:
+        return hashlib.sha1(prompt.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        """
+        Memuat token store dari disk jika sudah ada
+        """
+        index_path = os.path.join(self.store_dir, 'index.json')
+        if not os.path.exists(index_path):
+            return
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+        if index.get('max_length') != self.max_length:
+            print(f"Token store {self.store_dir} dibuat dengan max_length berbeda, diabaikan")
+            return
+
+        tokens = np.load(os.path.join(self.store_dir, 'tokens.npy'), mmap_mode='r')
+        offsets = np.load(os.path.join(self.store_dir, 'offsets.npy'))
+        if len(offsets) != len(index['ids']) + 1 or len(tokens) != int(offsets[-1]):
+            # Save dari proses lain sedang berlangsung (index.json diganti terakhir)
+            print(f"Token store {self.store_dir} tidak konsisten, diabaikan")
+            return
+
+        self._row_ids = index['ids']
+        # Baris yang lebih baru menimpa baris lama untuk artikel yang sama
+        self._index = {article_id: row for row, article_id in enumerate(self._row_ids)}
+        self._digests = index['digests']
+        self._tokens = tokens
+        self._offsets = offsets
+
+    def save(self):
+        """
+        Menyimpan token store ke disk
+
+        Setiap file ditulis ke file .tmp lalu dipindahkan dengan os.replace,
+        dengan index.json terakhir. tokens.npy yang sedang di-memory-map
+        (self._tokens) tidak pernah ditimpa di tempat, dan store setengah
+        jadi tidak pernah terbaca.
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        paths = []
+        for name, array in (('tokens.npy', np.asarray(self._tokens, dtype=np.int32)),
+                            ('offsets.npy', self._offsets)):
+            path = os.path.join(self.store_dir, name)
+            with open(f"{path}.tmp", 'wb') as f:
+                np.save(f, array)
+            paths.append(path)
+
+        index = {
+            'tokenizer_name': self.tokenizer_name,
+            'revision': self.revision,
+            'max_length': self.max_length,
+            'ids': self._row_ids,
+            'digests': self._digests
+        }
+        index_path = os.path.join(self.store_dir, 'index.json')
+        with open(f"{index_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        paths.append(index_path)
+
+        for path in paths:
+            os.replace(f"{path}.tmp", path)
+
+    def stale_fraction(self) -> float:
+        """
+        Porsi token di store yang milik baris usang
+        """
+        total = int(self._offsets[-1])
+        if total == 0:
+            return 0.0
+        live = sum(int(self._offsets[row + 1] - self._offsets[row]) for row in self._index.values())
+        return 1.0 - live / total
+
+    def compact(self) -> int:
+        """
+        Menulis ulang store hanya dengan baris yang masih dipakai
+
+        Returns:
+            Jumlah baris usang yang dibuang
+        """
+        live_rows = sorted(self._index.values())
+        n_stale = len(self._row_ids) - len(live_rows)
+        if n_stale == 0:
+            return 0
+
+        lengths = [int(self._offsets[row + 1] - self._offsets[row]) for row in live_rows]
+        tokens = [np.asarray(self._tokens[self._offsets[row]:self._offsets[row + 1]], dtype=np.int32)
+                  for row in live_rows]
+
+        self._row_ids = [self._row_ids[row] for row in live_rows]
+        self._digests = [self._digests[row] for row in live_rows]
+        self._index = {article_id: row for row, article_id in enumerate(self._row_ids)}
+        self._tokens = np.concatenate(tokens) if tokens else np.zeros(0, dtype=np.int32)
+        self._offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._offsets[1:])
+
+        self.save()
+        return n_stale
+
+    def get(self, article_id: str) -> Optional[np.ndarray]:
+        """
+        Mengambil token id prompt untuk satu artikel
+
+        Args:
+            article_id: ID artikel
+
+        Returns:
+            Array token id (view ke array datar), atau None jika belum ada
+        """
+        row = self._index.get(article_id)
+        if row is None:
+            return None
+        return self._tokens[self._offsets[row]:self._offsets[row + 1]]
+
+    def build(self, dataset: List[Dict[str, Any]], tokenizer, build_prompt,
+              batch_size: int = 256) -> int:
+        """
+        Pre-tokenisasi prompt untuk artikel yang belum ada di store
+
+        Artikel yang sudah ada dan prompt-nya tidak berubah dilewati, sehingga
+        store dapat dipakai ulang lintas run dan sweep. Jika prompt berubah
+        (misalnya template diedit) dan porsi token usang melewati
+        COMPACT_STALE_FRACTION, store di-compact.
+
+        Args:
+            dataset: Dataset yang berisi field 'id' dan 'text'
+            tokenizer: Tokenizer HuggingFace
+            build_prompt: Fungsi yang mengubah teks artikel menjadi prompt
+            batch_size: Jumlah prompt per panggilan tokenizer
+
+        Returns:
+            Jumlah artikel yang baru ditokenisasi
+        """
+        pending = []
+        for item in dataset:
+            prompt = build_prompt(item['text'])
+            digest = self._digest(prompt)
+            row = self._index.get(item['id'])
+            if row is not None and self._digests[row] == digest:
+                continue
+            pending.append((item['id'], prompt, digest))
+
+        if not pending:
+            return 0
+
+        new_tokens = [np.asarray(self._tokens, dtype=np.int32)]
+        lengths = list(np.diff(self._offsets))
+
+        for start in tqdm(range(0, len(pending), batch_size), desc="Pre-tokenizing prompts"):
+            chunk = pending[start:start + batch_size]
+            encoded = tokenizer(
+                [prompt for _, prompt, _ in chunk],
+                truncation=True,
+                max_length=self.max_length
+            )['input_ids']
+
+            for (article_id, _, digest), ids in zip(chunk, encoded):
+                # Artikel yang berubah ditambahkan sebagai baris baru, baris lama ditinggalkan
+                self._index[article_id] = len(lengths)
+                self._row_ids.append(article_id)
+                self._digests.append(digest)
+                lengths.append(len(ids))
+                new_tokens.append(np.asarray(ids, dtype=np.int32))
+
+        self._tokens = np.concatenate(new_tokens)
+        self._offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._offsets[1:])
+
+        if self.stale_fraction() > COMPACT_STALE_FRACTION:
+            n_stale = self.compact()
+            print(f"Token store di-compact: {n_stale} baris usang dibuang")
+        else:
+            self.save()
+        return len(pending)
@@ -1,8 +1,10 @@
+import os
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -10,30 +12,220 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
+from aggregates import (AggregateCube, NUMERIC_COLUMNS, SCORE_EDGES, LENGTH_EDGES, RATIO_EDGES,
+                        HIST_EDGES, HIST2D_COLUMNS)
+
+
+def _histogram_quantiles(counts: np.ndarray, edges: np.ndarray, quantiles: List[float]) -> np.ndarray:
+    """
+    Kuantil perkiraan dari histogram (interpolasi linear di dalam bin)
+    """
+    total = counts.sum()
+    if total == 0:
+        return np.full(len(quantiles), np.nan)
+    cumulative = np.concatenate([[0], np.cumsum(counts)]) / total
+    return np.interp(quantiles, cumulative, edges)
+
+
+class BinnedAggregates:
+    """
+    Agregat ter-bin untuk plot, diturunkan dari AggregateCube
+
+    Histogram 1D/2D, jumlah untuk regresi dan korelasi, serta agregat per
+    kategori/sumber didapat dengan menjumlahkan sumbu cube. Ukurannya hanya
+    bergantung pada jumlah bin dan grup, sehingga waktu render plot tetap
+    konstan berapa pun jumlah item. Semua field berupa jumlah, sehingga dua
+    agregat dapat digabung dengan penjumlahan.
+    """
+
+    def __init__(self):
+        self.n = 0
+        # Jumlah per kolom dan jumlah hasil kali antar kolom NUMERIC_COLUMNS
+        self.sums = np.zeros(len(NUMERIC_COLUMNS))
+        self.cross = np.zeros((len(NUMERIC_COLUMNS), len(NUMERIC_COLUMNS)))
+        self.hist: Dict[str, np.ndarray] = {name: np.zeros(len(edges) - 1, dtype=np.int64)
+                                            for name, edges in HIST_EDGES.items()}
+        # Histogram 2D (x, rouge1) dan jumlah regresi [n, sx, sy, sxx, sxy]
+        self.hist2d: Dict[str, np.ndarray] = {
+            name: np.zeros((len(HIST_EDGES[name]) - 1, len(SCORE_EDGES) - 1), dtype=np.int64)
+            for name in HIST2D_COLUMNS
+        }
+        self.regression: Dict[str, np.ndarray] = {name: np.zeros(5) for name in self.hist2d}
+        self.ratio_sum = 0.0
+        self.ratio_count = 0
+        # Per grup: label, jumlah item, jumlah NUMERIC_COLUMNS, histogram ROUGE-1
+        self.groups: Dict[str, Dict[str, np.ndarray]] = {}
+
+    @classmethod
+    def from_cube(cls, cube: AggregateCube) -> 'BinnedAggregates':
+        """
+        Menurunkan agregat plot dari cube (tanpa membaca tabel per item)
+
+        Args:
+            cube: AggregateCube hasil evaluasi
+
+        Returns:
+            Agregat ter-bin
+        """
+        aggregates = cls()
+        n_numeric = len(NUMERIC_COLUMNS)
+        aggregates.n = int(cube.marginal('count'))
+        aggregates.sums = cube.marginal('sum')[:n_numeric]
+        aggregates.cross = cube.marginal('cross')
+        aggregates.ratio_sum, aggregates.ratio_count = cube.marginal('ratio')
+        aggregates.ratio_count = int(aggregates.ratio_count)
+        for name in HIST_EDGES:
+            aggregates.hist[name] = cube.marginal(f'hist_{name}')
+        for name in HIST2D_COLUMNS:
+            aggregates.hist2d[name] = cube.marginal(f'hist2d_{name}')
+            aggregates.regression[name] = cube.marginal(f'regression_{name}')
+
+        for by in ('category', 'source'):
+            aggregates.groups[by] = {
+                'labels': cube.labels[by],
+                'count': cube.marginal('count', [by]),
+                'sums': cube.marginal('sum', [by])[:, :n_numeric],
+                'rouge1_hist': cube.marginal('hist_rouge1', [by])
+            }
+        return aggregates
+
+    @classmethod
+    def from_dataframe(cls, evaluation_df: pd.DataFrame) -> 'BinnedAggregates':
+        """
+        Menghitung agregat dari DataFrame hasil evaluasi (melalui AggregateCube)
+
+        Args:
+            evaluation_df: DataFrame hasil evaluasi
+
+        Returns:
+            Agregat ter-bin
+        """
+        return cls.from_cube(AggregateCube.from_item_scores(evaluation_df))
+
+    def mean(self, column: str) -> float:
+        return float(self.sums[NUMERIC_COLUMNS.index(column)] / max(self.n, 1))
+
+    def group_means(self, by: str, columns: List[str]) -> pd.DataFrame:
+        """
+        Rata-rata kolom per grup (setara groupby(by)[columns].mean())
+        """
+        group = self.groups[by]
+        index = [NUMERIC_COLUMNS.index(column) for column in columns]
+        means = group['sums'][:, index] / np.maximum(group['count'], 1)[:, None]
+        return pd.DataFrame(means, index=pd.Index(group['labels'], name=by), columns=columns)
+
+    def group_counts(self, by: str) -> pd.Series:
+        """
+        Jumlah item per grup, diurutkan menurun (setara value_counts())
+        """
+        group = self.groups[by]
+        return pd.Series(group['count'], index=group['labels']).sort_values(ascending=False)
+
+    def group_box_stats(self, by: str) -> List[Dict[str, Any]]:
+        """
+        Statistik box plot ROUGE-1 per grup dari histogram (untuk Axes.bxp);
+        whisker pada persentil 5 dan 95
+        """
+        group = self.groups[by]
+        stats = []
+        for label, counts, total, total_sum in zip(group['labels'], group['rouge1_hist'], group['count'],
+                                                   group['sums'][:, NUMERIC_COLUMNS.index('rouge1')]):
+            whislo, q1, med, q3, whishi = _histogram_quantiles(counts, SCORE_EDGES, [0.05, 0.25, 0.5, 0.75, 0.95])
+            stats.append({'label': label, 'whislo': whislo, 'q1': q1, 'med': med, 'q3': q3, 'whishi': whishi,
+                          'mean': total_sum / max(total, 1), 'fliers': []})
+        return stats
+
+    def trend_line(self, name: str) -> Tuple[float, float]:
+        """
+        Slope dan intercept regresi linear ROUGE-1 terhadap x dari jumlah cukup
+        """
+        n, sx, sy, sxx, sxy = self.regression[name]
+        denominator = n * sxx - sx * sx
+        if n == 0 or denominator == 0:
+            return 0.0, sy / n if n else 0.0
+        slope = (n * sxy - sx * sy) / denominator
+        return slope, (sy - slope * sx) / n
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Matriks korelasi Pearson NUMERIC_COLUMNS dari jumlah dan hasil kali
+        """
+        n = max(self.n, 1)
+        covariance = self.cross / n - np.outer(self.sums, self.sums) / (n * n)
+        std = np.sqrt(np.clip(np.diag(covariance), 0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = covariance / np.outer(std, std)
+        return pd.DataFrame(correlation, index=NUMERIC_COLUMNS, columns=NUMERIC_COLUMNS)
+
 class SummarizationVisualizer:
     """
     Class untuk visualisasi hasil evaluasi summarization
     """
     
-    def __init__(self, figsize: tuple = (12, 8)):
+    def __init__(self, figsize: tuple = (12, 8), headless: bool = False, dpi: int = 300,
+                 preview_dpi: Optional[int] = None, scalable: bool = False):
         """
         Inisialisasi visualizer
         
         Args:
             figsize: Ukuran default figure
+            headless: Render dengan backend Agg tanpa plt.show(); figure
+                disimpan (jika save_path diberikan) lalu ditutup
+            dpi: Resolusi file plot
+            preview_dpi: Jika diberikan, simpan juga preview beresolusi rendah
+                (<nama>_preview.png)
+            scalable: Plot dari agregat ter-bin (BinnedAggregates) alih-alih
+                setiap baris; otomatis jika data yang diberikan sudah berupa
+                BinnedAggregates atau AggregateCube
         """
         self.figsize = figsize
+        self.scalable = scalable
+        self.headless = headless
+        self.dpi = dpi
+        self.preview_dpi = preview_dpi
+        if headless:
+            plt.switch_backend('Agg')
         plt.rcParams['font.size'] = 10
         plt.rcParams['axes.titlesize'] = 12
         plt.rcParams['axes.labelsize'] = 10
         
-    def plot_metrics_comparison(self, results: Dict[str, Any], save_path: str = None):
+    def _binned(self, data) -> Optional[BinnedAggregates]:
+        if isinstance(data, BinnedAggregates):
+            return data
+        if isinstance(data, AggregateCube):
+            return BinnedAggregates.from_cube(data)
+        if self.scalable:
+            return BinnedAggregates.from_dataframe(data)
+        return None
+    
+    def _finish(self, fig: plt.Figure, save_path: Optional[str], label: str = "Plot") -> plt.Figure:
+        """
+        Menyimpan figure (dan preview), lalu menampilkan atau menutupnya
+        """
+        if save_path:
+            fig.savefig(save_path, dpi=self.dpi, bbox_inches='tight')
+            print(f"{label} tersimpan di: {save_path}")
+            if self.preview_dpi:
+                root, ext = os.path.splitext(save_path)
+                fig.savefig(f"{root}_preview{ext}", dpi=self.preview_dpi, bbox_inches='tight')
+        
+        if self.headless:
+            # Figure tetap dapat dipakai (misalnya savefig) setelah dilepas dari pyplot
+            plt.close(fig)
+        else:
+            plt.show()
+        return fig
+    
+    def plot_metrics_comparison(self, results: Dict[str, Any], save_path: str = None) -> plt.Figure:
         """
         Plot perbandingan metrik evaluasi
         
         Args:
             results: Hasil evaluasi dari evaluator
             save_path: Path untuk menyimpan plot
+            
+        Returns:
+            Figure matplotlib
         """
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Perbandingan Metrik Evaluasi Summarization', fontsize=16, fontweight='bold')
@@ -90,20 +282,23 @@ class SummarizationVisualizer:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Plot tersimpan di: {save_path}")
-        
-        plt.show()
+        return self._finish(fig, save_path)
     
-    def plot_category_analysis(self, evaluation_df: pd.DataFrame, save_path: str = None):
+    def plot_category_analysis(self, evaluation_df: pd.DataFrame, save_path: str = None) -> plt.Figure:
         """
         Plot analisis berdasarkan kategori berita
         
         Args:
-            evaluation_df: DataFrame hasil evaluasi
+            evaluation_df: DataFrame hasil evaluasi (atau BinnedAggregates/AggregateCube)
             save_path: Path untuk menyimpan plot
+            
+        Returns:
+            Figure matplotlib
         """
+        binned = self._binned(evaluation_df)
+        if binned is not None:
+            return self._plot_category_binned(binned, save_path)
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Analisis Hasil Berdasarkan Kategori Berita', fontsize=16, fontweight='bold')
         
@@ -135,35 +330,30 @@ class SummarizationVisualizer:
         axes[1, 0].legend()
         
         # Box plot ROUGE scores by category
-        rouge_data = []
-        categories = []
-        for category in evaluation_df['category'].unique():
-            cat_data = evaluation_df[evaluation_df['category'] == category]['rouge1']
-            rouge_data.extend(cat_data.tolist())
-            categories.extend([category] * len(cat_data))
-        
-        rouge_df = pd.DataFrame({'category': categories, 'rouge1': rouge_data})
-        sns.boxplot(data=rouge_df, x='category', y='rouge1', ax=axes[1, 1])
+        sns.boxplot(data=evaluation_df, x='category', y='rouge1', ax=axes[1, 1])
         axes[1, 1].set_title('Box Plot ROUGE-1 per Kategori')
         axes[1, 1].set_ylabel('ROUGE-1 Score')
         axes[1, 1].tick_params(axis='x', rotation=45)
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Plot tersimpan di: {save_path}")
-        
-        plt.show()
+        return self._finish(fig, save_path)
     
-    def plot_source_analysis(self, evaluation_df: pd.DataFrame, save_path: str = None):
+    def plot_source_analysis(self, evaluation_df: pd.DataFrame, save_path: str = None) -> plt.Figure:
         """
         Plot analisis berdasarkan sumber berita
         
         Args:
-            evaluation_df: DataFrame hasil evaluasi
+            evaluation_df: DataFrame hasil evaluasi (atau BinnedAggregates/AggregateCube)
             save_path: Path untuk menyimpan plot
+            
+        Returns:
+            Figure matplotlib
         """
+        binned = self._binned(evaluation_df)
+        if binned is not None:
+            return self._plot_source_binned(binned, save_path)
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Analisis Hasil Berdasarkan Sumber Berita', fontsize=16, fontweight='bold')
         
@@ -198,20 +388,23 @@ class SummarizationVisualizer:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Plot tersimpan di: {save_path}")
-        
-        plt.show()
+        return self._finish(fig, save_path)
     
-    def plot_length_analysis(self, evaluation_df: pd.DataFrame, save_path: str = None):
+    def plot_length_analysis(self, evaluation_df: pd.DataFrame, save_path: str = None) -> plt.Figure:
         """
         Plot analisis hubungan panjang teks dengan performa
         
         Args:
-            evaluation_df: DataFrame hasil evaluasi
+            evaluation_df: DataFrame hasil evaluasi (atau BinnedAggregates/AggregateCube)
             save_path: Path untuk menyimpan plot
+            
+        Returns:
+            Figure matplotlib
         """
+        binned = self._binned(evaluation_df)
+        if binned is not None:
+            return self._plot_length_binned(binned, save_path)
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Analisis Hubungan Panjang Teks dengan Performa', fontsize=16, fontweight='bold')
         
@@ -260,21 +453,24 @@ class SummarizationVisualizer:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Plot tersimpan di: {save_path}")
-        
-        plt.show()
+        return self._finish(fig, save_path)
     
-    def create_summary_report(self, results: Dict[str, Any], evaluation_df: pd.DataFrame, save_path: str = None):
+    def create_summary_report(self, results: Dict[str, Any], evaluation_df: pd.DataFrame, save_path: str = None) -> plt.Figure:
         """
         Membuat laporan ringkasan lengkap
         
         Args:
             results: Hasil evaluasi
-            evaluation_df: DataFrame hasil evaluasi
+            evaluation_df: DataFrame hasil evaluasi (atau BinnedAggregates/AggregateCube)
             save_path: Path untuk menyimpan laporan
+            
+        Returns:
+            Figure matplotlib
         """
+        binned = self._binned(evaluation_df)
+        if binned is not None:
+            return self._summary_report_binned(results, binned, save_path)
+        
         fig, axes = plt.subplots(3, 3, figsize=(20, 16))
         fig.suptitle('Laporan Lengkap Evaluasi Summarization', fontsize=18, fontweight='bold')
         
@@ -368,8 +564,227 @@ class SummarizationVisualizer:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Laporan tersimpan di: {save_path}")
+        return self._finish(fig, save_path, label="Laporan")
+    
+    def _plot_category_binned(self, binned: BinnedAggregates, save_path: Optional[str]) -> plt.Figure:
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        fig.suptitle('Analisis Hasil Berdasarkan Kategori Berita', fontsize=16, fontweight='bold')
+        
+        binned.group_means('category', ['rouge1', 'rouge2', 'rougeL']).plot(kind='bar', ax=axes[0, 0], alpha=0.7)
+        axes[0, 0].set_title('ROUGE Scores per Kategori')
+        axes[0, 0].set_ylabel('Score')
+        axes[0, 0].legend()
+        axes[0, 0].tick_params(axis='x', rotation=45)
+        
+        binned.group_means('category', ['reference_length', 'prediction_length']).plot(
+            kind='bar', ax=axes[0, 1], alpha=0.7)
+        axes[0, 1].set_title('Panjang Summary per Kategori')
+        axes[0, 1].set_ylabel('Jumlah Kata')
+        axes[0, 1].legend(['Reference', 'Prediction'])
+        axes[0, 1].tick_params(axis='x', rotation=45)
+        
+        axes[1, 0].stairs(binned.hist['rouge1'], SCORE_EDGES, fill=True, alpha=0.7, color='skyblue', edgecolor='black')
+        axes[1, 0].set_title('Distribusi ROUGE-1 Scores')
+        axes[1, 0].set_xlabel('ROUGE-1 Score')
+        axes[1, 0].set_ylabel('Frekuensi')
+        axes[1, 0].axvline(binned.mean('rouge1'), color='red', linestyle='--',
+                          label=f'Mean: {binned.mean("rouge1"):.3f}')
+        axes[1, 0].legend()
+        
+        axes[1, 1].bxp(binned.group_box_stats('category'), showmeans=True)
+        axes[1, 1].set_title('Box Plot ROUGE-1 per Kategori (whisker: persentil 5-95)')
+        axes[1, 1].set_ylabel('ROUGE-1 Score')
+        axes[1, 1].tick_params(axis='x', rotation=45)
+        
+        plt.tight_layout()
+        
+        return self._finish(fig, save_path)
+    
+    def _plot_source_binned(self, binned: BinnedAggregates, save_path: Optional[str]) -> plt.Figure:
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        fig.suptitle('Analisis Hasil Berdasarkan Sumber Berita', fontsize=16, fontweight='bold')
+        
+        binned.group_means('source', ['rouge1', 'rouge2', 'rougeL']).plot(kind='bar', ax=axes[0, 0], alpha=0.7)
+        axes[0, 0].set_title('ROUGE Scores per Sumber')
+        axes[0, 0].set_ylabel('Score')
+        axes[0, 0].legend()
+        axes[0, 0].tick_params(axis='x', rotation=45)
+        
+        source_counts = binned.group_counts('source')
+        axes[0, 1].pie(source_counts.values, labels=source_counts.index, autopct='%1.1f%%', startangle=90)
+        axes[0, 1].set_title('Distribusi Artikel per Sumber')
+        
+        binned.group_means('source', ['reference_length', 'prediction_length']).plot(
+            kind='bar', ax=axes[1, 0], alpha=0.7)
+        axes[1, 0].set_title('Panjang Summary per Sumber')
+        axes[1, 0].set_ylabel('Jumlah Kata')
+        axes[1, 0].legend(['Reference', 'Prediction'])
+        axes[1, 0].tick_params(axis='x', rotation=45)
+        
+        sns.heatmap(binned.correlation(), annot=True, cmap='coolwarm', center=0, ax=axes[1, 1])
+        axes[1, 1].set_title('Korelasi Antar Metrik')
+        
+        plt.tight_layout()
+        
+        return self._finish(fig, save_path)
+    
+    def _plot_hist2d(self, ax, binned: BinnedAggregates, name: str, xlabel: str, title: str, cmap: str):
+        counts = binned.hist2d[name]
+        edges = HIST_EDGES[name]
+        mesh = ax.pcolormesh(edges, SCORE_EDGES, np.ma.masked_equal(counts.T, 0), cmap=cmap)
+        plt.colorbar(mesh, ax=ax, label='Jumlah artikel')
+        slope, intercept = binned.trend_line(name)
+        ax.plot(edges, slope * edges + intercept, "r--", alpha=0.8)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel('ROUGE-1 Score')
+        ax.set_title(title)
+        ax.set_ylim(0, 1)
+    
+    def _plot_length_binned(self, binned: BinnedAggregates, save_path: Optional[str]) -> plt.Figure:
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        fig.suptitle('Analisis Hubungan Panjang Teks dengan Performa', fontsize=16, fontweight='bold')
+        
+        self._plot_hist2d(axes[0, 0], binned, 'reference_length', 'Panjang Reference (kata)',
+                          'ROUGE-1 vs Panjang Reference', 'Blues')
+        self._plot_hist2d(axes[0, 1], binned, 'prediction_length', 'Panjang Prediction (kata)',
+                          'ROUGE-1 vs Panjang Prediction', 'Oranges')
+        self._plot_hist2d(axes[1, 0], binned, 'length_ratio', 'Rasio Panjang (Prediction/Reference)',
+                          'ROUGE-1 vs Rasio Panjang', 'Greens')
+        
+        ratio_mean = binned.ratio_sum / max(binned.ratio_count, 1)
+        axes[1, 1].stairs(binned.hist['length_ratio'], RATIO_EDGES, fill=True, alpha=0.7, color='purple',
+                          edgecolor='black')
+        axes[1, 1].set_xlabel('Rasio Panjang (Prediction/Reference)')
+        axes[1, 1].set_ylabel('Frekuensi')
+        axes[1, 1].set_title('Distribusi Rasio Panjang')
+        axes[1, 1].axvline(ratio_mean, color='red', linestyle='--', label=f'Mean: {ratio_mean:.2f}')
+        axes[1, 1].legend()
+        
+        plt.tight_layout()
         
-        plt.show()
\ No newline at end of file
+        return self._finish(fig, save_path)
+    
+    def _summary_report_binned(self, results: Dict[str, Any], binned: BinnedAggregates,
+                               save_path: Optional[str]) -> plt.Figure:
+        fig, axes = plt.subplots(3, 3, figsize=(20, 16))
+        fig.suptitle('Laporan Lengkap Evaluasi Summarization', fontsize=18, fontweight='bold')
+        
+        metrics = ['ROUGE-1', 'ROUGE-2', 'ROUGE-L', 'BLEU', 'BERTScore-F1']
+        values = [
+            results['summary']['rouge1'],
+            results['summary']['rouge2'],
+            results['summary']['rougeL'],
+            results['summary']['bleu'],
+            results['summary']['bertscore_f1']
+        ]
+        bars = axes[0, 0].bar(metrics, values, alpha=0.7, color=['blue', 'green', 'red', 'orange', 'purple'])
+        axes[0, 0].set_title('Skor Metrik Keseluruhan')
+        axes[0, 0].set_ylabel('Score')
+        axes[0, 0].set_ylim(0, 1)
+        axes[0, 0].tick_params(axis='x', rotation=45)
+        for bar, value in zip(bars, values):
+            axes[0, 0].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.01,
+                           f'{value:.3f}', ha='center', va='bottom')
+        
+        for ax, by, title in ((axes[0, 1], 'category', 'ROUGE-1 per Kategori'),
+                              (axes[0, 2], 'source', 'ROUGE-1 per Sumber')):
+            binned.group_means(by, ['rouge1'])['rouge1'].sort_values(ascending=False).plot(kind='bar', ax=ax, alpha=0.7)
+            ax.set_title(title)
+            ax.set_ylabel('ROUGE-1 Score')
+            ax.tick_params(axis='x', rotation=45)
+        
+        axes[1, 0].stairs(binned.hist['reference_length'], LENGTH_EDGES, fill=True, alpha=0.7,
+                          label='Reference', color='blue')
+        axes[1, 0].stairs(binned.hist['prediction_length'], LENGTH_EDGES, fill=True, alpha=0.7,
+                          label='Prediction', color='orange')
+        axes[1, 0].set_title('Distribusi Panjang Summary')
+        axes[1, 0].set_xlabel('Jumlah Kata')
+        axes[1, 0].set_ylabel('Frekuensi')
+        axes[1, 0].legend()
+        
+        for rouge_type, label, color in (('rouge1', 'ROUGE-1', 'blue'), ('rouge2', 'ROUGE-2', 'green'),
+                                         ('rougeL', 'ROUGE-L', 'red')):
+            axes[1, 1].stairs(binned.hist[rouge_type], SCORE_EDGES, fill=True, alpha=0.7, label=label, color=color)
+        axes[1, 1].set_title('Distribusi ROUGE Scores')
+        axes[1, 1].set_xlabel('Score')
+        axes[1, 1].set_ylabel('Frekuensi')
+        axes[1, 1].legend()
+        
+        self._plot_hist2d(axes[1, 2], binned, 'reference_length', 'Panjang Reference', 'Panjang vs Performa', 'Blues')
+        
+        for ax, by, title in ((axes[2, 0], 'category', 'Distribusi Kategori'),
+                              (axes[2, 1], 'source', 'Distribusi Sumber')):
+            counts = binned.group_counts(by)
+            ax.pie(counts.values, labels=counts.index, autopct='%1.1f%%', startangle=90)
+            ax.set_title(title)
+        
+        axes[2, 2].axis('off')
+        stats_text = f"""
+        STATISTIK DATASET:
+        
+        Total Artikel: {binned.n}
+        Kategori: {len(binned.groups['category']['labels'])}
+        Sumber: {len(binned.groups['source']['labels'])}
+        
+        RATA-RATA:
+        ROUGE-1: {binned.mean('rouge1'):.3f}
+        ROUGE-2: {binned.mean('rouge2'):.3f}
+        ROUGE-L: {binned.mean('rougeL'):.3f}
+        
+        Panjang Reference: {binned.mean('reference_length'):.1f} kata
+        Panjang Prediction: {binned.mean('prediction_length'):.1f} kata
+        """
+        axes[2, 2].text(0.1, 0.9, stats_text, transform=axes[2, 2].transAxes,
+                       fontsize=10, verticalalignment='top', fontfamily='monospace')
+        
+        plt.tight_layout()
+        
+        return self._finish(fig, save_path, label="Laporan")
+
+def _init_plot_worker():
+    plt.switch_backend('Agg')
+
+
+def _render_plot(method: str, args: Tuple[Any, ...], save_path: str, dpi: int,
+                 preview_dpi: Optional[int]) -> str:
+    visualizer = SummarizationVisualizer(headless=True, dpi=dpi, preview_dpi=preview_dpi)
+    getattr(visualizer, method)(*args, save_path=save_path)
+    return save_path
+
+
+def render_plots(jobs: List[Tuple[str, Tuple[Any, ...], str]], n_workers: int = 1, dpi: int = 300,
+                 preview_dpi: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Me-render beberapa plot secara headless (Agg), paralel di process pool
+
+    Args:
+        jobs: List (nama method SummarizationVisualizer, argumen posisi, save_path)
+        n_workers: Jumlah worker process (1 untuk serial di proses ini)
+        dpi: Resolusi file plot
+        preview_dpi: Resolusi preview (None untuk tanpa preview)
+
+    Returns:
+        Dictionary save_path -> None jika berhasil, atau pesan error
+    """
+    errors: Dict[str, Optional[str]] = {}
+    if n_workers <= 1:
+        for method, args, save_path in jobs:
+            try:
+                _render_plot(method, args, save_path, dpi, preview_dpi)
+                errors[save_path] = None
+            except Exception as e:
+                errors[save_path] = str(e)
+        return errors
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_plot_worker) as executor:
+        futures = {
+            save_path: executor.submit(_render_plot, method, args, save_path, dpi, preview_dpi)
+            for method, args, save_path in jobs
+        }
+        for save_path, future in futures.items():
+            try:
+                future.result()
+                errors[save_path] = None
+            except Exception as e:
+                errors[save_path] = str(e)
+    return errors